@@ -0,0 +1,64 @@
+"""Keep off-screen enemies asleep until the camera comes near them.
+
+Like the NES games, an enemy does nothing until it scrolls within a margin
+of the view. ActivationWindow holds the sleeping entities sorted by x, so
+each frame's wake check is a bisect on the window edges and sleepers cost
+nothing at all. The owner updates only the awake entities and hands back any
+that wander out of range with sleep(), which re-inserts them at their
+current x. Per-frame work then follows what is on screen, not level length.
+"""
+from bisect import bisect_left, bisect_right
+
+ACTIVATION_MARGIN = 64
+
+
+class ActivationWindow:
+    """Sleeping items sorted by x, woken when within margin px of the view."""
+
+    def __init__(self, entries, view_width, margin=ACTIVATION_MARGIN):
+        entries = sorted(entries, key=lambda entry: entry[0])
+        self.xs = [x for x, _ in entries]
+        self.items = [item for _, item in entries]
+        self.view_width = view_width
+        self.margin = margin
+        self.active = 0
+        self.woken = 0          # total wake-ups, including re-wakes
+        self.slept = 0          # total times an awake item was put back to sleep
+
+    @property
+    def dormant(self):
+        return len(self.xs)
+
+    def bounds(self, camx):
+        """The x range, inclusive, in which items are kept awake."""
+        return camx - self.margin, camx + self.view_width + self.margin
+
+    def wake(self, camx):
+        """Remove and return the sleeping items within range, in x order."""
+        lo, hi = self.bounds(camx)
+        i = bisect_left(self.xs, lo)
+        j = bisect_right(self.xs, hi, i)
+        if i == j:
+            return []
+        woken = self.items[i:j]
+        del self.xs[i:j]
+        del self.items[i:j]
+        self.active += len(woken)
+        self.woken += len(woken)
+        return woken
+
+    def sleep(self, item, x):
+        """Put an awake item back to sleep at position x."""
+        i = bisect_right(self.xs, x)
+        self.xs.insert(i, x)
+        self.items.insert(i, item)
+        self.active -= 1
+        self.slept += 1
+
+    def retire(self, count=1):
+        """Forget awake items the owner has removed for good."""
+        self.active -= count
+
+    def summary(self):
+        return (f"enemies: {self.active} active, {self.dormant} dormant; "
+                f"{self.woken} woken, {self.slept} slept")
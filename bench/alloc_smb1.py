@@ -0,0 +1,64 @@
+"""Allocation check for smb1.py tile collision, measured with tracemalloc.
+
+Steps a Player through a level and records, per frame, how far traced memory
+peaks above where the frame started. Tile collision used to build Rects,
+generators and array views on every call; it should now stay within a few
+transient ints. Exits with status 1 if any frame peaks above --budget bytes
+or more than that is still held after the run (the loop's own locals are a
+few ints).
+
+Run from the repository root:
+
+    python bench/alloc_smb1.py [--frames 2000] [--level 10] [--budget 256]
+"""
+import argparse
+import array
+import os
+import sys
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import smb1
+from bench_smb1 import input_script
+
+
+def frame_peaks(level, masks):
+    """Bytes above the frame's starting level at each frame's peak, plus bytes left over."""
+    player = smb1.Player(level.spawn_rect.x, level.spawn_rect.y)
+    player.update(masks[0], level)  # warm up attribute caches and free lists
+    # Preallocated so recording a result allocates nothing itself
+    peaks = array.array("q", bytes(8 * len(masks)))
+    tracemalloc.start()
+    start, _ = tracemalloc.get_traced_memory()
+    for i, mask in enumerate(masks):
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        player.update(mask, level)
+        peaks[i] = tracemalloc.get_traced_memory()[1] - before
+    leftover = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    return sorted(peaks), leftover
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=2000)
+    parser.add_argument("--level", type=int, default=10)
+    parser.add_argument("--budget", type=int, default=256, help="max transient bytes per frame")
+    args = parser.parse_args()
+
+    level = smb1.Level(args.level)
+    peaks, leftover = frame_peaks(level, input_script(args.level, args.frames))
+    print(f"player.update peak above baseline: p50 {peaks[len(peaks) // 2]} B  "
+          f"p99 {peaks[int(len(peaks) * 0.99)]} B  max {peaks[-1]} B")
+    print(f"held after {args.frames} frames: {leftover} B")
+    if peaks[-1] > args.budget or leftover > args.budget:
+        print(f"FAIL: budget is {args.budget} B")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
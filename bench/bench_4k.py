@@ -0,0 +1,103 @@
+"""hdrv01.010.4.25.smbpcport4k.py: Game.update / Game.draw per state."""
+import random
+
+from harness import benchmark, load_script
+
+FRAMES = 120
+
+
+def game_in_state(state_name, level_num=4, scale=1):
+    smb4k = load_script("hdrv01.010.4.25.smbpcport4k.py", "smbpcport4k")
+    state = getattr(smb4k, state_name)
+    random.seed(0)
+    game = smb4k.Game(scale=scale)
+    game.new_game()
+    if state == smb4k.PLAYING:
+        game.start_level(level_num)
+    game.state = state
+    return game
+
+
+def _update(state_name):
+    game = game_in_state(state_name)
+    state = game.state
+
+    def run():
+        for _ in range(FRAMES):
+            # Keep the player alive so every frame exercises the same path.
+            game.state = state
+            game.player.lives = 5
+            game.update()
+    return run
+
+
+def _draw(state_name, scale=1):
+    game = game_in_state(state_name, scale=scale)
+
+    def run():
+        for _ in range(FRAMES):
+            game.title_blink += 1
+            game.draw()
+    return run
+
+
+@benchmark("4k.update[PLAYING castle]", ops=FRAMES)
+def update_playing():
+    return _update("PLAYING")
+
+
+@benchmark("4k.draw[PLAYING castle]", ops=FRAMES)
+def draw_playing():
+    return _draw("PLAYING")
+
+
+@benchmark("4k.draw[PLAYING castle, scale 3]", ops=FRAMES)
+def draw_playing_scaled():
+    # 2400x1800 output: the native draw plus one upscale into the display
+    return _draw("PLAYING", scale=3)
+
+
+@benchmark("4k.update[TITLE_SCREEN]", ops=FRAMES)
+def update_title():
+    return _update("TITLE_SCREEN")
+
+
+@benchmark("4k.draw[TITLE_SCREEN]", ops=FRAMES)
+def draw_title():
+    return _draw("TITLE_SCREEN")
+
+
+@benchmark("4k.update[GAME_WIN]", ops=FRAMES)
+def update_game_win():
+    return _update("GAME_WIN")
+
+
+@benchmark("4k.draw[GAME_WIN]", ops=FRAMES)
+def draw_game_win():
+    return _draw("GAME_WIN")
+
+
+@benchmark("4k.start_level[all 32]", ops=32)
+def start_level_all():
+    game = game_in_state("PLAYING")
+
+    def run():
+        for level_num in range(1, 33):
+            game.start_level(level_num)
+    return run
+
+
+@benchmark("4k.particles[update+draw, 600 live]", ops=FRAMES)
+def particles_crowded():
+    smb4k = load_script("hdrv01.010.4.25.smbpcport4k.py", "smbpcport4k")
+    game = game_in_state("PLAYING")
+    particles = game.particles
+
+    def run():
+        particles.clear()
+        for frame in range(FRAMES):
+            # One 20-particle burst a frame keeps about 600 alive
+            particles.emit(100 + frame * 8, 300, smb4k.DARK_ORANGE, 20)
+            particles.update()
+            particles.draw(game.screen)
+    return run
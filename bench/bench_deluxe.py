@@ -0,0 +1,74 @@
+"""smb_deluxe_complete.py: level construction and the overworld screen."""
+from harness import benchmark
+
+import smb_deluxe_complete as deluxe
+
+FRAMES = 120
+
+
+@benchmark("deluxe.level_init[all LEVELS]", ops=len(deluxe.LEVELS))
+def level_init():
+    def run():
+        for level_data in deluxe.LEVELS:
+            deluxe.Level(level_data)
+    return run
+
+
+@benchmark("deluxe.level_decode[all LEVELS]", ops=len(deluxe.LEVELS))
+def level_decode():
+    def run():
+        for level_num in range(len(deluxe.LEVELS)):
+            deluxe.LEVELS[level_num]
+    return run
+
+
+@benchmark("deluxe.draw[overworld]", ops=FRAMES)
+def draw_overworld():
+    game = deluxe.Game()
+
+    def run():
+        for _ in range(FRAMES):
+            game.draw()
+    return run
+
+
+@benchmark("deluxe.draw[level]", ops=FRAMES)
+def draw_level():
+    game = deluxe.Game()
+    game.start_level(len(deluxe.LEVELS) - 1)
+
+    def run():
+        for _ in range(FRAMES):
+            game.draw()
+    return run
+
+
+@benchmark("deluxe.draw[level, enemies moving]", ops=FRAMES)
+def draw_level_moving():
+    # Only the patrolling enemies change, so each frame repaints just their rects
+    game = deluxe.Game()
+    game.start_level(len(deluxe.LEVELS) - 1)
+    level = game.current_level
+
+    def run():
+        for _ in range(FRAMES):
+            level.update()
+            game.draw()
+    return run
+
+
+@benchmark("deluxe.player_update[swept]", ops=FRAMES)
+def player_update():
+    level = deluxe.Level(deluxe.LEVELS[5])
+    player = deluxe.Player()
+
+    def run():
+        player.reset_position(*level.start_pos)
+        for i in range(FRAMES):
+            player.move()
+            # Pace back and forth across the platforms, jumping every half second
+            player.vel.x = 4 if (i // 40) % 2 == 0 else -4
+            if i % 30 == 0:
+                player.jump()
+            player.update(level.platform_rects)
+    return run
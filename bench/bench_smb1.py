@@ -0,0 +1,155 @@
+"""smb1.py: level generation, entity physics and level drawing."""
+import random
+
+import pygame
+
+from harness import benchmark
+
+import smb1
+
+FRAMES = 600
+
+
+def input_script(seed, frames=FRAMES):
+    r = random.Random(seed)
+    masks = []
+    for _ in range(frames):
+        mask = smb1.INPUT_RIGHT if r.random() < 0.9 else smb1.INPUT_LEFT
+        if r.random() < 0.4:
+            mask |= smb1.INPUT_JUMP
+        masks.append(mask)
+    return masks
+
+
+@benchmark("smb1.level_generate[all 32]", ops=smb1.MAX_LEVELS)
+def level_generate():
+    def run():
+        for idx in range(smb1.MAX_LEVELS):
+            smb1.Level(idx)
+    return run
+
+
+@benchmark("smb1.level_reset[level 31]")
+def level_reset():
+    level = smb1.Level(31)
+    return level.reset
+
+
+@benchmark("smb1.player_update", ops=FRAMES)
+def player_update():
+    level = smb1.Level(10)
+    masks = input_script(10)
+
+    def run():
+        player = smb1.Player(level.spawn_rect.x, level.spawn_rect.y)
+        for mask in masks:
+            player.update(mask, level)
+    return run
+
+
+def _goomba_run(level, spawns, margin):
+    """Scroll the camera across the level, waking and stepping Goombas each frame."""
+    span = level.pixel_w - smb1.SCREEN_WIDTH
+
+    def run():
+        level.enemies = smb1.Goombas.from_spawns(spawns, margin)
+        for i in range(FRAMES):
+            level.enemies.activate((i * 6) % span)
+            level.enemies.update(level)
+    return run
+
+
+@benchmark("smb1.goomba_update[level 31]", ops=FRAMES)
+def goomba_update():
+    level = smb1.Level(31)
+    return _goomba_run(level, level.enemies.spawns(), smb1.ACTIVATION_MARGIN)
+
+
+def _stress_spawns(level):
+    # Twenty staggered copies of every spawn: a stress level's worth of walkers.
+    return [(x + 3 * k, y, vx) for k in range(20) for x, y, vx in level.enemies.spawns()]
+
+
+@benchmark("smb1.goomba_update[440 walkers, all awake]", ops=FRAMES)
+def goomba_update_stress():
+    level = smb1.Level(31)
+    return _goomba_run(level, _stress_spawns(level), level.pixel_w)
+
+
+@benchmark("smb1.goomba_update[440 walkers, activation]", ops=FRAMES)
+def goomba_update_stress_activation():
+    level = smb1.Level(31)
+    return _goomba_run(level, _stress_spawns(level), smb1.ACTIVATION_MARGIN)
+
+
+@benchmark("smb1.simulation_step", ops=FRAMES)
+def simulation_step():
+    masks = input_script(20)
+
+    def run():
+        smb1.Simulation(20, lives=99).run(masks)
+    return run
+
+
+def _draw_at(fraction, idx=31):
+    pygame.init()
+    level = smb1.Level(idx)
+    surf = pygame.Surface((smb1.SCREEN_WIDTH, smb1.SCREEN_HEIGHT))
+    camx = int((level.pixel_w - smb1.SCREEN_WIDTH) * fraction)
+    level.draw(surf, camx)
+
+    def run():
+        level.draw(surf, camx)
+    return run
+
+
+@benchmark("smb1.level_draw[cam start]")
+def level_draw_start():
+    return _draw_at(0.0)
+
+
+@benchmark("smb1.level_draw[cam middle]")
+def level_draw_middle():
+    return _draw_at(0.5)
+
+
+@benchmark("smb1.level_draw[cam end]")
+def level_draw_end():
+    return _draw_at(1.0)
+
+
+@benchmark("smb1.chunk_build[level 31, all chunks]")
+def chunk_build():
+    pygame.init()
+    level = smb1.Level(31)
+    surf = pygame.Surface((smb1.SCREEN_WIDTH, smb1.SCREEN_HEIGHT))
+    chunks = range(len(level.colliders.chunks))
+
+    def run():
+        for ci in chunks:
+            level._build_chunk(ci, surf)
+    return run
+
+
+@benchmark("smb1.set_tile[level 31]")
+def set_tile():
+    level = smb1.Level(31)
+    tx, ty = level.w // 2, level.h - 1
+
+    def run():
+        level.set_tile(tx, ty, smb1.Tile.EMPTY)
+        level.set_tile(tx, ty, smb1.Tile.GROUND)
+    return run
+
+
+@benchmark("smb1.level_draw[scrolling]", ops=FRAMES)
+def level_draw_scrolling():
+    pygame.init()
+    level = smb1.Level(31)
+    surf = pygame.Surface((smb1.SCREEN_WIDTH, smb1.SCREEN_HEIGHT))
+    span = level.pixel_w - smb1.SCREEN_WIDTH
+
+    def run():
+        for i in range(FRAMES):
+            level.draw(surf, (i * 6) % span)
+    return run
@@ -0,0 +1,72 @@
+"""Frame-time comparison for smb1.py Level.draw: cached tiles/chunks vs. per-tile primitives.
+
+Run from the repository root:
+
+    python bench/bench_tile_atlas.py [--frames 600] [--level 31]
+"""
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+import smb1
+
+
+def legacy_draw(level, surf, camx, rows):
+    """The pre-atlas Level.draw tile loop over list-of-lists rows, kept here as the baseline."""
+    start_tx = max(0, camx // smb1.TILE - 1)
+    end_tx = min(level.w, (camx + smb1.SCREEN_WIDTH) // smb1.TILE + 2)
+    surf.fill(smb1.SKY)
+    for ty in range(level.h):
+        for tx in range(start_tx, end_tx):
+            tile = rows[ty][tx]
+            tile_rect = pygame.Rect(tx * smb1.TILE - camx, ty * smb1.TILE, smb1.TILE, smb1.TILE)
+            if tile == smb1.Tile.GROUND:
+                smb1.SpriteRenderer.draw_ground(surf, tile_rect)
+            elif tile == smb1.Tile.BRICK:
+                smb1.SpriteRenderer.draw_brick(surf, tile_rect)
+            elif tile == smb1.Tile.QUESTION:
+                smb1.SpriteRenderer.draw_question_block(surf, tile_rect)
+
+
+def time_frames(draw, level, surf, frames):
+    span = max(1, level.pixel_w - smb1.SCREEN_WIDTH)
+    samples = []
+    for i in range(frames):
+        camx = (i * 7) % span
+        t0 = time.perf_counter()
+        draw(level, surf, camx)
+        samples.append(time.perf_counter() - t0)
+    samples.sort()
+    return {
+        "mean_ms": 1000.0 * sum(samples) / len(samples),
+        "p50_ms": 1000.0 * samples[len(samples) // 2],
+        "p95_ms": 1000.0 * samples[int(len(samples) * 0.95)],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--level", type=int, default=smb1.MAX_LEVELS - 1)
+    args = parser.parse_args()
+
+    pygame.init()
+    level = smb1.Level(args.level)
+    rows = level.grid.tolist()
+    surf = pygame.Surface((smb1.SCREEN_WIDTH, smb1.SCREEN_HEIGHT))
+    results = {
+        "legacy": time_frames(lambda lv, s, cx: legacy_draw(lv, s, cx, rows), level, surf, args.frames),
+        "cached": time_frames(lambda lv, s, cx: lv.draw(s, cx), level, surf, args.frames),
+    }
+    for name, r in results.items():
+        print(f"{name:>7}: mean {r['mean_ms']:.3f} ms  p50 {r['p50_ms']:.3f} ms  p95 {r['p95_ms']:.3f} ms")
+    print(f"speedup: {results['legacy']['mean_ms'] / results['cached']['mean_ms']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
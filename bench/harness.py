@@ -0,0 +1,136 @@
+"""Minimal timing harness shared by the bench_* modules.
+
+Benchmarks register themselves with @benchmark. A benchmark function does its
+setup and returns the callable to time; the harness calibrates how many calls
+fill a timing window, repeats the window and reports per-operation statistics.
+"""
+import importlib.util
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+BENCHMARKS = []
+
+
+class Benchmark:
+    def __init__(self, name, setup, ops):
+        self.name = name
+        self.setup = setup
+        self.ops = ops
+
+
+def benchmark(name, ops=1):
+    """Register a setup function; `ops` is how many operations one call performs."""
+    def register(setup):
+        BENCHMARKS.append(Benchmark(name, setup, ops))
+        return setup
+    return register
+
+
+def load_script(filename, module_name):
+    """Import one of the game scripts by path (the 4k port's name is not importable)."""
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    spec = importlib.util.spec_from_file_location(module_name, os.path.join(ROOT, filename))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def measure(fn, window=0.1, repeat=7):
+    """Time fn() and return per-call seconds for each of `repeat` windows."""
+    number = 1
+    while True:
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - t0
+        if elapsed >= window or number >= 1 << 20:
+            break
+        number *= 2 if elapsed <= 0 else max(2, min(10, int(window / elapsed) + 1))
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - t0) / number)
+    return samples, number
+
+
+def run(pattern=None, window=0.1, repeat=7, log=print):
+    results = {}
+    for bench in BENCHMARKS:
+        if pattern and pattern not in bench.name:
+            continue
+        samples, number = measure(bench.setup(), window, repeat)
+        per_op = [s / bench.ops for s in samples]
+        results[bench.name] = {
+            "median": statistics.median(per_op),
+            "mean": statistics.fmean(per_op),
+            "min": min(per_op),
+            "stdev": statistics.stdev(per_op) if len(per_op) > 1 else 0.0,
+            "ops": bench.ops,
+            "number": number,
+            "repeat": repeat,
+        }
+        log(f"{bench.name:<44} {format_seconds(results[bench.name]['median']):>12}/op")
+    return results
+
+
+def metadata():
+    import pygame
+    return {
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def save(results, path):
+    with open(path, "w") as f:
+        json.dump({"meta": metadata(), "results": results}, f, indent=2, sort_keys=True)
+
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)["results"]
+
+
+def compare(base, new, threshold=0.10, log=print):
+    """Print median ratios new/base; return the names slower than 1 + threshold."""
+    regressions = []
+    for name in sorted(set(base) | set(new)):
+        if name not in base or name not in new:
+            log(f"{name:<44} {'only in ' + ('new' if name in new else 'base'):>30}")
+            continue
+        b, n = base[name]["median"], new[name]["median"]
+        ratio = n / b if b else float("inf")
+        flag = ""
+        if ratio > 1.0 + threshold:
+            flag = "REGRESSION"
+            regressions.append(name)
+        elif ratio < 1.0 - threshold:
+            flag = "faster"
+        log(f"{name:<44} {format_seconds(b):>12} -> {format_seconds(n):>12}  x{ratio:5.2f} {flag}")
+    return regressions
+
+
+def format_seconds(s):
+    if s >= 1.0:
+        return f"{s:.3f} s"
+    if s >= 1e-3:
+        return f"{s * 1e3:.3f} ms"
+    return f"{s * 1e6:.2f} us"
@@ -0,0 +1,45 @@
+"""Run the benchmark suite or compare two result files.
+
+    python bench/run.py [-k smb1.] [-o results.json]
+    python bench/run.py --compare base.json new.json [--threshold 0.10]
+
+All benchmarks run under the SDL dummy video driver. Compare mode exits with
+status 1 when any benchmark's median is slower than base by more than the
+threshold.
+"""
+import argparse
+import sys
+
+import harness
+import bench_smb1  # noqa: F401  (registers benchmarks)
+import bench_4k  # noqa: F401
+import bench_deluxe  # noqa: F401
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks for the three games.")
+    parser.add_argument("-k", dest="pattern", help="only run benchmarks whose name contains this")
+    parser.add_argument("-o", "--output", help="write results as JSON to this path")
+    parser.add_argument("--window", type=float, default=0.1, help="seconds per timing window")
+    parser.add_argument("--repeat", type=int, default=7, help="timing windows per benchmark")
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "NEW"), help="compare two result files")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="relative slowdown that counts as a regression (default 0.10)")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        regressions = harness.compare(harness.load(args.compare[0]), harness.load(args.compare[1]),
+                                      args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) beyond {args.threshold:.0%}")
+            return 1
+        return 0
+
+    results = harness.run(args.pattern, args.window, args.repeat)
+    if args.output:
+        harness.save(results, args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
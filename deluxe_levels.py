@@ -0,0 +1,498 @@
+"""Source level data for smb_deluxe_complete.py.
+
+The game does not import this at startup; it memory-maps the compiled
+deluxe_levels.pack (see levelpack.py), rebuilding it from here when the
+pack is missing or older than this file.
+"""
+
+# ============================================================================
+# LEVEL DATA - 32 Levels for Super Mario Bros Deluxe
+# ============================================================================
+
+# Format: (x, y, width, height, color_optional)
+# Platforms, Goals: (x, y)
+# Enemies: (x, y, size, speed)
+
+LEVELS = [
+    # WORLD 1 - Tutorial Levels
+    {
+        'name': 'Level 1-1: First Steps',
+        'start': (50, 400),
+        'platforms': [
+            (0, 560, 800, 40, (0, 200, 0)),  # Ground
+            (200, 480, 150, 20, (139, 69, 19)),  # Platform
+            (450, 400, 150, 20, (139, 69, 19)),
+        ],
+        'goal': (720, 490),
+        'enemies': []
+    },
+    {
+        'name': 'Level 1-2: Jump Training',
+        'start': (50, 400),
+        'platforms': [
+            (0, 560, 200, 40, (0, 200, 0)),
+            (250, 560, 200, 40, (0, 200, 0)),
+            (500, 560, 300, 40, (0, 200, 0)),
+            (300, 450, 100, 20, (139, 69, 19)),
+        ],
+        'goal': (750, 490),
+        'enemies': []
+    },
+    {
+        'name': 'Level 1-3: First Enemy',
+        'start': (50, 400),
+        'platforms': [
+            (0, 560, 800, 40, (0, 200, 0)),
+            (300, 480, 200, 20, (139, 69, 19)),
+        ],
+        'goal': (720, 490),
+        'enemies': [(400, 440, 30, 2)]
+    },
+    {
+        'name': 'Level 1-4: Stairway',
+        'start': (50, 400),
+        'platforms': [
+            (0, 560, 200, 40, (0, 200, 0)),
+            (150, 500, 100, 20, (139, 69, 19)),
+            (250, 440, 100, 20, (139, 69, 19)),
+            (350, 380, 100, 20, (139, 69, 19)),
+            (450, 320, 100, 20, (139, 69, 19)),
+            (550, 380, 100, 20, (139, 69, 19)),
+            (650, 440, 150, 20, (139, 69, 19)),
+        ],
+        'goal': (750, 370),
+        'enemies': []
+    },
+    
+    # WORLD 2 - Basic Challenges
+    {
+        'name': 'Level 2-1: Gap Jumps',
+        'start': (50, 400),
+        'platforms': [
+            (0, 560, 150, 40, (0, 200, 0)),
+            (250, 560, 150, 40, (0, 200, 0)),
+            (500, 560, 150, 40, (0, 200, 0)),
+            (700, 560, 100, 40, (0, 200, 0)),
+        ],
+        'goal': (730, 490),
+        'enemies': [(300, 520, 30, 2)]
+    },
+    {
+        'name': 'Level 2-2: Platform Hopping',
+        'start': (50, 400),
+        'platforms': [
+            (0, 560, 800, 40, (0, 200, 0)),
+            (150, 450, 80, 20, (139, 69, 19)),
+            (300, 380, 80, 20, (139, 69, 19)),
+            (450, 310, 80, 20, (139, 69, 19)),
+            (600, 380, 80, 20, (139, 69, 19)),
+        ],
+        'goal': (650, 310),
+        'enemies': [(200, 520, 30, 2), (500, 520, 30, 2)]
+    },
+    {
+        'name': 'Level 2-3: Enemy Patrol',
+        'start': (50, 400),
+        'platforms': [
+            (0, 560, 800, 40, (0, 200, 0)),
+            (200, 460, 400, 20, (139, 69, 19)),
+        ],
+        'goal': (520, 390),
+        'enemies': [(250, 420, 30, 3), (450, 420, 30, 2)]
+    },
+    {
+        'name': 'Level 2-4: Vertical Challenge',
+        'start': (50, 500),
+        'platforms': [
+            (0, 560, 150, 40, (0, 200, 0)),
+            (100, 480, 100, 20, (139, 69, 19)),
+            (250, 400, 100, 20, (139, 69, 19)),
+            (150, 320, 100, 20, (139, 69, 19)),
+            (300, 240, 100, 20, (139, 69, 19)),
+            (450, 240, 200, 20, (139, 69, 19)),
+        ],
+        'goal': (600, 170),
+        'enemies': [(350, 200, 30, 2)]
+    },
+    
+    # WORLD 3 - Intermediate
+    {
+        'name': 'Level 3-1: The Gauntlet',
+        'start': (50, 400),
+        'platforms': [
+            (0, 560, 800, 40, (0, 200, 0)),
+            (200, 450, 100, 20, (139, 69, 19)),
+            (400, 450, 100, 20, (139, 69, 19)),
+            (600, 450, 100, 20, (139, 69, 19)),
+        ],
+        'goal': (650, 380),
+        'enemies': [(250, 410, 30, 2), (450, 410, 30, 3), (650, 410, 30, 2)]
+    },
+    {
+        'name': 'Level 3-2: Precision Jumps',
+        'start': (50, 400),
+        'platforms': [
+            (0, 560, 120, 40, (0, 200, 0)),
+            (200, 500, 60, 20, (139, 69, 19)),
+            (340, 440, 60, 20, (139, 69, 19)),
+            (480, 380, 60, 20, (139, 69, 19)),
+            (620, 440, 60, 20, (139, 69, 19)),
+            (740, 500, 60, 20, (139, 69, 19)),
+        ],
+        'goal': (770, 430),
+        'enemies': []
+    },
+    {
+        'name': 'Level 3-3: Enemy Swarm',
+        'start': (50, 400),
+        'platforms': [
+            (0, 560, 800, 40, (0, 200, 0)),
+            (300, 420, 200, 20, (139, 69, 19)),
+        ],
+        'goal': (720, 490),
+        'enemies': [(200, 520, 30, 2), (350, 380, 30, 3), 
+                   (500, 520, 30, 2), (600, 520, 30, 3)]
+    },
+    {
+        'name': 'Level 3-4: Up and Down',
+        'start': (50, 500),
+        'platforms': [
+            (0, 560, 100, 40, (0, 200, 0)),
+            (120, 480, 80, 20, (139, 69, 19)),
+            (220, 400, 80, 20, (139, 69, 19)),
+            (320, 320, 80, 20, (139, 69, 19)),
+            (420, 400, 80, 20, (139, 69, 19)),
+            (520, 480, 80, 20, (139, 69, 19)),
+            (620, 560, 180, 40, (0, 200, 0)),
+        ],
+        'goal': (720, 490),
+        'enemies': [(270, 360, 30, 2), (470, 440, 30, 2)]
+    },
+    
+    # WORLD 4 - Advanced
+    {
+        'name': 'Level 4-1: Speed Run',
+        'start': (50, 400),
+        'platforms': [
+            (0, 560, 150, 40, (0, 200, 0)),
+            (200, 560, 100, 40, (0, 200, 0)),
+            (350, 560, 100, 40, (0, 200, 0)),
+            (500, 560, 100, 40, (0, 200, 0)),
+            (650, 560, 150, 40, (0, 200, 0)),
+        ],
+        'goal': (730, 490),
+        'enemies': [(250, 520, 30, 4), (400, 520, 30, 4), (550, 520, 30, 4)]
+    },
+    {
+        'name': 'Level 4-2: Sky Platforms',
+        'start': (50, 500),
+        'platforms': [
+            (0, 560, 100, 40, (0, 200, 0)),
+            (150, 450, 80, 20, (139, 69, 19)),
+            (280, 360, 80, 20, (139, 69, 19)),
+            (410, 270, 80, 20, (139, 69, 19)),
+            (540, 270, 80, 20, (139, 69, 19)),
+            (670, 360, 130, 20, (139, 69, 19)),
+        ],
+        'goal': (730, 290),
+        'enemies': [(200, 410, 30, 2), (330, 320, 30, 2)]
+    },
+    {
+        'name': 'Level 4-3: Danger Zone',
+        'start': (50, 400),
+        'platforms': [
+            (0, 560, 800, 40, (0, 200, 0)),
+            (150, 440, 120, 20, (139, 69, 19)),
+            (350, 440, 120, 20, (139, 69, 19)),
+            (550, 440, 120, 20, (139, 69, 19)),
+        ],
+        'goal': (620, 370),
+        'enemies': [(200, 400, 30, 3), (400, 400, 30, 3), 
+                   (300, 520, 30, 2), (500, 520, 30, 2), (600, 400, 30, 3)]
+    },
+    {
+        'name': 'Level 4-4: Castle Stairs',
+        'start': (50, 500),
+        'platforms': [
+            (0, 560, 100, 40, (0, 200, 0)),
+            (80, 500, 60, 20, (100, 100, 100)),
+            (140, 440, 60, 20, (100, 100, 100)),
+            (200, 380, 60, 20, (100, 100, 100)),
+            (260, 320, 60, 20, (100, 100, 100)),
+            (320, 260, 60, 20, (100, 100, 100)),
+            (380, 200, 60, 20, (100, 100, 100)),
+            (440, 200, 360, 20, (100, 100, 100)),
+        ],
+        'goal': (750, 130),
+        'enemies': [(190, 340, 30, 2), (310, 220, 30, 2), (550, 160, 30, 3)]
+    },
+    
+    # WORLD 5 - Expert
+    {
+        'name': 'Level 5-1: Maze Runner',
+        'start': (50, 500),
+        'platforms': [
+            (0, 560, 200, 40, (0, 200, 0)),
+            (250, 480, 100, 80, (139, 69, 19)),
+            (250, 380, 100, 20, (139, 69, 19)),
+            (400, 480, 100, 80, (139, 69, 19)),
+            (550, 380, 100, 180, (139, 69, 19)),
+            (700, 480, 100, 80, (139, 69, 19)),
+        ],
+        'goal': (730, 410),
+        'enemies': [(300, 340, 30, 2), (450, 440, 30, 2)]
+    },
+    {
+        'name': 'Level 5-2: Floating Islands',
+        'start': (50, 500),
+        'platforms': [
+            (0, 560, 80, 40, (0, 200, 0)),
+            (140, 480, 70, 15, (139, 69, 19)),
+            (250, 400, 70, 15, (139, 69, 19)),
+            (360, 320, 70, 15, (139, 69, 19)),
+            (470, 320, 70, 15, (139, 69, 19)),
+            (580, 400, 70, 15, (139, 69, 19)),
+            (690, 480, 110, 15, (139, 69, 19)),
+        ],
+        'goal': (740, 410),
+        'enemies': [(300, 360, 30, 2), (520, 360, 30, 2)]
+    },
+    {
+        'name': 'Level 5-3: Narrow Escape',
+        'start': (50, 400),
+        'platforms': [
+            (0, 560, 800, 40, (0, 200, 0)),
+            (200, 460, 50, 20, (139, 69, 19)),
+            (300, 460, 50, 20, (139, 69, 19)),
+            (400, 460, 50, 20, (139, 69, 19)),
+            (500, 460, 50, 20, (139, 69, 19)),
+            (600, 460, 50, 20, (139, 69, 19)),
+        ],
+        'goal': (630, 390),
+        'enemies': [(240, 420, 30, 3), (340, 420, 30, 3), 
+                   (440, 420, 30, 3), (540, 420, 30, 3)]
+    },
+    {
+        'name': 'Level 5-4: Tower Climb',
+        'start': (50, 520),
+        'platforms': [
+            (0, 560, 100, 40, (0, 200, 0)),
+            (120, 490, 70, 15, (139, 69, 19)),
+            (70, 420, 70, 15, (139, 69, 19)),
+            (140, 350, 70, 15, (139, 69, 19)),
+            (70, 280, 70, 15, (139, 69, 19)),
+            (140, 210, 70, 15, (139, 69, 19)),
+            (70, 140, 130, 15, (139, 69, 19)),
+            (250, 140, 550, 15, (139, 69, 19)),
+        ],
+        'goal': (750, 70),
+        'enemies': [(120, 310, 30, 2), (120, 170, 30, 2), (400, 100, 30, 3)]
+    },
+    
+    # WORLD 6 - Master
+    {
+        'name': 'Level 6-1: Death From Above',
+        'start': (50, 500),
+        'platforms': [
+            (0, 560, 100, 40, (0, 200, 0)),
+            (150, 500, 60, 15, (139, 69, 19)),
+            (250, 440, 60, 15, (139, 69, 19)),
+            (350, 380, 60, 15, (139, 69, 19)),
+            (450, 320, 60, 15, (139, 69, 19)),
+            (550, 260, 60, 15, (139, 69, 19)),
+            (650, 200, 150, 15, (139, 69, 19)),
+        ],
+        'goal': (750, 130),
+        'enemies': [(200, 460, 30, 2), (300, 400, 30, 2), 
+                   (400, 340, 30, 2), (500, 280, 30, 2), (600, 220, 30, 2)]
+    },
+    {
+        'name': 'Level 6-2: Platform Hell',
+        'start': (50, 500),
+        'platforms': [
+            (0, 560, 70, 40, (0, 200, 0)),
+            (120, 480, 50, 15, (139, 69, 19)),
+            (220, 400, 50, 15, (139, 69, 19)),
+            (320, 320, 50, 15, (139, 69, 19)),
+            (420, 400, 50, 15, (139, 69, 19)),
+            (520, 480, 50, 15, (139, 69, 19)),
+            (620, 400, 50, 15, (139, 69, 19)),
+            (720, 480, 80, 15, (139, 69, 19)),
+        ],
+        'goal': (750, 410),
+        'enemies': [(270, 360, 30, 2), (370, 440, 30, 2), (470, 520, 30, 3)]
+    },
+    {
+        'name': 'Level 6-3: The Grinder',
+        'start': (50, 400),
+        'platforms': [
+            (0, 560, 800, 40, (0, 200, 0)),
+            (100, 450, 80, 20, (139, 69, 19)),
+            (250, 450, 80, 20, (139, 69, 19)),
+            (400, 450, 80, 20, (139, 69, 19)),
+            (550, 450, 80, 20, (139, 69, 19)),
+            (700, 450, 100, 20, (139, 69, 19)),
+        ],
+        'goal': (750, 380),
+        'enemies': [(140, 410, 30, 4), (290, 410, 30, 4), 
+                   (440, 410, 30, 4), (590, 410, 30, 4)]
+    },
+    {
+        'name': 'Level 6-4: Final Castle',
+        'start': (50, 500),
+        'platforms': [
+            (0, 560, 80, 40, (100, 100, 100)),
+            (100, 500, 60, 15, (100, 100, 100)),
+            (180, 440, 60, 15, (100, 100, 100)),
+            (260, 380, 60, 15, (100, 100, 100)),
+            (340, 320, 60, 15, (100, 100, 100)),
+            (420, 260, 60, 15, (100, 100, 100)),
+            (500, 320, 60, 15, (100, 100, 100)),
+            (580, 380, 60, 15, (100, 100, 100)),
+            (660, 320, 140, 15, (100, 100, 100)),
+        ],
+        'goal': (760, 250),
+        'enemies': [(130, 460, 30, 2), (210, 400, 30, 2), (290, 340, 30, 3),
+                   (370, 280, 30, 2), (530, 340, 30, 3), (610, 400, 30, 2)]
+    },
+    
+    # WORLD 7 - Insane
+    {
+        'name': 'Level 7-1: No Ground',
+        'start': (50, 450),
+        'platforms': [
+            (0, 500, 80, 15, (139, 69, 19)),
+            (120, 420, 60, 15, (139, 69, 19)),
+            (220, 360, 60, 15, (139, 69, 19)),
+            (320, 300, 60, 15, (139, 69, 19)),
+            (420, 360, 60, 15, (139, 69, 19)),
+            (520, 420, 60, 15, (139, 69, 19)),
+            (620, 360, 60, 15, (139, 69, 19)),
+            (720, 300, 80, 15, (139, 69, 19)),
+        ],
+        'goal': (760, 230),
+        'enemies': [(170, 380, 30, 2), (370, 320, 30, 2), (570, 380, 30, 2)]
+    },
+    {
+        'name': 'Level 7-2: Bullet Hell',
+        'start': (50, 400),
+        'platforms': [
+            (0, 560, 800, 40, (0, 200, 0)),
+        ],
+        'goal': (750, 490),
+        'enemies': [(150, 520, 30, 5), (250, 520, 30, 5), (350, 520, 30, 5),
+                   (450, 520, 30, 5), (550, 520, 30, 5), (650, 520, 30, 5)]
+    },
+    {
+        'name': 'Level 7-3: Spiral Ascent',
+        'start': (50, 520),
+        'platforms': [
+            (0, 560, 100, 40, (0, 200, 0)),
+            (120, 490, 60, 15, (139, 69, 19)),
+            (200, 420, 60, 15, (139, 69, 19)),
+            (280, 350, 60, 15, (139, 69, 19)),
+            (360, 280, 60, 15, (139, 69, 19)),
+            (440, 210, 60, 15, (139, 69, 19)),
+            (520, 140, 60, 15, (139, 69, 19)),
+            (440, 140, 60, 15, (139, 69, 19)),
+            (360, 140, 60, 15, (139, 69, 19)),
+            (280, 140, 60, 15, (139, 69, 19)),
+            (280, 70, 520, 15, (139, 69, 19)),
+        ],
+        'goal': (760, 0),
+        'enemies': [(170, 450, 30, 2), (250, 380, 30, 2), (330, 310, 30, 2),
+                   (410, 240, 30, 2), (490, 170, 30, 2)]
+    },
+    {
+        'name': 'Level 7-4: The Gauntlet Supreme',
+        'start': (50, 500),
+        'platforms': [
+            (0, 560, 70, 40, (100, 100, 100)),
+            (100, 490, 50, 15, (100, 100, 100)),
+            (180, 420, 50, 15, (100, 100, 100)),
+            (260, 350, 50, 15, (100, 100, 100)),
+            (340, 280, 50, 15, (100, 100, 100)),
+            (420, 350, 50, 15, (100, 100, 100)),
+            (500, 420, 50, 15, (100, 100, 100)),
+            (580, 350, 50, 15, (100, 100, 100)),
+            (660, 280, 140, 15, (100, 100, 100)),
+        ],
+        'goal': (760, 210),
+        'enemies': [(130, 450, 30, 3), (210, 380, 30, 3), (290, 310, 30, 4),
+                   (370, 380, 30, 3), (450, 450, 30, 3), (530, 380, 30, 4)]
+    },
+    
+    # WORLD 8 - Impossible
+    {
+        'name': 'Level 8-1: Nightmare',
+        'start': (50, 480),
+        'platforms': [
+            (0, 530, 60, 15, (139, 69, 19)),
+            (100, 460, 50, 15, (139, 69, 19)),
+            (190, 390, 50, 15, (139, 69, 19)),
+            (280, 320, 50, 15, (139, 69, 19)),
+            (370, 250, 50, 15, (139, 69, 19)),
+            (460, 320, 50, 15, (139, 69, 19)),
+            (550, 390, 50, 15, (139, 69, 19)),
+            (640, 460, 50, 15, (139, 69, 19)),
+            (730, 390, 70, 15, (139, 69, 19)),
+        ],
+        'goal': (760, 320),
+        'enemies': [(140, 420, 30, 3), (230, 350, 30, 3), (320, 280, 30, 4),
+                   (410, 350, 30, 3), (500, 420, 30, 3), (590, 490, 30, 3)]
+    },
+    {
+        'name': 'Level 8-2: The Void',
+        'start': (50, 450),
+        'platforms': [
+            (0, 500, 70, 15, (139, 69, 19)),
+            (120, 430, 55, 15, (139, 69, 19)),
+            (225, 360, 55, 15, (139, 69, 19)),
+            (330, 290, 55, 15, (139, 69, 19)),
+            (435, 220, 55, 15, (139, 69, 19)),
+            (540, 290, 55, 15, (139, 69, 19)),
+            (645, 360, 55, 15, (139, 69, 19)),
+            (745, 290, 55, 15, (139, 69, 19)),
+        ],
+        'goal': (770, 220),
+        'enemies': [(165, 390, 30, 2), (270, 320, 30, 3), (375, 250, 30, 4),
+                   (480, 180, 30, 3), (585, 250, 30, 3), (690, 320, 30, 2)]
+    },
+    {
+        'name': 'Level 8-3: Perfect Timing',
+        'start': (50, 500),
+        'platforms': [
+            (0, 550, 60, 15, (139, 69, 19)),
+            (110, 480, 45, 15, (139, 69, 19)),
+            (205, 410, 45, 15, (139, 69, 19)),
+            (300, 340, 45, 15, (139, 69, 19)),
+            (395, 270, 45, 15, (139, 69, 19)),
+            (490, 200, 45, 15, (139, 69, 19)),
+            (585, 270, 45, 15, (139, 69, 19)),
+            (680, 340, 120, 15, (139, 69, 19)),
+        ],
+        'goal': (760, 270),
+        'enemies': [(140, 440, 30, 4), (235, 370, 30, 4), (330, 300, 30, 5),
+                   (425, 230, 30, 4), (520, 160, 30, 4), (615, 230, 30, 4)]
+    },
+    {
+        'name': 'Level 8-4: The Final Challenge',
+        'start': (50, 520),
+        'platforms': [
+            (0, 560, 60, 40, (255, 0, 0)),
+            (90, 500, 45, 15, (100, 100, 100)),
+            (165, 440, 45, 15, (100, 100, 100)),
+            (240, 380, 45, 15, (100, 100, 100)),
+            (315, 320, 45, 15, (100, 100, 100)),
+            (390, 260, 45, 15, (100, 100, 100)),
+            (465, 200, 45, 15, (100, 100, 100)),
+            (540, 260, 45, 15, (100, 100, 100)),
+            (615, 320, 45, 15, (100, 100, 100)),
+            (690, 260, 110, 15, (100, 100, 100)),
+        ],
+        'goal': (760, 190),
+        'enemies': [(120, 460, 30, 4), (195, 400, 30, 4), (270, 340, 30, 5),
+                   (345, 280, 30, 5), (420, 220, 30, 5), (495, 160, 30, 4),
+                   (570, 220, 30, 5), (645, 280, 30, 4)]
+    },
+]
@@ -0,0 +1,105 @@
+"""Fixed-timestep game loop driver shared by the three games.
+
+The games used to step their physics once per rendered frame, so a slow
+frame slowed the game itself down and the render rate was welded to the
+simulation rate. FixedStepLoop decouples the two: real time accumulates,
+and each frame runs as many fixed-size steps as fit, then renders once.
+
+    loop = FixedStepLoop(60)
+    while running:
+        for _ in range(loop.advance()):
+            interpolator.capture(moving_sprites)
+            step()
+        render(loop.alpha)
+
+After a stall the loop runs at most max_steps catch-up steps and drops the
+rest of the backlog instead of spiralling. A frame that runs no step shows
+the same simulation state again, blended further along by alpha. Both cases
+are counted.
+"""
+from time import perf_counter
+
+
+class FixedStepLoop:
+    """Turns elapsed wall time into a whole number of fixed simulation steps."""
+
+    def __init__(self, step_rate=60, max_steps=5):
+        self.step_dt = 1.0 / step_rate
+        self.max_steps = max_steps
+        # Start one step in credit so the first frame has something to show.
+        self.accumulator = self.step_dt
+        self.last = None
+        self.frames = 0
+        self.steps = 0
+        self.skipped = 0        # steps dropped because catch-up hit max_steps
+        self.duplicated = 0     # frames that ran no step at all
+
+    def advance(self, elapsed=None):
+        """Add elapsed seconds (measured since the last call by default); return steps to run."""
+        now = perf_counter()
+        if elapsed is None:
+            elapsed = 0.0 if self.last is None else now - self.last
+        self.last = now
+        self.accumulator += elapsed
+        steps = int(self.accumulator / self.step_dt)
+        if steps > self.max_steps:
+            self.skipped += steps - self.max_steps
+            steps = self.max_steps
+            self.accumulator = 0.0
+        else:
+            self.accumulator -= steps * self.step_dt
+        self.frames += 1
+        self.steps += steps
+        if not steps:
+            self.duplicated += 1
+        return steps
+
+    @property
+    def alpha(self):
+        """How far real time has moved past the last step, as a fraction of a step."""
+        return min(1.0, self.accumulator / self.step_dt)
+
+    def reset(self):
+        """Forget the time that passed while the loop was not running (e.g. a loading screen)."""
+        self.last = None
+
+    def summary(self):
+        return (f"loop: {self.steps} steps / {self.frames} frames; "
+                f"{self.skipped} skipped, {self.duplicated} duplicated")
+
+
+def lerp(a, b, alpha):
+    return a + (b - a) * alpha
+
+
+class Interpolator:
+    """Positions of sprites before the latest step, for drawing between states.
+
+    Call capture() with the moving sprites right before each step, then
+    position() while drawing. Sprites that were not captured, or that moved
+    further than snap_distance in one step (respawns, level changes), are
+    drawn where they are.
+    """
+
+    def __init__(self, snap_distance=64):
+        self.snap_distance = snap_distance
+        self.previous = {}
+
+    def capture(self, sprites):
+        previous = self.previous
+        previous.clear()
+        for sprite in sprites:
+            previous[sprite] = sprite.rect.topleft
+
+    def clear(self):
+        self.previous.clear()
+
+    def position(self, sprite, alpha):
+        x1, y1 = sprite.rect.topleft
+        prev = self.previous.get(sprite)
+        if prev is None:
+            return x1, y1
+        x0, y0 = prev
+        if abs(x1 - x0) > self.snap_distance or abs(y1 - y0) > self.snap_distance:
+            return x1, y1
+        return round(lerp(x0, x1, alpha)), round(lerp(y0, y1, alpha))
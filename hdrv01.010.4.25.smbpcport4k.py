@@ -1,7 +1,14 @@
 import pygame
 import random
 import sys
-import math
+import argparse
+import itertools
+import numpy as np
+
+from gameloop import FixedStepLoop, Interpolator
+from levelloader import LevelLoader
+from perf import FrameTimer, LoadGovernor, PerfOverlay, Tracer
+from textcache import FONTS, TEXT
 
 # Initialize Pygame
 pygame.init()
@@ -15,6 +22,12 @@ JUMP_STRENGTH = -15
 PLAYER_SPEED = 5
 RUN_SPEED = 7
 
+# Font sizes (rendered through the shared text cache)
+FONT_LARGE = 72
+FONT_MEDIUM = 48
+FONT_SMALL = 32
+HUD_HEIGHT = 50
+
 # SMB3 Color Palette
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
@@ -38,6 +51,11 @@ SHELL_GREEN = (0, 184, 0)
 POWERUP_MUSHROOM = 0
 POWERUP_FIRE_FLOWER = 1
 POWERUP_LEAF = 2
+POWERUP_COLORS = {
+    POWERUP_MUSHROOM: MUSHROOM_RED,
+    POWERUP_FIRE_FLOWER: MUSHROOM_RED,
+    POWERUP_LEAF: BROWN,
+}
 
 # Game States
 TITLE_SCREEN = 0
@@ -53,32 +71,129 @@ SUPER_MARIO = 1
 FIRE_MARIO = 2
 RACCOON_MARIO = 3
 
-class Particle(pygame.sprite.Sprite):
-    def __init__(self, x, y, color):
-        super().__init__()
-        self.image = pygame.Surface((4, 4))
-        self.image.fill(color)
-        self.rect = self.image.get_rect()
-        self.rect.x = x
-        self.rect.y = y
-        self.vel_x = random.randint(-3, 3)
-        self.vel_y = random.randint(-8, -3)
-        self.lifetime = 30
-        
+class SpriteCache:
+    """Process-wide entity images, built once per (entity type, variant, state).
+
+    Instances share the returned Surfaces, so never draw onto them; swap the
+    reference instead. Images are converted to the display format when a
+    display exists.
+    """
+    def __init__(self):
+        self.images = {}
+        
+    def get(self, key, builder):
+        image = self.images.get(key)
+        if image is None:
+            image = builder()
+            if pygame.display.get_surface() is not None:
+                image = image.convert_alpha() if image.get_flags() & pygame.SRCALPHA else image.convert()
+            self.images[key] = image
+        return image
+
+SPRITES = SpriteCache()
+
+PARTICLE_SIZE = 4
+PARTICLE_LIFETIME = 30
+PARTICLE_GRAVITY = 0.5
+# Pixel offsets covering one particle square
+PARTICLE_DX = np.tile(np.arange(PARTICLE_SIZE), PARTICLE_SIZE)
+PARTICLE_DY = np.repeat(np.arange(PARTICLE_SIZE), PARTICLE_SIZE)
+
+class ParticleSystem:
+    """Fixed-capacity particle pool stored in NumPy arrays.
+
+    Slots are handed out from a free list; update() integrates every live
+    particle in one vectorized step and draw() writes them straight into the
+    target's pixels, oldest first. Spawns beyond capacity are dropped.
+    """
+    def __init__(self, capacity=2048):
+        self.capacity = capacity
+        self.x = np.zeros(capacity, np.int32)
+        self.y = np.zeros(capacity, np.int32)
+        self.vel_x = np.zeros(capacity, np.int32)
+        self.vel_y = np.zeros(capacity, np.float64)
+        self.lifetime = np.zeros(capacity, np.int16)
+        self.color = np.zeros(capacity, np.int16)
+        self.born = np.zeros(capacity, np.int64)
+        self.alive = np.zeros(capacity, bool)
+        self.free = list(range(capacity - 1, -1, -1))
+        self.count = 0
+        self.spawned = 0
+        self.palette = {}
+        self.colors = []
+        
+    def __len__(self):
+        return self.count
+        
+    def color_index(self, color):
+        index = self.palette.get(color)
+        if index is None:
+            index = self.palette[color] = len(self.colors)
+            self.colors.append(color)
+        return index
+        
+    def emit(self, x, y, color, count):
+        color = self.color_index(color)
+        for _ in range(count):
+            if not self.free:
+                return
+            i = self.free.pop()
+            self.x[i] = x
+            self.y[i] = y
+            self.vel_x[i] = random.randint(-3, 3)
+            self.vel_y[i] = random.randint(-8, -3)
+            self.lifetime[i] = PARTICLE_LIFETIME
+            self.color[i] = color
+            self.born[i] = self.spawned
+            self.alive[i] = True
+            self.spawned += 1
+            self.count += 1
+            
     def update(self):
-        self.vel_y += 0.5
-        self.rect.x += self.vel_x
-        self.rect.y += self.vel_y
-        self.lifetime -= 1
-        if self.lifetime <= 0:
-            self.kill()
+        if not self.count:
+            return
+        live = np.flatnonzero(self.alive)
+        self.vel_y[live] += PARTICLE_GRAVITY
+        self.x[live] += self.vel_x[live]
+        # Rect coordinates round halves away from zero
+        y = self.y[live] + self.vel_y[live]
+        self.y[live] = np.trunc(y + np.copysign(0.5, y))
+        self.lifetime[live] -= 1
+        dead = live[self.lifetime[live] <= 0]
+        if len(dead):
+            self.alive[dead] = False
+            self.free.extend(dead.tolist())
+            self.count -= len(dead)
+            
+    def draw(self, surface):
+        if not self.count:
+            return
+        live = np.flatnonzero(self.alive)
+        live = live[np.argsort(self.born[live], kind='stable')]
+        if surface.get_bytesize() != 4:
+            for c, x, y in zip(self.color[live].tolist(), self.x[live].tolist(), self.y[live].tolist()):
+                surface.fill(self.colors[c], (x, y, PARTICLE_SIZE, PARTICLE_SIZE))
+            return
+        clip = surface.get_clip()
+        px = (self.x[live, None] + PARTICLE_DX).ravel()
+        py = (self.y[live, None] + PARTICLE_DY).ravel()
+        inside = (px >= clip.left) & (px < clip.right) & (py >= clip.top) & (py < clip.bottom)
+        mapped = np.array([surface.map_rgb(c) for c in self.colors], np.uint32)
+        values = np.repeat(mapped[self.color[live]], PARTICLE_SIZE * PARTICLE_SIZE)
+        # Later writes win, so newer particles overlap older ones as with blits
+        pixels = pygame.surfarray.pixels2d(surface)
+        pixels[px[inside], py[inside]] = values[inside]
+        del pixels
+        
+    def clear(self):
+        self.alive[:] = False
+        self.free = list(range(self.capacity - 1, -1, -1))
+        self.count = 0
 
 class Fireball(pygame.sprite.Sprite):
     def __init__(self, x, y, direction):
         super().__init__()
-        self.image = pygame.Surface((12, 12))
-        pygame.draw.circle(self.image, BRICK_ORANGE, (6, 6), 6)
-        pygame.draw.circle(self.image, COIN_GOLD, (6, 6), 4)
+        self.image = SPRITES.get(('fireball',), self.build_image)
         self.rect = self.image.get_rect()
         self.rect.x = x
         self.rect.y = y
@@ -86,13 +201,20 @@ class Fireball(pygame.sprite.Sprite):
         self.vel_y = 0
         self.bounces = 0
         
-    def update(self, platforms):
+    @staticmethod
+    def build_image():
+        image = pygame.Surface((12, 12))
+        pygame.draw.circle(image, BRICK_ORANGE, (6, 6), 6)
+        pygame.draw.circle(image, COIN_GOLD, (6, 6), 4)
+        return image
+        
+    def update(self, spatial):
         self.vel_y += GRAVITY
         self.rect.x += self.vel_x
         self.rect.y += self.vel_y
         
         # Check platform collision for bouncing
-        for platform in platforms:
+        for platform in spatial.query(self.rect, 'platform'):
             if self.rect.colliderect(platform.rect) and self.vel_y > 0:
                 self.rect.bottom = platform.rect.top
                 self.vel_y = -8
@@ -105,7 +227,6 @@ class Player(pygame.sprite.Sprite):
     def __init__(self, x, y):
         super().__init__()
         self.state = SMALL_MARIO
-        self.image = pygame.Surface((32, 32))
         self.update_sprite()
         self.rect = self.image.get_rect()
         self.rect.x = x
@@ -124,37 +245,43 @@ class Player(pygame.sprite.Sprite):
         self.can_shoot = False
         
     def update_sprite(self):
-        """Update sprite based on power-up state (SMB3 style)"""
-        self.image.fill((0, 0, 0, 0))
+        """Point the sprite at the cached image for the current power-up state"""
+        self.image = SPRITES.get(('player', self.state), lambda: self.build_sprite(self.state))
+        
+    @staticmethod
+    def build_sprite(state):
+        """Draw the sprite for a power-up state (SMB3 style)"""
+        image = pygame.Surface((32, 32))
         
-        if self.state == SMALL_MARIO:
+        if state == SMALL_MARIO:
             # Small Mario - simple red/blue sprite
-            pygame.draw.rect(self.image, MARIO_RED, (8, 12, 16, 12))  # Body
-            pygame.draw.rect(self.image, MARIO_BLUE, (10, 8, 12, 8))  # Overalls
-            pygame.draw.circle(self.image, (255, 200, 150), (16, 8), 6)  # Head
-        elif self.state == SUPER_MARIO:
+            pygame.draw.rect(image, MARIO_RED, (8, 12, 16, 12))  # Body
+            pygame.draw.rect(image, MARIO_BLUE, (10, 8, 12, 8))  # Overalls
+            pygame.draw.circle(image, (255, 200, 150), (16, 8), 6)  # Head
+        elif state == SUPER_MARIO:
             # Super Mario - taller sprite
-            pygame.draw.rect(self.image, MARIO_RED, (8, 8, 16, 16))  # Body
-            pygame.draw.rect(self.image, MARIO_BLUE, (10, 4, 12, 12))  # Overalls
-            pygame.draw.circle(self.image, (255, 200, 150), (16, 6), 6)  # Head
-        elif self.state == FIRE_MARIO:
+            pygame.draw.rect(image, MARIO_RED, (8, 8, 16, 16))  # Body
+            pygame.draw.rect(image, MARIO_BLUE, (10, 4, 12, 12))  # Overalls
+            pygame.draw.circle(image, (255, 200, 150), (16, 6), 6)  # Head
+        elif state == FIRE_MARIO:
             # Fire Mario - white/red colors
-            pygame.draw.rect(self.image, WHITE, (8, 8, 16, 16))  # White body
-            pygame.draw.rect(self.image, MARIO_RED, (10, 4, 12, 12))  # Red overalls
-            pygame.draw.circle(self.image, (255, 200, 150), (16, 6), 6)  # Head
+            pygame.draw.rect(image, WHITE, (8, 8, 16, 16))  # White body
+            pygame.draw.rect(image, MARIO_RED, (10, 4, 12, 12))  # Red overalls
+            pygame.draw.circle(image, (255, 200, 150), (16, 6), 6)  # Head
             # Fire effect
-            pygame.draw.circle(self.image, BRICK_ORANGE, (24, 20), 4)
-        elif self.state == RACCOON_MARIO:
+            pygame.draw.circle(image, BRICK_ORANGE, (24, 20), 4)
+        elif state == RACCOON_MARIO:
             # Raccoon Mario - with tail and ears
-            pygame.draw.rect(self.image, BROWN, (8, 8, 16, 16))  # Brown body
-            pygame.draw.rect(self.image, MARIO_BLUE, (10, 4, 12, 12))  # Overalls
-            pygame.draw.circle(self.image, (255, 200, 150), (16, 6), 6)  # Head
+            pygame.draw.rect(image, BROWN, (8, 8, 16, 16))  # Brown body
+            pygame.draw.rect(image, MARIO_BLUE, (10, 4, 12, 12))  # Overalls
+            pygame.draw.circle(image, (255, 200, 150), (16, 6), 6)  # Head
             # Raccoon tail
-            pygame.draw.circle(self.image, BROWN, (4, 24), 6)
-            pygame.draw.circle(self.image, BLACK, (4, 24), 3)
+            pygame.draw.circle(image, BROWN, (4, 24), 6)
+            pygame.draw.circle(image, BLACK, (4, 24), 3)
             # Ears
-            pygame.draw.circle(self.image, BROWN, (12, 2), 3)
-            pygame.draw.circle(self.image, BROWN, (20, 2), 3)
+            pygame.draw.circle(image, BROWN, (12, 2), 3)
+            pygame.draw.circle(image, BROWN, (20, 2), 3)
+        return image
         
     def shoot_fireball(self, fireballs):
         if self.state == FIRE_MARIO and self.can_shoot:
@@ -163,7 +290,8 @@ class Player(pygame.sprite.Sprite):
             fireballs.add(fireball)
             self.can_shoot = False
             
-    def update(self, platforms, enemies, coins, powerups, question_blocks, fireballs, particles):
+    def update(self, level, fireballs, particles):
+        spatial = level.spatial
         keys = pygame.key.get_pressed()
         
         # Running (hold shift)
@@ -211,11 +339,11 @@ class Player(pygame.sprite.Sprite):
             
         # Update position
         self.rect.x += self.vel_x
-        self.check_collision_x(platforms)
+        self.check_collision_x(spatial)
         
         self.rect.y += self.vel_y
         self.on_ground = False
-        self.check_collision_y(platforms)
+        self.check_collision_y(spatial)
         
         # Invincibility timer
         if self.invincible_timer > 0:
@@ -223,38 +351,36 @@ class Player(pygame.sprite.Sprite):
         
         # Check enemy collision
         if self.invincible_timer == 0:
-            enemy_hit = pygame.sprite.spritecollide(self, enemies, False)
+            enemy_hit = spatial.query(self.rect, 'enemy')
             for enemy in enemy_hit:
                 if self.vel_y > 0 and self.rect.bottom <= enemy.rect.centery:
                     enemy.kill()
                     self.vel_y = -10
                     self.score += 100
                     # Particles
-                    for _ in range(8):
-                        particles.add(Particle(enemy.rect.centerx, enemy.rect.centery, DARK_ORANGE))
+                    particles.emit(enemy.rect.centerx, enemy.rect.centery, DARK_ORANGE, 8)
                 else:
                     self.take_damage()
                     
         # Check coin collision
-        coin_hit = pygame.sprite.spritecollide(self, coins, True)
+        coin_hit = spatial.query(self.rect, 'coin')
         for coin in coin_hit:
+            coin.kill()
             self.coins += 1
             self.score += 10
-            for _ in range(5):
-                particles.add(Particle(coin.rect.centerx, coin.rect.centery, COIN_GOLD))
+            particles.emit(coin.rect.centerx, coin.rect.centery, COIN_GOLD, 5)
             
         # Check powerup collision
-        powerup_hit = pygame.sprite.spritecollide(self, powerups, True)
+        powerup_hit = pygame.sprite.spritecollide(self, level.powerups, True)
         for powerup in powerup_hit:
             self.collect_powerup(powerup)
-            for _ in range(10):
-                particles.add(Particle(powerup.rect.centerx, powerup.rect.centery, powerup.color))
+            particles.emit(powerup.rect.centerx, powerup.rect.centery, powerup.color, 10)
             
         # Check question block collision
-        for block in question_blocks:
+        for block in spatial.query(self.rect, 'block'):
             if self.rect.colliderect(block.rect) and self.vel_y < 0:
                 if self.rect.top <= block.rect.bottom:
-                    block.hit(powerups, coins, particles)
+                    block.hit(level.powerups, level.coins, particles)
                     self.vel_y = 0
                     
         # Keep player on screen
@@ -292,16 +418,16 @@ class Player(pygame.sprite.Sprite):
             self.score += 1000
         self.update_sprite()
             
-    def check_collision_x(self, platforms):
-        for platform in platforms:
+    def check_collision_x(self, spatial):
+        for platform in spatial.query(self.rect, 'platform'):
             if self.rect.colliderect(platform.rect):
                 if self.vel_x > 0:
                     self.rect.right = platform.rect.left
                 elif self.vel_x < 0:
                     self.rect.left = platform.rect.right
                     
-    def check_collision_y(self, platforms):
-        for platform in platforms:
+    def check_collision_y(self, spatial):
+        for platform in spatial.query(self.rect, 'platform'):
             if self.rect.colliderect(platform.rect):
                 if self.vel_y > 0:
                     self.rect.bottom = platform.rect.top
@@ -314,64 +440,89 @@ class Player(pygame.sprite.Sprite):
 class Platform(pygame.sprite.Sprite):
     def __init__(self, x, y, width, height, style='ground'):
         super().__init__()
-        self.image = pygame.Surface((width, height))
         self.style = style
-        self.draw_platform()
+        self.image = SPRITES.get(('platform', style, width, height),
+                                 lambda: self.build_image(style, width, height))
+        self.low_image = SPRITES.get(('platform', style, width, height, 'low'),
+                                     lambda: self.build_low_image(style, width, height))
         self.rect = self.image.get_rect()
         self.rect.x = x
         self.rect.y = y
         
-    def draw_platform(self):
+    @staticmethod
+    def build_image(style, width, height):
         """Draw SMB3-style platforms with patterns"""
-        width, height = self.image.get_size()
+        image = pygame.Surface((width, height))
         
-        if self.style == 'ground':
-            self.image.fill(GROUND_BROWN)
+        if style == 'ground':
+            image.fill(GROUND_BROWN)
             # Add pattern
             for x in range(0, width, 16):
                 for y in range(0, height, 16):
-                    pygame.draw.rect(self.image, BROWN, (x, y, 14, 14))
-        elif self.style == 'brick':
-            self.image.fill(BRICK_ORANGE)
+                    pygame.draw.rect(image, BROWN, (x, y, 14, 14))
+        elif style == 'brick':
+            image.fill(BRICK_ORANGE)
             # Brick pattern
             brick_w = width // 4
             for i in range(4):
-                pygame.draw.rect(self.image, DARK_ORANGE, (i * brick_w, 0, brick_w - 2, height))
-        elif self.style == 'stone':
-            self.image.fill((150, 150, 150))
+                pygame.draw.rect(image, DARK_ORANGE, (i * brick_w, 0, brick_w - 2, height))
+        elif style == 'stone':
+            image.fill((150, 150, 150))
             for x in range(0, width, 12):
                 for y in range(0, height, 12):
-                    pygame.draw.rect(self.image, (120, 120, 120), (x, y, 10, 10))
-        elif self.style == 'cloud':
-            self.image.fill(CLOUD_WHITE)
-            pygame.draw.ellipse(self.image, WHITE, (0, 0, width, height))
+                    pygame.draw.rect(image, (120, 120, 120), (x, y, 10, 10))
+        elif style == 'cloud':
+            image.fill(CLOUD_WHITE)
+            pygame.draw.ellipse(image, WHITE, (0, 0, width, height))
         else:
-            self.image.fill(GROUND_BROWN)
+            image.fill(GROUND_BROWN)
+        return image
+
+    @staticmethod
+    def build_low_image(style, width, height):
+        """Flat base colour only, for frames drawn at low detail"""
+        image = pygame.Surface((width, height))
+        image.fill({'brick': BRICK_ORANGE, 'stone': (150, 150, 150),
+                    'cloud': CLOUD_WHITE}.get(style, GROUND_BROWN))
+        return image
 
 class QuestionBlock(pygame.sprite.Sprite):
-    def __init__(self, x, y):
+    def __init__(self, x, y, rng=random):
         super().__init__()
-        self.image = pygame.Surface((32, 32))
         self.active = True
         self.draw_block()
         self.rect = self.image.get_rect()
         self.rect.x = x
         self.rect.y = y
-        self.contents = random.choice([POWERUP_MUSHROOM, POWERUP_FIRE_FLOWER, POWERUP_LEAF, 'coin'])
+        self.contents = rng.choice([POWERUP_MUSHROOM, POWERUP_FIRE_FLOWER, POWERUP_LEAF, 'coin'])
         
     def draw_block(self):
-        if self.active:
+        self.image = SPRITES.get(('question_block', self.active), lambda: self.build_image(self.active))
+        self.low_image = SPRITES.get(('question_block', self.active, 'low'),
+                                     lambda: self.build_low_image(self.active))
+        
+    @staticmethod
+    def build_image(active):
+        image = pygame.Surface((32, 32))
+        if active:
             # Active yellow block with question mark
-            self.image.fill(COIN_GOLD)
-            pygame.draw.rect(self.image, DARK_ORANGE, (0, 0, 32, 32), 3)
+            image.fill(COIN_GOLD)
+            pygame.draw.rect(image, DARK_ORANGE, (0, 0, 32, 32), 3)
             # Question mark
-            font = pygame.font.Font(None, 36)
+            font = FONTS.get(None, 36)
             text = font.render("?", True, BLACK)
-            self.image.blit(text, (8, 2))
+            image.blit(text, (8, 2))
         else:
             # Used brown block
-            self.image.fill((136, 108, 56))
-            pygame.draw.rect(self.image, (88, 64, 32), (0, 0, 32, 32), 3)
+            image.fill((136, 108, 56))
+            pygame.draw.rect(image, (88, 64, 32), (0, 0, 32, 32), 3)
+        return image
+
+    @staticmethod
+    def build_low_image(active):
+        image = pygame.Surface((32, 32))
+        image.fill(COIN_GOLD if active else (136, 108, 56))
+        return image
             
     def hit(self, powerups, coins, particles):
         if self.active:
@@ -385,37 +536,38 @@ class QuestionBlock(pygame.sprite.Sprite):
                 powerup = Powerup(self.rect.x, self.rect.y - 40, self.contents)
                 powerups.add(powerup)
                 
-            for _ in range(5):
-                particles.add(Particle(self.rect.centerx, self.rect.top, COIN_GOLD))
+            particles.emit(self.rect.centerx, self.rect.top, COIN_GOLD, 5)
 
 class Enemy(pygame.sprite.Sprite):
     def __init__(self, x, y, enemy_type='goomba'):
         super().__init__()
         self.enemy_type = enemy_type
-        self.image = pygame.Surface((32, 32))
-        self.draw_enemy()
+        self.image = SPRITES.get(('enemy', enemy_type), lambda: self.build_image(enemy_type))
         self.rect = self.image.get_rect()
         self.rect.x = x
         self.rect.y = y
         self.vel_x = 2
         self.animate_timer = 0
         
-    def draw_enemy(self):
+    @staticmethod
+    def build_image(enemy_type):
         """Draw SMB3-style enemies"""
-        if self.enemy_type == 'goomba':
+        image = pygame.Surface((32, 32))
+        if enemy_type == 'goomba':
             # Brown mushroom enemy
-            pygame.draw.circle(self.image, BROWN, (16, 20), 14)
-            pygame.draw.rect(self.image, BROWN, (4, 20, 24, 10))
+            pygame.draw.circle(image, BROWN, (16, 20), 14)
+            pygame.draw.rect(image, BROWN, (4, 20, 24, 10))
             # Eyes
-            pygame.draw.circle(self.image, WHITE, (11, 18), 3)
-            pygame.draw.circle(self.image, WHITE, (21, 18), 3)
-            pygame.draw.circle(self.image, BLACK, (11, 18), 2)
-            pygame.draw.circle(self.image, BLACK, (21, 18), 2)
-        elif self.enemy_type == 'koopa':
+            pygame.draw.circle(image, WHITE, (11, 18), 3)
+            pygame.draw.circle(image, WHITE, (21, 18), 3)
+            pygame.draw.circle(image, BLACK, (11, 18), 2)
+            pygame.draw.circle(image, BLACK, (21, 18), 2)
+        elif enemy_type == 'koopa':
             # Green shell turtle
-            pygame.draw.ellipse(self.image, SHELL_GREEN, (4, 12, 24, 20))
-            pygame.draw.circle(self.image, (255, 200, 150), (16, 10), 6)
-            pygame.draw.rect(self.image, SHELL_GREEN, (8, 18, 16, 3))
+            pygame.draw.ellipse(image, SHELL_GREEN, (4, 12, 24, 20))
+            pygame.draw.circle(image, (255, 200, 150), (16, 10), 6)
+            pygame.draw.rect(image, SHELL_GREEN, (8, 18, 16, 3))
+        return image
             
     def update(self):
         self.rect.x += self.vel_x
@@ -426,18 +578,20 @@ class Enemy(pygame.sprite.Sprite):
 class Coin(pygame.sprite.Sprite):
     def __init__(self, x, y):
         super().__init__()
-        self.image = pygame.Surface((20, 20))
-        self.draw_coin()
+        self.image = SPRITES.get(('coin',), self.build_image)
         self.rect = self.image.get_rect()
         self.rect.x = x
         self.rect.y = y
         self.animate_timer = 0
         
-    def draw_coin(self):
+    @staticmethod
+    def build_image():
         """SMB3 style animated coin"""
-        pygame.draw.circle(self.image, COIN_GOLD, (10, 10), 9)
-        pygame.draw.circle(self.image, DARK_ORANGE, (10, 10), 7)
-        pygame.draw.circle(self.image, COIN_GOLD, (10, 10), 5)
+        image = pygame.Surface((20, 20))
+        pygame.draw.circle(image, COIN_GOLD, (10, 10), 9)
+        pygame.draw.circle(image, DARK_ORANGE, (10, 10), 7)
+        pygame.draw.circle(image, COIN_GOLD, (10, 10), 5)
+        return image
         
     def update(self):
         self.animate_timer += 1
@@ -446,36 +600,36 @@ class Powerup(pygame.sprite.Sprite):
     def __init__(self, x, y, powerup_type):
         super().__init__()
         self.powerup_type = powerup_type
-        self.image = pygame.Surface((28, 28))
-        self.draw_powerup()
+        self.color = POWERUP_COLORS[powerup_type]
+        self.image = SPRITES.get(('powerup', powerup_type), lambda: self.build_image(powerup_type))
         self.rect = self.image.get_rect()
         self.rect.x = x
         self.rect.y = y
         self.vel_y = -5
         
-    def draw_powerup(self):
+    @staticmethod
+    def build_image(powerup_type):
         """SMB3 style powerups"""
-        if self.powerup_type == POWERUP_MUSHROOM:
+        image = pygame.Surface((28, 28))
+        if powerup_type == POWERUP_MUSHROOM:
             # Super Mushroom
-            pygame.draw.circle(self.image, MUSHROOM_RED, (14, 18), 13)
-            pygame.draw.rect(self.image, (255, 200, 150), (8, 18, 12, 10))
-            pygame.draw.circle(self.image, WHITE, (8, 10), 4)
-            pygame.draw.circle(self.image, WHITE, (20, 10), 4)
-            self.color = MUSHROOM_RED
-        elif self.powerup_type == POWERUP_FIRE_FLOWER:
+            pygame.draw.circle(image, MUSHROOM_RED, (14, 18), 13)
+            pygame.draw.rect(image, (255, 200, 150), (8, 18, 12, 10))
+            pygame.draw.circle(image, WHITE, (8, 10), 4)
+            pygame.draw.circle(image, WHITE, (20, 10), 4)
+        elif powerup_type == POWERUP_FIRE_FLOWER:
             # Fire Flower
-            pygame.draw.circle(self.image, MUSHROOM_RED, (14, 14), 8)
-            pygame.draw.circle(self.image, BRICK_ORANGE, (14, 14), 5)
-            pygame.draw.circle(self.image, COIN_GOLD, (7, 7), 3)
-            pygame.draw.circle(self.image, COIN_GOLD, (21, 7), 3)
-            pygame.draw.circle(self.image, COIN_GOLD, (7, 21), 3)
-            pygame.draw.circle(self.image, COIN_GOLD, (21, 21), 3)
-            self.color = MUSHROOM_RED
-        elif self.powerup_type == POWERUP_LEAF:
+            pygame.draw.circle(image, MUSHROOM_RED, (14, 14), 8)
+            pygame.draw.circle(image, BRICK_ORANGE, (14, 14), 5)
+            pygame.draw.circle(image, COIN_GOLD, (7, 7), 3)
+            pygame.draw.circle(image, COIN_GOLD, (21, 7), 3)
+            pygame.draw.circle(image, COIN_GOLD, (7, 21), 3)
+            pygame.draw.circle(image, COIN_GOLD, (21, 21), 3)
+        elif powerup_type == POWERUP_LEAF:
             # Super Leaf
-            pygame.draw.polygon(self.image, BROWN, [(14, 24), (4, 14), (14, 4), (24, 14)])
-            pygame.draw.polygon(self.image, DARK_ORANGE, [(14, 20), (8, 14), (14, 8), (20, 14)])
-            self.color = BROWN
+            pygame.draw.polygon(image, BROWN, [(14, 24), (4, 14), (14, 4), (24, 14)])
+            pygame.draw.polygon(image, DARK_ORANGE, [(14, 20), (8, 14), (14, 8), (20, 14)])
+        return image
             
     def update(self):
         self.vel_y += 0.3
@@ -486,24 +640,116 @@ class Powerup(pygame.sprite.Sprite):
 class Flag(pygame.sprite.Sprite):
     def __init__(self, x, y):
         super().__init__()
-        self.image = pygame.Surface((20, 100))
-        # Pole
-        pygame.draw.rect(self.image, (180, 180, 180), (8, 0, 4, 100))
-        # Flag
-        pygame.draw.polygon(self.image, BLACK, [(12, 10), (12, 40), (20, 25)])
-        pygame.draw.circle(self.image, COIN_GOLD, (8, 8), 4)
+        self.image = SPRITES.get(('flag',), self.build_image)
         self.rect = self.image.get_rect()
         self.rect.x = x
         self.rect.y = y
+        
+    @staticmethod
+    def build_image():
+        image = pygame.Surface((20, 100))
+        # Pole
+        pygame.draw.rect(image, (180, 180, 180), (8, 0, 4, 100))
+        # Flag
+        pygame.draw.polygon(image, BLACK, [(12, 10), (12, 40), (20, 25)])
+        pygame.draw.circle(image, COIN_GOLD, (8, 8), 4)
+        return image
+
+class SpatialHash:
+    """Uniform grid broadphase mapping cells to the sprites that overlap them."""
+    def __init__(self, cell_size=64):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.entries = {}  # sprite -> (insertion order, kind, cell range)
+        self.counter = 0
+        
+    def _cell_range(self, rect):
+        cs = self.cell_size
+        return (rect.left // cs, rect.top // cs, (rect.right - 1) // cs, (rect.bottom - 1) // cs)
+        
+    def _link(self, sprite, cell_range):
+        x0, y0, x1, y1 = cell_range
+        for cy in range(y0, y1 + 1):
+            for cx in range(x0, x1 + 1):
+                self.cells.setdefault((cx, cy), set()).add(sprite)
+                
+    def _unlink(self, sprite, cell_range):
+        x0, y0, x1, y1 = cell_range
+        for cy in range(y0, y1 + 1):
+            for cx in range(x0, x1 + 1):
+                bucket = self.cells.get((cx, cy))
+                if bucket is not None:
+                    bucket.discard(sprite)
+                    if not bucket:
+                        del self.cells[(cx, cy)]
+                        
+    def insert(self, sprite, kind):
+        if sprite in self.entries:
+            self.remove(sprite)
+        cell_range = self._cell_range(sprite.rect)
+        self.entries[sprite] = (self.counter, kind, cell_range)
+        self.counter += 1
+        self._link(sprite, cell_range)
+        
+    def remove(self, sprite):
+        entry = self.entries.pop(sprite, None)
+        if entry is not None:
+            self._unlink(sprite, entry[2])
+            
+    def move(self, sprite):
+        """Re-bucket a moving sprite; a no-op unless it crossed a cell boundary."""
+        order, kind, old_range = self.entries[sprite]
+        new_range = self._cell_range(sprite.rect)
+        if new_range != old_range:
+            self._unlink(sprite, old_range)
+            self._link(sprite, new_range)
+            self.entries[sprite] = (order, kind, new_range)
+            
+    def query(self, rect, kind=None):
+        """Sprites of the given kind colliding with rect, in insertion order."""
+        x0, y0, x1, y1 = self._cell_range(rect)
+        found = set()
+        for cy in range(y0, y1 + 1):
+            for cx in range(x0, x1 + 1):
+                bucket = self.cells.get((cx, cy))
+                if bucket:
+                    found.update(bucket)
+        entries = self.entries
+        hits = [sprite for sprite in found
+                if (kind is None or entries[sprite][1] == kind) and rect.colliderect(sprite.rect)]
+        hits.sort(key=lambda sprite: entries[sprite][0])
+        return hits
+
+class IndexedGroup(pygame.sprite.Group):
+    """Sprite group that mirrors its membership into a SpatialHash."""
+    def __init__(self, spatial, kind):
+        super().__init__()
+        self.spatial = spatial
+        self.kind = kind
+        
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        self.spatial.insert(sprite, self.kind)
+        
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        self.spatial.remove(sprite)
+        
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        for sprite in self.sprites():
+            self.spatial.move(sprite)
 
 class Level:
-    def __init__(self, level_num):
+    def __init__(self, level_num, rng=random):
         self.level_num = level_num
-        self.platforms = pygame.sprite.Group()
-        self.enemies = pygame.sprite.Group()
-        self.coins = pygame.sprite.Group()
+        self.rng = rng
+        self.spatial = SpatialHash()
+        self.platforms = IndexedGroup(self.spatial, 'platform')
+        self.enemies = IndexedGroup(self.spatial, 'enemy')
+        self.coins = IndexedGroup(self.spatial, 'coin')
         self.powerups = pygame.sprite.Group()
-        self.question_blocks = pygame.sprite.Group()
+        self.question_blocks = IndexedGroup(self.spatial, 'block')
         self.flag = pygame.sprite.Group()
         self.generate_level()
         
@@ -522,7 +768,7 @@ class Level:
                 y = 450 - (i % 3) * 60
                 self.platforms.add(Platform(x, y, 80, 20, 'brick'))
                 if i % 2 == 0:
-                    self.question_blocks.add(QuestionBlock(x + 25, y - 40))
+                    self.question_blocks.add(QuestionBlock(x + 25, y - 40, self.rng))
                 else:
                     self.coins.add(Coin(x + 30, y - 30))
                     
@@ -538,7 +784,7 @@ class Level:
                 self.platforms.add(Platform(x, y, 70, 20, 'stone'))
                 self.coins.add(Coin(x + 25, y - 30))
                 if i % 3 == 0:
-                    self.question_blocks.add(QuestionBlock(x + 20, y - 40))
+                    self.question_blocks.add(QuestionBlock(x + 20, y - 40, self.rng))
                 
             for i in range(world + 2):
                 self.enemies.add(Enemy(140 + i * 160, 510, 'goomba'))
@@ -549,7 +795,7 @@ class Level:
                 y = 320 - (i % 4) * 70
                 self.platforms.add(Platform(x, y, 60, 20, 'cloud'))
                 if i % 2 == 0:
-                    self.question_blocks.add(QuestionBlock(x + 15, y - 40))
+                    self.question_blocks.add(QuestionBlock(x + 15, y - 40, self.rng))
                     
             for i in range(world):
                 self.enemies.add(Enemy(90 + i * 220, 510, 'koopa'))
@@ -559,7 +805,7 @@ class Level:
                 x = 140 + i * 150
                 y = 420 - i * 45
                 self.platforms.add(Platform(x, y, 90, 25, 'brick'))
-                self.question_blocks.add(QuestionBlock(x + 30, y - 40))
+                self.question_blocks.add(QuestionBlock(x + 30, y - 40, self.rng))
                 
             for i in range(world + 3):
                 enemy_type = 'koopa' if i % 2 == 0 else 'goomba'
@@ -573,13 +819,107 @@ class Level:
         
         # Add scattered coins
         for i in range(8 + world):
-            x = random.randint(100, 700)
-            y = random.randint(200, 500)
+            x = self.rng.randint(100, 700)
+            y = self.rng.randint(200, 500)
             self.coins.add(Coin(x, y))
+            
+    @staticmethod
+    def warm_sprites():
+        """Build every image level construction uses (one level per stage covers
+        them all), so levels built on the loader thread only read SPRITES."""
+        for level_num in range(1, 5):
+            Level(level_num, random.Random(0))
+
+class BackgroundCache:
+    """Screen backgrounds that are rendered once, or cheaply per frame with NumPy."""
+    def __init__(self, size):
+        self.size = size
+        self.surfaces = {}
+        self.column = pygame.Surface((1, size[1]))
+        self.rows = np.arange(size[1], dtype=np.float64)
+        
+    def static(self, name, builder):
+        """Return the Surface built by builder(), building it on first use only."""
+        surface = self.surfaces.get(name)
+        if surface is None:
+            surface = builder()
+            if pygame.display.get_surface() is not None:
+                surface = surface.convert()
+            self.surfaces[name] = surface
+        return surface
+        
+    def gradient(self, dest, rgb):
+        """Paint dest with per-scanline colors; rgb is an (height, 3) array."""
+        pygame.surfarray.blit_array(self.column, np.clip(rgb, 0, 255).astype(np.uint8)[np.newaxis])
+        pygame.transform.scale(self.column, self.size, dest)
+        
+    def gradient_surface(self, rgb):
+        surface = pygame.Surface(self.size)
+        self.gradient(surface, rgb)
+        return surface
+
+class Presenter:
+    """Gets frames drawn at SCREEN_WIDTH x SCREEN_HEIGHT onto a display of any size.
+
+    The game always draws into `surface` at the native resolution, so every
+    fill, primitive and blit costs the same whatever the output size; filling
+    the output is one step in present():
+
+      scale 1   surface is the display itself and present() just flips.
+      scaled    pygame.SCALED: surface is the display, and SDL's renderer
+                stretches it to the window when present() flips.
+      scale N   surface is offscreen; present() does one nearest-neighbour
+                transform.scale straight into the display, centred and
+                letterboxed, then flips.
+
+    scale 0 picks the largest whole multiple of the native size that fits the
+    desktop. fullscreen uses the whole desktop, letterboxing the remainder.
+    Where SDL has a GPU renderer, scaled is the cheapest way to a 4K display:
+    the upscale leaves the CPU entirely.
+    """
+    def __init__(self, scale=1, scaled=False, fullscreen=False):
+        native = (SCREEN_WIDTH, SCREEN_HEIGHT)
+        flags = pygame.FULLSCREEN if fullscreen else 0
+        if scaled:
+            self.display = pygame.display.set_mode(native, flags | pygame.SCALED)
+            self.surface = self.display
+            self.view = None
+            return
+        desktop = pygame.display.get_desktop_sizes()[0]
+        fit = max(1, min(desktop[0] // SCREEN_WIDTH, desktop[1] // SCREEN_HEIGHT))
+        if not scale or (fullscreen and scale > fit):
+            scale = fit
+        size = (SCREEN_WIDTH * scale, SCREEN_HEIGHT * scale)
+        self.display = pygame.display.set_mode(desktop if fullscreen else size, flags)
+        if self.display.get_size() == native:
+            self.surface = self.display
+            self.view = None
+            return
+        self.display.fill(BLACK)
+        target = pygame.Rect((0, 0), size)
+        target.center = self.display.get_rect().center
+        # Scaling into a subsurface of the display allocates nothing per frame
+        self.view = self.display.subsurface(target.clip(self.display.get_rect()))
+        self.surface = pygame.Surface(native, 0, self.display)
+        
+    def present(self):
+        if self.view is not None:
+            pygame.transform.scale(self.surface, self.view.get_size(), self.view)
+        pygame.display.flip()
+
+def enable_tracing(path):
+    """Trace frames, phases, level loads, updates and every screen's draw to path."""
+    tracer = Tracer(path)
+    tracer.instrument(Player, "update")
+    tracer.instrument(Level, "__init__")
+    tracer.instrument(Game, "update", *[name for name in vars(Game) if name.startswith("draw_")])
+    return tracer
 
 class Game:
-    def __init__(self):
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    def __init__(self, trace_path=None, render_fps=FPS, scale=1, scaled=False, fullscreen=False):
+        # Drawn at the native resolution; the presenter scales to the display
+        self.presenter = Presenter(scale, scaled, fullscreen)
+        self.screen = self.presenter.surface
         pygame.display.set_caption("Super Mario Bros 3 - 32 Levels")
         self.clock = pygame.time.Clock()
         self.running = True
@@ -588,27 +928,50 @@ class Game:
         self.player = None
         self.level = None
         self.fireballs = pygame.sprite.Group()
-        self.particles = pygame.sprite.Group()
-        self.font_large = pygame.font.Font(None, 72)
-        self.font_medium = pygame.font.Font(None, 48)
-        self.font_small = pygame.font.Font(None, 32)
+        self.particles = ParticleSystem()
+        self.hud = pygame.Surface((SCREEN_WIDTH, HUD_HEIGHT))
+        self.hud_key = None
         self.title_blink = 0
         self.world_map_selection = 0
+        self.backgrounds = BackgroundCache((SCREEN_WIDTH, SCREEN_HEIGHT))
+        Level.warm_sprites()
+        self.loader = LevelLoader(Level)
+        self.tracer = enable_tracing(trace_path) if trace_path else None
+        self.timer = FrameTimer(tracer=self.tracer)
+        # Game logic steps at FPS; frames render at render_fps, blended between steps
+        self.render_fps = render_fps
+        self.loop = FixedStepLoop(FPS)
+        self.interpolator = Interpolator()
+        # Trades decorations, tile detail and then whole frames for time under load
+        self.governor = LoadGovernor(self.timer, budget=1 / (render_fps or FPS))
+        self.perf_overlay = PerfOverlay(self.timer, status=self.perf_status)
+        
+    def perf_status(self):
+        return f"{self.loop.summary()}\n{self.governor.summary()}\n{self.loader.stats.summary()}"
+        
+    def prefetch_level(self, level_num):
+        # The layout RNG is seeded here on the main thread so the worker
+        # never touches the shared random stream.
+        if level_num <= 32:
+            self.loader.prefetch(level_num, random.Random(random.getrandbits(64)))
         
     def new_game(self):
         self.current_level = 1
         self.player = Player(50, 400)
         self.state = WORLD_MAP
+        self.loader.discard()
+        self.prefetch_level(self.current_level)
         
     def start_level(self, level_num):
         self.current_level = level_num
-        self.level = Level(self.current_level)
+        self.level = self.loader.take(self.current_level)
+        self.prefetch_level(self.current_level + 1)
         self.player.rect.x = 50
         self.player.rect.y = 400
         self.player.vel_x = 0
         self.player.vel_y = 0
         self.fireballs.empty()
-        self.particles.empty()
+        self.particles.clear()
         self.state = PLAYING
         
     def next_level(self):
@@ -618,36 +981,30 @@ class Game:
         else:
             self.state = GAME_WIN
             
-    def draw_title_screen(self):
+    def build_title_background(self):
+        """Everything on the title screen except the blinking prompt."""
         # SMB3 style title with gradient background
-        for y in range(SCREEN_HEIGHT):
-            color_val = int(92 + (y / SCREEN_HEIGHT) * 50)
-            pygame.draw.line(self.screen, (color_val, color_val + 50, 252), (0, y), (SCREEN_WIDTH, y))
+        color_val = (92 + (self.backgrounds.rows / SCREEN_HEIGHT) * 50).astype(np.int32)
+        background = self.backgrounds.gradient_surface(
+            np.stack([color_val, color_val + 50, np.full_like(color_val, 252)], axis=1))
         
         # Title with shadow
-        title_shadow = self.font_large.render("SUPER MARIO BROS 3", True, BLACK)
-        title = self.font_large.render("SUPER MARIO BROS 3", True, WHITE)
-        self.screen.blit(title_shadow, (SCREEN_WIDTH // 2 - 320, 102))
-        self.screen.blit(title, (SCREEN_WIDTH // 2 - 322, 100))
+        title_shadow = TEXT.render("SUPER MARIO BROS 3", FONT_LARGE, BLACK)
+        title = TEXT.render("SUPER MARIO BROS 3", FONT_LARGE, WHITE)
+        background.blit(title_shadow, (SCREEN_WIDTH // 2 - 320, 102))
+        background.blit(title, (SCREEN_WIDTH // 2 - 322, 100))
         
         # Subtitle
-        subtitle = self.font_medium.render("32 LEVELS EDITION", True, COIN_GOLD)
-        self.screen.blit(subtitle, (SCREEN_WIDTH // 2 - 200, 180))
+        subtitle = TEXT.render("32 LEVELS EDITION", FONT_MEDIUM, COIN_GOLD)
+        background.blit(subtitle, (SCREEN_WIDTH // 2 - 200, 180))
         
         # Decorative Mario sprite
         mario_sprite = pygame.Surface((64, 64))
         pygame.draw.rect(mario_sprite, MARIO_RED, (16, 24, 32, 24))
         pygame.draw.rect(mario_sprite, MARIO_BLUE, (20, 16, 24, 24))
         pygame.draw.circle(mario_sprite, (255, 200, 150), (32, 16), 12)
-        self.screen.blit(mario_sprite, (SCREEN_WIDTH // 2 - 32, 250))
+        background.blit(mario_sprite, (SCREEN_WIDTH // 2 - 32, 250))
         
-        # Blinking start text
-        self.title_blink += 1
-        if self.title_blink % 60 < 30:
-            start_text = self.font_small.render("PRESS ENTER TO START", True, WHITE)
-            start_rect = start_text.get_rect(center=(SCREEN_WIDTH // 2, 380))
-            self.screen.blit(start_text, start_rect)
-            
         # Controls
         controls = [
             "ARROW KEYS - Move  |  SHIFT - Run",
@@ -656,17 +1013,28 @@ class Game:
         ]
         y = 460
         for control in controls:
-            text = self.font_small.render(control, True, CLOUD_WHITE)
+            text = TEXT.render(control, FONT_SMALL, CLOUD_WHITE)
             text_rect = text.get_rect(center=(SCREEN_WIDTH // 2, y))
-            self.screen.blit(text, text_rect)
+            background.blit(text, text_rect)
             y += 35
+        return background
+        
+    def draw_title_screen(self):
+        self.screen.blit(self.backgrounds.static('title', self.build_title_background), (0, 0))
+        
+        # Blinking start text; title_blink advances once per fixed update
+        if self.title_blink % 30 < 15:
+            start_text = TEXT.render("PRESS ENTER TO START", FONT_SMALL, WHITE)
+            start_rect = start_text.get_rect(center=(SCREEN_WIDTH // 2, 380))
+            self.screen.blit(start_text, start_rect)
             
     def draw_world_map(self):
         # Sky background
         self.screen.fill(SKY_BLUE)
         
-        # Clouds
-        for i in range(5):
+        # Clouds (decoration, dropped under load)
+        decor = self.governor.decor
+        for i in range(5 if decor else 0):
             x = (i * 200 + self.title_blink) % SCREEN_WIDTH
             y = 50 + i * 80
             pygame.draw.ellipse(self.screen, CLOUD_WHITE, (x, y, 80, 30))
@@ -674,7 +1042,7 @@ class Game:
             
         # Title
         world = (self.current_level - 1) // 4 + 1
-        title = self.font_large.render(f"WORLD {world}", True, WHITE)
+        title = TEXT.render(f"WORLD {world}", FONT_LARGE, WHITE)
         self.screen.blit(title, (SCREEN_WIDTH // 2 - 140, 50))
         
         # Level circles (SMB3 style map)
@@ -690,11 +1058,12 @@ class Game:
             else:
                 color = (100, 100, 100)
                 
-            pygame.draw.circle(self.screen, BLACK, (x + 2, y + 2), 32)
+            if decor:
+                pygame.draw.circle(self.screen, BLACK, (x + 2, y + 2), 32)
             pygame.draw.circle(self.screen, color, (x, y), 30)
             
             # Level number
-            level_text = self.font_medium.render(str(level % 4 if level % 4 != 0 else 4), True, BLACK)
+            level_text = TEXT.render(str(level % 4 if level % 4 != 0 else 4), FONT_MEDIUM, BLACK)
             text_rect = level_text.get_rect(center=(x, y))
             self.screen.blit(level_text, text_rect)
             
@@ -703,65 +1072,88 @@ class Game:
                 pygame.draw.line(self.screen, BROWN, (x + 30, y), (x + 120, y), 4)
         
         # Instructions
-        info = self.font_small.render("Press ENTER to start level", True, WHITE)
+        info = TEXT.render("Press ENTER to start level", FONT_SMALL, WHITE)
         self.screen.blit(info, (SCREEN_WIDTH // 2 - 150, 450))
         
         # Player stats
-        stats = self.font_small.render(f"Lives: {self.player.lives}  Score: {self.player.score}  Coins: {self.player.coins}", True, WHITE)
+        stats = TEXT.render(f"Lives: {self.player.lives}  Score: {self.player.score}  Coins: {self.player.coins}", FONT_SMALL, WHITE)
         self.screen.blit(stats, (SCREEN_WIDTH // 2 - 200, 500))
             
-    def draw_game(self):
+    def moving_sprites(self):
+        return itertools.chain((self.player,), self.level.enemies, self.level.powerups, self.fireballs)
+        
+    def draw_game(self, alpha=1.0):
         # Sky background
         self.screen.fill(SKY_BLUE)
+        position = self.interpolator.position
         
         # Draw all sprites
-        self.level.platforms.draw(self.screen)
-        self.level.question_blocks.draw(self.screen)
-        self.level.enemies.draw(self.screen)
+        if self.governor.low_detail:
+            self.screen.blits([(s.low_image, s.rect)
+                               for s in itertools.chain(self.level.platforms, self.level.question_blocks)], False)
+        else:
+            self.level.platforms.draw(self.screen)
+            self.level.question_blocks.draw(self.screen)
+        self.timer.lap("level_draw")
+        self.screen.blits([(s.image, position(s, alpha)) for s in self.level.enemies], False)
         self.level.coins.draw(self.screen)
-        self.level.powerups.draw(self.screen)
-        self.fireballs.draw(self.screen)
-        self.particles.draw(self.screen)
+        self.screen.blits([(s.image, position(s, alpha))
+                           for s in itertools.chain(self.level.powerups, self.fireballs)], False)
+        if self.governor.decor:
+            self.particles.draw(self.screen)
         self.level.flag.draw(self.screen)
         
         # Draw player with invincibility flicker
         if self.player.invincible_timer == 0 or self.player.invincible_timer % 6 < 3:
-            self.screen.blit(self.player.image, self.player.rect)
+            self.screen.blit(self.player.image, position(self.player, alpha))
+        self.timer.lap("sprite_draw")
         
-        # HUD Background
-        pygame.draw.rect(self.screen, BLACK, (0, 0, SCREEN_WIDTH, 50))
+        self.draw_hud()
         
+    def draw_hud(self):
+        """Blit the HUD bar, re-rendering it only when one of its values changed."""
         world = (self.current_level - 1) // 4 + 1
         stage = (self.current_level - 1) % 4 + 1
-        
-        # HUD Text
-        level_text = self.font_small.render(f"WORLD {world}-{stage}", True, WHITE)
-        self.screen.blit(level_text, (10, 12))
-        
-        score_text = self.font_small.render(f"SCORE: {self.player.score:06d}", True, WHITE)
-        self.screen.blit(score_text, (200, 12))
-        
-        coins_text = self.font_small.render(f"x{self.player.coins:02d}", True, WHITE)
-        self.screen.blit(coins_text, (480, 12))
-        # Coin icon
-        pygame.draw.circle(self.screen, COIN_GOLD, (465, 22), 8)
-        
-        lives_text = self.font_small.render(f"x{self.player.lives}", True, WHITE)
-        self.screen.blit(lives_text, (630, 12))
-        # Mario icon
-        pygame.draw.circle(self.screen, MARIO_RED, (615, 22), 8)
-        
-        # P-Meter (for flying)
-        if self.player.state == RACCOON_MARIO:
-            p_meter_width = int((self.player.p_meter / 100) * 100)
-            pygame.draw.rect(self.screen, WHITE, (690, 15, 102, 20), 2)
-            if self.player.p_meter >= 100:
-                color = COIN_GOLD
-            else:
-                color = MARIO_BLUE
-            pygame.draw.rect(self.screen, color, (691, 16, p_meter_width, 18))
-            p_text = self.font_small.render("P", True, WHITE)
-            self.screen.blit(p_text, (670, 12))
+        player = self.player
+        p_meter = player.p_meter if player.state == RACCOON_MARIO else None
+        key = (world, stage, player.score, player.coins, player.lives, p_meter)
+        if key != self.hud_key:
+            self.hud_key = key
+            hud = self.hud
+            
+            # HUD Background
+            hud.fill(BLACK)
+            
+            # HUD Text
+            level_text = TEXT.render(f"WORLD {world}-{stage}", FONT_SMALL, WHITE)
+            hud.blit(level_text, (10, 12))
+            
+            score_text = TEXT.render(f"SCORE: {player.score:06d}", FONT_SMALL, WHITE)
+            hud.blit(score_text, (200, 12))
+            
+            coins_text = TEXT.render(f"x{player.coins:02d}", FONT_SMALL, WHITE)
+            hud.blit(coins_text, (480, 12))
+            # Coin icon
+            pygame.draw.circle(hud, COIN_GOLD, (465, 22), 8)
+            
+            lives_text = TEXT.render(f"x{player.lives}", FONT_SMALL, WHITE)
+            hud.blit(lives_text, (630, 12))
+            # Mario icon
+            pygame.draw.circle(hud, MARIO_RED, (615, 22), 8)
+            
+            # P-Meter (for flying)
+            if p_meter is not None:
+                p_meter_width = int((p_meter / 100) * 100)
+                pygame.draw.rect(hud, WHITE, (690, 15, 102, 20), 2)
+                if p_meter >= 100:
+                    color = COIN_GOLD
+                else:
+                    color = MARIO_BLUE
+                pygame.draw.rect(hud, color, (691, 16, p_meter_width, 18))
+                p_text = TEXT.render("P", FONT_SMALL, WHITE)
+                hud.blit(p_text, (670, 12))
+                
+        self.screen.blit(self.hud, (0, 0))
         
     def draw_level_complete(self):
         self.screen.fill(BLACK)
@@ -770,72 +1162,79 @@ class Game:
         stage = (self.current_level - 1) % 4 + 1
         
         # Title with animation
-        title = self.font_large.render("COURSE CLEAR!", True, COIN_GOLD)
+        title = TEXT.render("COURSE CLEAR!", FONT_LARGE, COIN_GOLD)
         title_rect = title.get_rect(center=(SCREEN_WIDTH // 2, 150))
         self.screen.blit(title, title_rect)
         
         # Level completed
-        level_text = self.font_medium.render(f"World {world}-{stage} Complete!", True, WHITE)
+        level_text = TEXT.render(f"World {world}-{stage} Complete!", FONT_MEDIUM, WHITE)
         level_rect = level_text.get_rect(center=(SCREEN_WIDTH // 2, 250))
         self.screen.blit(level_text, level_rect)
         
         # Score
-        score_text = self.font_small.render(f"Score: {self.player.score}", True, COIN_GOLD)
+        score_text = TEXT.render(f"Score: {self.player.score}", FONT_SMALL, COIN_GOLD)
         score_rect = score_text.get_rect(center=(SCREEN_WIDTH // 2, 340))
         self.screen.blit(score_text, score_rect)
         
-        coins_text = self.font_small.render(f"Coins: {self.player.coins}", True, COIN_GOLD)
+        coins_text = TEXT.render(f"Coins: {self.player.coins}", FONT_SMALL, COIN_GOLD)
         coins_rect = coins_text.get_rect(center=(SCREEN_WIDTH // 2, 380))
         self.screen.blit(coins_text, coins_rect)
         
         # Next instruction
-        next_text = self.font_small.render("Press ENTER to continue", True, WHITE)
+        next_text = TEXT.render("Press ENTER to continue", FONT_SMALL, WHITE)
         next_rect = next_text.get_rect(center=(SCREEN_WIDTH // 2, 500))
         self.screen.blit(next_text, next_rect)
         
     def draw_game_over(self):
         self.screen.fill(BLACK)
         
-        title = self.font_large.render("GAME OVER", True, MUSHROOM_RED)
+        title = TEXT.render("GAME OVER", FONT_LARGE, MUSHROOM_RED)
         title_rect = title.get_rect(center=(SCREEN_WIDTH // 2, 200))
         self.screen.blit(title, title_rect)
         
-        score_text = self.font_medium.render(f"Final Score: {self.player.score}", True, WHITE)
+        score_text = TEXT.render(f"Final Score: {self.player.score}", FONT_MEDIUM, WHITE)
         score_rect = score_text.get_rect(center=(SCREEN_WIDTH // 2, 320))
         self.screen.blit(score_text, score_rect)
         
-        coins_text = self.font_medium.render(f"Coins Collected: {self.player.coins}", True, COIN_GOLD)
+        coins_text = TEXT.render(f"Coins Collected: {self.player.coins}", FONT_MEDIUM, COIN_GOLD)
         coins_rect = coins_text.get_rect(center=(SCREEN_WIDTH // 2, 380))
         self.screen.blit(coins_text, coins_rect)
         
-        restart_text = self.font_small.render("Press ENTER to return to title", True, WHITE)
+        restart_text = TEXT.render("Press ENTER to return to title", FONT_SMALL, WHITE)
         restart_rect = restart_text.get_rect(center=(SCREEN_WIDTH // 2, 500))
         self.screen.blit(restart_text, restart_rect)
         
     def draw_game_win(self):
-        # Victory background
-        for y in range(SCREEN_HEIGHT):
-            color = int(100 + math.sin(y / 30 + self.title_blink / 10) * 50)
-            pygame.draw.line(self.screen, (color, color, 100), (0, y), (SCREEN_WIDTH, y))
+        # Victory background: scrolling sine bands, one NumPy pass per frame
+        color = (100 + np.sin(self.backgrounds.rows / 30 + self.title_blink / 10) * 50).astype(np.int32)
+        self.backgrounds.gradient(self.screen, np.stack([color, color, np.full_like(color, 100)], axis=1))
         
-        title = self.font_large.render("CONGRATULATIONS!", True, COIN_GOLD)
+        title = TEXT.render("CONGRATULATIONS!", FONT_LARGE, COIN_GOLD)
         title_rect = title.get_rect(center=(SCREEN_WIDTH // 2, 120))
         self.screen.blit(title, title_rect)
         
-        congrats = self.font_medium.render("All 32 Levels Complete!", True, WHITE)
+        congrats = TEXT.render("All 32 Levels Complete!", FONT_MEDIUM, WHITE)
         congrats_rect = congrats.get_rect(center=(SCREEN_WIDTH // 2, 220))
         self.screen.blit(congrats, congrats_rect)
         
         # Final stats
-        score_text = self.font_medium.render(f"Final Score: {self.player.score}", True, COIN_GOLD)
+        score_text = TEXT.render(f"Final Score: {self.player.score}", FONT_MEDIUM, COIN_GOLD)
         score_rect = score_text.get_rect(center=(SCREEN_WIDTH // 2, 320))
         self.screen.blit(score_text, score_rect)
         
-        coins_text = self.font_medium.render(f"Total Coins: {self.player.coins}", True, COIN_GOLD)
+        coins_text = TEXT.render(f"Total Coins: {self.player.coins}", FONT_MEDIUM, COIN_GOLD)
         coins_rect = coins_text.get_rect(center=(SCREEN_WIDTH // 2, 380))
         self.screen.blit(coins_text, coins_rect)
         
         # Mario sprite celebration
+        mario_sprite = self.backgrounds.static('victory_mario', self.build_victory_mario)
+        self.screen.blit(mario_sprite, (SCREEN_WIDTH // 2 - 48, 440))
+        
+        restart_text = TEXT.render("Press ENTER to play again", FONT_SMALL, WHITE)
+        restart_rect = restart_text.get_rect(center=(SCREEN_WIDTH // 2, 560))
+        self.screen.blit(restart_text, restart_rect)
+        
+    def build_victory_mario(self):
         mario_sprite = pygame.Surface((96, 96))
         pygame.draw.rect(mario_sprite, MARIO_RED, (24, 36, 48, 36))
         pygame.draw.rect(mario_sprite, WHITE, (30, 24, 36, 36))
@@ -843,14 +1242,12 @@ class Game:
         # Victory pose
         pygame.draw.rect(mario_sprite, MARIO_RED, (10, 50, 10, 20))  # Arm up
         pygame.draw.rect(mario_sprite, MARIO_RED, (76, 50, 10, 20))  # Arm up
-        self.screen.blit(mario_sprite, (SCREEN_WIDTH // 2 - 48, 440))
-        
-        restart_text = self.font_small.render("Press ENTER to play again", True, WHITE)
-        restart_rect = restart_text.get_rect(center=(SCREEN_WIDTH // 2, 560))
-        self.screen.blit(restart_text, restart_rect)
+        return mario_sprite
         
     def handle_events(self):
         for event in pygame.event.get():
+            if self.perf_overlay.handle_event(event):
+                continue
             if event.type == pygame.QUIT:
                 self.running = False
                 
@@ -872,30 +1269,25 @@ class Game:
                         
     def update(self):
         if self.state == PLAYING:
-            self.player.update(
-                self.level.platforms,
-                self.level.enemies,
-                self.level.coins,
-                self.level.powerups,
-                self.level.question_blocks,
-                self.fireballs,
-                self.particles
-            )
+            self.player.update(self.level, self.fireballs, self.particles)
+            self.timer.lap("player")
             self.level.enemies.update()
             self.level.coins.update()
             self.level.powerups.update()
-            self.fireballs.update(self.level.platforms)
+            self.timer.lap("enemies")
+            self.fireballs.update(self.level.spatial)
             self.particles.update()
             
             # Check fireball-enemy collision
             for fireball in self.fireballs:
-                enemy_hit = pygame.sprite.spritecollide(fireball, self.level.enemies, True)
+                enemy_hit = self.level.spatial.query(fireball.rect, 'enemy')
+                for enemy in enemy_hit:
+                    enemy.kill()
                 if enemy_hit:
                     fireball.kill()
                     self.player.score += 100
                     for enemy in enemy_hit:
-                        for _ in range(10):
-                            self.particles.add(Particle(enemy.rect.centerx, enemy.rect.centery, DARK_ORANGE))
+                        self.particles.emit(enemy.rect.centerx, enemy.rect.centery, DARK_ORANGE, 10)
             
             # Check if reached flag
             if pygame.sprite.spritecollide(self.player, self.level.flag, False):
@@ -905,36 +1297,69 @@ class Game:
             # Check game over
             if self.player.lives <= 0:
                 self.state = GAME_OVER
+            self.timer.lap("collision")
         
         # Update title blink timer
         self.title_blink += 1
                 
-    def draw(self):
+    def capture(self):
+        """Remember where the moving sprites are before a step."""
+        if self.state == PLAYING:
+            self.interpolator.capture(self.moving_sprites())
+        else:
+            self.interpolator.clear()
+                
+    def draw(self, alpha=1.0):
         if self.state == TITLE_SCREEN:
             self.draw_title_screen()
         elif self.state == WORLD_MAP:
             self.draw_world_map()
         elif self.state == PLAYING:
-            self.draw_game()
+            self.draw_game(alpha)
         elif self.state == LEVEL_COMPLETE:
             self.draw_level_complete()
         elif self.state == GAME_OVER:
             self.draw_game_over()
         elif self.state == GAME_WIN:
             self.draw_game_win()
+        # HUD, menu screens and the perf overlay
+        self.perf_overlay.draw(self.screen, (8, HUD_HEIGHT + 8))
+        self.timer.lap("hud")
             
-        pygame.display.flip()
+        self.presenter.present()
+        self.timer.lap("flip")
         
     def run(self):
         while self.running:
+            self.timer.begin_frame()
             self.handle_events()
-            self.update()
-            self.draw()
-            self.clock.tick(FPS)
+            self.timer.lap("events")
+            for _ in range(self.loop.advance()):
+                self.capture()
+                self.update()
+            if self.governor.render_this_frame():
+                self.draw(self.loop.alpha)
+            self.timer.end_frame()
+            self.governor.update()
+            self.clock.tick(self.render_fps)
             
+        self.loader.close()
+        if self.tracer:
+            self.tracer.close()
         pygame.quit()
         sys.exit()
 
 if __name__ == "__main__":
-    game = Game()
+    parser = argparse.ArgumentParser(description="Super Mario Bros 3 - 32 Levels")
+    parser.add_argument("--trace", metavar="FILE", help="write a Chrome trace of every frame to FILE")
+    parser.add_argument("--render-fps", type=int, default=FPS, metavar="N",
+                        help=f"render frame cap; game logic always steps at {FPS} Hz (0 = uncapped)")
+    parser.add_argument("--scale", type=int, default=1, metavar="N",
+                        help=f"show the {SCREEN_WIDTH}x{SCREEN_HEIGHT} frame N times larger "
+                             "(0 = largest that fits the desktop)")
+    parser.add_argument("--scaled", action="store_true",
+                        help="let SDL stretch the frame to the window (pygame.SCALED) instead")
+    parser.add_argument("--fullscreen", action="store_true", help="use the whole desktop")
+    args = parser.parse_args()
+    game = Game(args.trace, args.render_fps, args.scale, args.scaled, args.fullscreen)
     game.run()
@@ -0,0 +1,92 @@
+"""Build the next level on a worker thread while the current one is played.
+
+Level construction runs on the main loop at the moment a level is entered,
+which shows up as a hitch at every transition. LevelLoader moves that work
+onto a background thread: prefetch(key) starts building as soon as the next
+level is known, and take(key) hands the finished object over at transition
+time. The main loop spends most of each frame asleep in Clock.tick, so the
+worker gets the GIL then and the build cost is hidden behind gameplay.
+
+Builders must not touch the display or fonts; plain Surfaces, Rects and
+NumPy are fine. Each prefetched level is handed out once.
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class LoaderStats:
+    """Counters for how transitions were served and where the build time went."""
+
+    def __init__(self):
+        self.prefetched = 0
+        self.ready = 0          # take() found the build finished
+        self.waited = 0         # take() blocked on a build already in progress
+        self.sync = 0           # take() built on the calling thread
+        self.hidden_time = 0.0  # seconds of building done off the main thread
+        self.wait_time = 0.0    # seconds take() spent blocked on the worker
+        self.sync_time = 0.0    # seconds spent in synchronous builds
+
+    def summary(self):
+        return (f"levels: {self.ready} ready, {self.waited} waited, {self.sync} sync; "
+                f"hidden {self.hidden_time * 1e3:.1f} ms, waited {self.wait_time * 1e3:.1f} ms, "
+                f"sync {self.sync_time * 1e3:.1f} ms")
+
+
+class LevelLoader:
+    """Prefetches build(key) results on one background thread."""
+
+    def __init__(self, build):
+        self.build = build
+        self.executor = None
+        self.pending = {}
+        self.stats = LoaderStats()
+
+    def _timed_build(self, key, args):
+        t0 = time.perf_counter()
+        level = self.build(key, *args)
+        return level, time.perf_counter() - t0
+
+    def prefetch(self, key, *args):
+        """Start building key in the background unless it is already queued.
+
+        Extra args are passed on to build(); take() reuses them if it ends
+        up building on the calling thread, so the result does not depend
+        on whether the worker got to it first.
+        """
+        if key in self.pending:
+            return
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="level-loader")
+        self.pending[key] = (self.executor.submit(self._timed_build, key, args), args)
+        self.stats.prefetched += 1
+
+    def take(self, key):
+        """Return the level for key, building it here if its prefetch has not started."""
+        future, args = self.pending.pop(key, (None, ()))
+        if future is not None and not future.cancel():
+            if future.done():
+                self.stats.ready += 1
+            else:
+                self.stats.waited += 1
+            t0 = time.perf_counter()
+            level, build_time = future.result()
+            waited = time.perf_counter() - t0
+            self.stats.wait_time += waited
+            self.stats.hidden_time += max(0.0, build_time - waited)
+            return level
+        t0 = time.perf_counter()
+        level = self.build(key, *args)
+        self.stats.sync += 1
+        self.stats.sync_time += time.perf_counter() - t0
+        return level
+
+    def discard(self, keep=()):
+        """Drop queued or finished prefetches whose key is not in keep."""
+        for key in [k for k in self.pending if k not in keep]:
+            self.pending.pop(key)[0].cancel()
+
+    def close(self):
+        self.pending.clear()
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
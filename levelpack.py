@@ -0,0 +1,141 @@
+"""Compiled binary level packs for smb_deluxe_complete.py.
+
+A pack turns a list of level dicts (the deluxe_levels.LEVELS format) into one
+flat file that the game memory-maps, decoding only the level being started:
+
+    header   magic b"SMBP", version u16, level count u32
+    index    one (offset u32, length u32) per level, offsets from file start
+    levels   record header, UTF-8 name, platform records, enemy records
+
+All integers are little-endian. Compile the bundled levels with
+
+    python levelpack.py [-o deluxe_levels.pack] [module]
+"""
+import argparse
+import importlib
+import mmap
+import os
+import struct
+
+PACK_MAGIC = b"SMBP"
+PACK_VERSION = 1
+PACK_HEADER = struct.Struct("<4sHI")
+INDEX_ENTRY = struct.Struct("<II")
+# flags, start x/y, goal x/y, platform count, enemy count, name bytes
+LEVEL_HEADER = struct.Struct("<BiiiiIIH")
+# x, y, width, height, has color, r, g, b
+PLATFORM = struct.Struct("<iiiiBBBB")
+# x, y, size, has speed, speed
+ENEMY = struct.Struct("<iiiBi")
+
+HAS_START = 1
+HAS_GOAL = 2
+HAS_ENEMIES = 4
+
+
+def encode_level(level):
+    flags = ((HAS_START if 'start' in level else 0) | (HAS_GOAL if 'goal' in level else 0)
+             | (HAS_ENEMIES if 'enemies' in level else 0))
+    name = level.get('name', '').encode('utf-8')
+    platforms = level['platforms']
+    enemies = level.get('enemies', [])
+    start = level.get('start', (0, 0))
+    goal = level.get('goal', (0, 0))
+    parts = [LEVEL_HEADER.pack(flags, *start, *goal, len(platforms), len(enemies), len(name)), name]
+    for x, y, width, height, *color in platforms:
+        r, g, b = color[0] if color else (0, 0, 0)
+        parts.append(PLATFORM.pack(x, y, width, height, bool(color), r, g, b))
+    for x, y, size, *speed in enemies:
+        parts.append(ENEMY.pack(x, y, size, bool(speed), speed[0] if speed else 0))
+    return b"".join(parts)
+
+
+def compile_levels(levels):
+    """Return the pack bytes for a list of level dicts."""
+    records = [encode_level(level) for level in levels]
+    offset = PACK_HEADER.size + INDEX_ENTRY.size * len(records)
+    index = []
+    for record in records:
+        index.append(INDEX_ENTRY.pack(offset, len(record)))
+        offset += len(record)
+    return b"".join([PACK_HEADER.pack(PACK_MAGIC, PACK_VERSION, len(records))] + index + records)
+
+
+def write_pack(levels, path):
+    # Write beside the target and rename so a reader never maps a half-written file.
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(compile_levels(levels))
+    os.replace(tmp, path)
+
+
+class LevelPack:
+    """Random access to the levels of a compiled pack held in any buffer."""
+
+    def __init__(self, buffer, closer=None):
+        self.buffer = buffer
+        self.closer = closer
+        if len(buffer) < PACK_HEADER.size:
+            raise ValueError("truncated level pack")
+        magic, version, self.count = PACK_HEADER.unpack_from(buffer, 0)
+        if magic != PACK_MAGIC or version != PACK_VERSION:
+            raise ValueError(f"not a version {PACK_VERSION} level pack")
+        if len(buffer) < PACK_HEADER.size + INDEX_ENTRY.size * self.count:
+            raise ValueError("truncated level pack index")
+
+    @classmethod
+    def open(cls, path):
+        """Memory-map a pack file; only the pages of decoded levels are read."""
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(mapped, mapped.close)
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        """Decode level i into the same dict shape the source list uses."""
+        if i < 0:
+            i += self.count
+        if not 0 <= i < self.count:
+            raise IndexError(i)
+        buf = self.buffer
+        offset, _ = INDEX_ENTRY.unpack_from(buf, PACK_HEADER.size + INDEX_ENTRY.size * i)
+        flags, sx, sy, gx, gy, n_platforms, n_enemies, name_len = LEVEL_HEADER.unpack_from(buf, offset)
+        offset += LEVEL_HEADER.size
+        level = {'name': bytes(buf[offset:offset + name_len]).decode('utf-8')}
+        offset += name_len
+        if flags & HAS_START:
+            level['start'] = (sx, sy)
+        platforms = level['platforms'] = []
+        for x, y, width, height, has_color, r, g, b in PLATFORM.iter_unpack(
+                buf[offset:offset + PLATFORM.size * n_platforms]):
+            platforms.append((x, y, width, height, (r, g, b)) if has_color else (x, y, width, height))
+        offset += PLATFORM.size * n_platforms
+        if flags & HAS_GOAL:
+            level['goal'] = (gx, gy)
+        if flags & HAS_ENEMIES:
+            level['enemies'] = [(x, y, size, speed) if has_speed else (x, y, size)
+                                for x, y, size, has_speed, speed in ENEMY.iter_unpack(
+                                    buf[offset:offset + ENEMY.size * n_enemies])]
+        return level
+
+    def close(self):
+        if self.closer is not None:
+            self.closer()
+            self.closer = None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile a module's LEVELS list into a level pack")
+    parser.add_argument("module", nargs="?", default="deluxe_levels")
+    parser.add_argument("-o", "--output", help="pack path (default: <module>.pack)")
+    args = parser.parse_args()
+    levels = importlib.import_module(args.module).LEVELS
+    output = args.output or f"{args.module}.pack"
+    write_pack(levels, output)
+    print(f"{output}: {len(levels)} levels, {os.path.getsize(output)} bytes")
+
+
+if __name__ == "__main__":
+    main()
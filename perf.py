@@ -0,0 +1,365 @@
+"""Per-phase frame timing and an in-game overlay for the three games.
+
+A FrameTimer splits every frame into named phases. The loop calls
+begin_frame(), then lap(phase) as each phase finishes (the time since the
+previous lap is charged to that phase), then end_frame(). Rows land in a
+fixed-size NumPy ring buffer, so recording costs one perf_counter() per phase
+and never grows. PerfOverlay reads the buffer and draws rolling p50/p95/p99
+per phase plus a frame-time graph; while it is hidden it costs nothing.
+
+For post-mortems, a Tracer writes spans in the Chrome Trace Event format
+(open the file in chrome://tracing or Perfetto). A FrameTimer given a tracer
+emits one span per frame and per phase; Tracer.instrument() wraps chosen
+methods so their calls become spans too. Spans are buffered and serialized
+on a writer thread, so tracing adds little to the frames it measures.
+
+A LoadGovernor watches the same buffer and trades render quality for time
+when frames overrun their budget: first decorations go, then tiles switch to
+flat cached variants, and finally every other frame is not drawn at all
+while the simulation keeps stepping. Quality comes back as headroom returns.
+"""
+import functools
+import json
+import os
+import queue
+import threading
+from time import perf_counter
+
+import numpy as np
+import pygame
+
+from textcache import FONTS
+
+PHASES = ("events", "player", "enemies", "collision", "level_draw", "sprite_draw", "hud", "flip")
+PERCENTILES = (50, 95, 99)
+OVERLAY_KEY = pygame.K_F3
+
+# Render quality levels, best first; each level keeps the savings of the ones above it.
+QUALITY_FULL = 0
+QUALITY_NO_DECOR = 1        # particles and purely decorative draws dropped
+QUALITY_LOW_DETAIL = 2      # flat cached tile variants instead of textured ones
+QUALITY_FRAME_SKIP = 3      # every other frame is not rendered; the simulation still steps
+QUALITY_NAMES = ("full", "no decor", "low detail", "frame skip")
+
+
+class FrameTimer:
+    """Ring buffer of per-phase seconds for the last `capacity` frames."""
+
+    def __init__(self, phases=PHASES, capacity=600, tracer=None):
+        self.phases = tuple(phases)
+        self.tracer = tracer
+        self.columns = {name: i for i, name in enumerate(self.phases)}
+        self.capacity = capacity
+        self.samples = np.zeros((capacity, len(self.phases)))
+        # Start-to-start interval of each frame, so time spent in clock.tick
+        # and anything outside the phases still shows up.
+        self.frame_times = np.zeros(capacity)
+        self.count = 0
+        self.row = [0.0] * len(self.phases)
+        self.frame_start = None
+        self.last = 0.0
+
+    def begin_frame(self):
+        now = perf_counter()
+        if self.frame_start is not None and self.count:
+            self.frame_times[(self.count - 1) % self.capacity] = now - self.frame_start
+        self.frame_start = self.last = now
+
+    def lap(self, phase):
+        now = perf_counter()
+        self.row[self.columns[phase]] += now - self.last
+        if self.tracer is not None:
+            self.tracer.complete(phase, self.last, now, "phase")
+        self.last = now
+
+    def end_frame(self):
+        i = self.count % self.capacity
+        self.samples[i] = self.row
+        # Provisional until the next begin_frame() knows the full interval.
+        self.frame_times[i] = self.last - self.frame_start
+        self.row = [0.0] * len(self.phases)
+        if self.tracer is not None:
+            self.tracer.complete(f"frame {self.count}", self.frame_start, self.last, "frame")
+        self.count += 1
+
+    def filled(self):
+        return min(self.count, self.capacity)
+
+    def recent_frame_times(self, n):
+        """The last n frame intervals in seconds, oldest first."""
+        n = min(n, self.filled())
+        return self.frame_times[(self.count - n + np.arange(n)) % self.capacity]
+
+    def recent_work_times(self, n):
+        """Summed phase seconds of the last n frames, oldest first.
+
+        Unlike frame_times this leaves out time spent sleeping in clock.tick,
+        so it measures what the frame cost rather than how long it lasted.
+        """
+        n = min(n, self.filled())
+        return self.samples[(self.count - n + np.arange(n)) % self.capacity].sum(axis=1)
+
+    def percentiles(self, q=PERCENTILES):
+        """{phase: seconds at each percentile in q}, plus 'frame' for whole frames."""
+        n = self.filled()
+        if not n:
+            return {}
+        table = np.percentile(self.samples[:n], q, axis=0)
+        result = {name: table[:, i].tolist() for i, name in enumerate(self.phases)}
+        result["frame"] = np.percentile(self.frame_times[:n], q).tolist()
+        return result
+
+
+class NullTimer:
+    """Stands in for a FrameTimer where nothing should be recorded."""
+
+    def begin_frame(self):
+        pass
+
+    def lap(self, phase):
+        pass
+
+    def end_frame(self):
+        pass
+
+
+NULL_TIMER = NullTimer()
+
+
+class LoadGovernor:
+    """Steps render quality down while frames overrun the budget, and back up with headroom.
+
+    Every `window` frames it takes the 75th percentile of their work times
+    from a FrameTimer. Above degrade * budget, quality drops one level; below
+    restore * budget, it rises one level once `patience` such windows have
+    passed in a row. A restore that overruns straight away doubles patience
+    (up to max_patience), so a level that does not fit is retried less and
+    less often. The percentile rather than the mean keeps skipped frames,
+    which draw nothing, from passing for headroom.
+
+    Call render_this_frame() before drawing and update() after end_frame().
+    """
+
+    def __init__(self, timer, budget=1 / 60, window=30, degrade=0.95, restore=0.6, max_patience=8):
+        self.timer = timer
+        self.budget = budget
+        self.window = window
+        self.degrade = degrade
+        self.restore = restore
+        self.max_patience = max_patience
+        self.level = QUALITY_FULL
+        self.age = 0
+        self.frames = 0
+        self.patience = 1
+        self.headroom = 0
+        self.just_restored = False
+        self.degrades = 0
+        self.restores = 0
+        self.skipped = 0
+
+    @property
+    def decor(self):
+        """Whether decorative draws should be made."""
+        return self.level < QUALITY_NO_DECOR
+
+    @property
+    def low_detail(self):
+        """Whether tiles should use their flat low-detail variants."""
+        return self.level >= QUALITY_LOW_DETAIL
+
+    def render_this_frame(self):
+        """False on every other frame at QUALITY_FRAME_SKIP; counts the frames it skips."""
+        self.frames += 1
+        if self.level >= QUALITY_FRAME_SKIP and self.frames % 2:
+            self.skipped += 1
+            return False
+        return True
+
+    def update(self):
+        """Re-judge the quality level once a window of frames has been recorded."""
+        self.age += 1
+        if self.age < self.window or self.timer.filled() < self.window:
+            return self.level
+        self.age = 0
+        work = np.percentile(self.timer.recent_work_times(self.window), 75)
+        restored, self.just_restored = self.just_restored, False
+        if work > self.degrade * self.budget:
+            self.headroom = 0
+            if restored:
+                self.patience = min(2 * self.patience, self.max_patience)
+            if self.level < QUALITY_FRAME_SKIP:
+                self.level += 1
+                self.degrades += 1
+        elif work < self.restore * self.budget and self.level > QUALITY_FULL:
+            self.headroom += 1
+            if self.headroom >= self.patience:
+                self.headroom = 0
+                self.level -= 1
+                self.restores += 1
+                self.just_restored = True
+        else:
+            self.headroom = 0
+        return self.level
+
+    def summary(self):
+        return (f"quality: {QUALITY_NAMES[self.level]}; {self.degrades} down, "
+                f"{self.restores} up, {self.skipped} frames skipped")
+
+
+class PerfOverlay:
+    """Percentile table and frame-time graph for a FrameTimer, toggled with F3.
+
+    status, if given, is called on each panel refresh for extra text shown
+    under the table, such as entity counters; each "\n" starts a new line.
+    """
+
+    def __init__(self, timer, budget=1 / 60, refresh=15, graph_frames=120, font_size=18, status=None):
+        self.timer = timer
+        self.status = status
+        self.budget = budget
+        self.refresh = refresh
+        self.graph_frames = graph_frames
+        self.font_size = font_size
+        self.visible = False
+        self.panel = None
+        self.panel_frame = 0
+
+    def toggle(self):
+        self.visible = not self.visible
+        self.panel = None
+
+    def handle_event(self, event):
+        """Toggle on the overlay key; returns True if the event was consumed."""
+        if event.type == pygame.KEYDOWN and event.key == OVERLAY_KEY:
+            self.toggle()
+            return True
+        return False
+
+    def build_panel(self):
+        font = FONTS.get(None, self.font_size)
+        rows = [["ms"] + [f"p{q}" for q in PERCENTILES]]
+        for name, values in self.timer.percentiles().items():
+            rows.append([name] + [f"{v * 1e3:.2f}" for v in values])
+        # The default font is proportional: left-align names, right-align numbers.
+        name_w = max(font.size(row[0])[0] for row in rows) + 12
+        col_w = max(font.size(cell)[0] for row in rows for cell in row[1:]) + 12
+        line_h = font.get_linesize()
+        status = [font.render(line, True, (255, 255, 255))
+                  for line in self.status().split("\n")] if self.status else []
+        width = max([name_w + col_w * len(PERCENTILES) + 6, self.graph_frames * 2]
+                    + [line.get_width() + 12 for line in status])
+        height = line_h * (len(rows) + len(status)) + 8
+        panel = pygame.Surface((width, height), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 170))
+        for i, line in enumerate(status, len(rows)):
+            panel.blit(line, (6, 4 + i * line_h))
+        for r, row in enumerate(rows):
+            y = 4 + r * line_h
+            panel.blit(font.render(row[0], True, (255, 255, 255)), (6, y))
+            for c, cell in enumerate(row[1:], 1):
+                text = font.render(cell, True, (255, 255, 255))
+                panel.blit(text, (name_w + c * col_w - text.get_width(), y))
+        return panel
+
+    def draw(self, surface, pos=(8, 40)):
+        if not self.visible:
+            return
+        if self.panel is None or self.timer.count - self.panel_frame >= self.refresh:
+            self.panel = self.build_panel()
+            self.panel_frame = self.timer.count
+        surface.blit(self.panel, pos)
+        self.draw_graph(surface, pygame.Rect(pos[0], pos[1] + self.panel.get_height(),
+                                             self.graph_frames * 2, 60))
+
+    def draw_graph(self, surface, rect):
+        """Frame times, oldest on the left; the full height is twice the budget."""
+        surface.fill((0, 0, 0), rect)
+        budget_y = rect.bottom - rect.height // 2
+        pygame.draw.line(surface, (0, 160, 0), (rect.left, budget_y), (rect.right - 1, budget_y))
+        times = self.timer.recent_frame_times(self.graph_frames)
+        if len(times) < 2:
+            return
+        heights = np.minimum(times / (2 * self.budget), 1.0) * (rect.height - 1)
+        xs = rect.right - 2 * len(times) + 2 * np.arange(len(times))
+        ys = rect.bottom - 1 - heights.astype(np.int32)
+        pygame.draw.lines(surface, (255, 220, 0), False, list(zip(xs.tolist(), ys.tolist())))
+
+
+class Tracer:
+    """Buffers complete ("X") trace events and appends them to path off-thread.
+
+    The file is a JSON array that stays valid to the trace viewers even if
+    the game dies before close() writes the closing bracket.
+    """
+
+    def __init__(self, path, flush_events=4096):
+        self.path = path
+        self.flush_events = flush_events
+        self.origin = perf_counter()
+        self.pid = os.getpid()
+        self.events = []
+        self.threads = {}
+        self.lock = threading.Lock()
+        self.queue = queue.Queue()
+        self.file = open(path, "w")
+        self.file.write("[")
+        self.separator = "\n"
+        self.writer = threading.Thread(target=self._write, name="trace-writer", daemon=True)
+        self.writer.start()
+
+    def complete(self, name, start, end, cat="game"):
+        """Record a span between two perf_counter() readings on the calling thread."""
+        tid = threading.get_ident()
+        with self.lock:
+            if tid not in self.threads:
+                self.threads[tid] = threading.current_thread().name
+            self.events.append((name, cat, start, end, tid))
+            if len(self.events) >= self.flush_events:
+                self.queue.put(self.events)
+                self.events = []
+
+    def instrument(self, owner, *names):
+        """Replace owner.<name> methods with wrappers that record each call."""
+        for name in names:
+            setattr(owner, name, self._traced(getattr(owner, name), f"{owner.__name__}.{name}"))
+
+    def _traced(self, fn, label):
+        @functools.wraps(fn)
+        def traced(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.complete(label, start, perf_counter())
+        return traced
+
+    def flush(self):
+        with self.lock:
+            if self.events:
+                self.queue.put(self.events)
+                self.events = []
+
+    def _write(self):
+        while True:
+            batch = self.queue.get()
+            if batch is None:
+                return
+            lines = [json.dumps({"name": name, "cat": cat, "ph": "X", "pid": self.pid, "tid": tid,
+                                 "ts": round((start - self.origin) * 1e6, 3),
+                                 "dur": round((end - start) * 1e6, 3)})
+                     for name, cat, start, end, tid in batch]
+            self.file.write(self.separator + ",\n".join(lines))
+            self.separator = ",\n"
+            self.file.flush()
+
+    def close(self):
+        """Flush everything, name the threads and terminate the JSON array."""
+        self.flush()
+        self.queue.put(None)
+        self.writer.join()
+        for tid, name in self.threads.items():
+            self.file.write(self.separator + json.dumps({"name": "thread_name", "ph": "M", "pid": self.pid,
+                                                         "tid": tid, "args": {"name": name}}))
+            self.separator = ",\n"
+        self.file.write("\n]\n")
+        self.file.close()
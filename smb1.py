@@ -1,18 +1,27 @@
 import os
 import sys
 import math
+import array
 import random
+import struct
+import zlib
+import argparse
+from collections import namedtuple
+from enum import IntEnum
+import numpy as np
 import pygame
 
-# ---------- Setup ----------
-pygame.init()
-pygame.display.set_caption("32-Level Platformer — NES Style")
+from activation import ActivationWindow
+from gameloop import FixedStepLoop, Interpolator, lerp
+from levelloader import LevelLoader
+from perf import NULL_TIMER, FrameTimer, LoadGovernor, PerfOverlay, Tracer
+from textcache import FONTS, TEXT
 
+# ---------- Setup ----------
 # Screen & tiles
 SCREEN_WIDTH, SCREEN_HEIGHT = 960, 540
 TILE = 32
 FPS = 60
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
 
 # NES-inspired color palette (SMB1 accurate)
 SKY = (107, 129, 161)  # SMB1 sky blue
@@ -26,17 +35,50 @@ YELLOW = (252, 216, 0)
 GRAY = (128, 128, 128)
 DARK = (40, 40, 40)
 PURPLE = (140, 70, 180)
-
-FONT = pygame.font.Font(None, 26)
-BIG_FONT = pygame.font.Font(None, 64)
+BRICK = (200, 76, 12)
+BRICK_MORTAR = (120, 40, 0)
+QBLOCK_SYMBOL = (160, 130, 0)
+QBLOCK_MORTAR = (180, 150, 0)
 
 MAX_LEVELS = 32
 GRAVITY = 0.6
+CHUNK_TILES = 32  # width of a pre-baked level chunk, in tiles
+
+# Tile IDs stored in Level.grid (uint8). GOOMBA/PLAYER/FLAG are spawn
+# markers that only exist until Level.__init__ extracts them.
+class Tile(IntEnum):
+    EMPTY = 0
+    GROUND = 1
+    BRICK = 2
+    QUESTION = 3
+    GOOMBA = 4
+    PLAYER = 5
+    FLAG = 6
+
+SOLID = np.zeros(len(Tile), dtype=bool)
+SOLID[[Tile.GROUND, Tile.BRICK, Tile.QUESTION]] = True
+
+# Per-frame input bitmask consumed by Simulation.step
+INPUT_LEFT = 1
+INPUT_RIGHT = 2
+INPUT_JUMP = 4
+INPUT_RESTART = 8  # edge-triggered: set only on the frame R was pressed
 
 # ---------- Utility ----------
 def clamp(v, lo, hi):
     return lo if v < lo else hi if v > hi else v
 
+def keys_to_input(keys):
+    """Fold a pygame.key.get_pressed() snapshot into an input bitmask."""
+    inputs = 0
+    if keys[pygame.K_LEFT] or keys[pygame.K_a]:
+        inputs |= INPUT_LEFT
+    if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
+        inputs |= INPUT_RIGHT
+    if keys[pygame.K_SPACE] or keys[pygame.K_UP] or keys[pygame.K_z]:
+        inputs |= INPUT_JUMP
+    return inputs
+
 # ---------- SMB1-Style Sprite Renderer ----------
 class SpriteRenderer:
     @staticmethod
@@ -102,8 +144,8 @@ class SpriteRenderer:
 
     @staticmethod
     def draw_brick(surf, rect):
-        base = (200, 76, 12)
-        mortar = (120, 40, 0)
+        base = BRICK
+        mortar = BRICK_MORTAR
         pygame.draw.rect(surf, base, rect)
         # Mortar lines (SMB1 brick pattern)
         mid_x = rect.centerx
@@ -114,8 +156,8 @@ class SpriteRenderer:
     @staticmethod
     def draw_question_block(surf, rect, animated=False):
         base = YELLOW
-        symbol = (160, 130, 0)
-        mortar = (180, 150, 0)
+        symbol = QBLOCK_SYMBOL
+        mortar = QBLOCK_MORTAR
         pygame.draw.rect(surf, base, rect)
         # Mortar cross
         mid_x = rect.centerx
@@ -123,11 +165,137 @@ class SpriteRenderer:
         pygame.draw.line(surf, mortar, (mid_x, rect.top), (mid_x, rect.bottom), 2)
         pygame.draw.line(surf, mortar, (rect.left, mid_y), (rect.right, mid_y), 2)
         # Question mark
-        q_font = pygame.font.Font(None, 28)
+        q_font = FONTS.get(None, 28)
         q_text = q_font.render("?", True, symbol)
         q_rect = q_text.get_rect(center=rect.center)
         surf.blit(q_text, q_rect)
 
+# ---------- Tile Atlas ----------
+class TileAtlas:
+    """Pre-rendered TILE x TILE surfaces for the static tile kinds.
+
+    Each kind is rasterized once through SpriteRenderer and blitted from the
+    cache afterwards. The cache is rebuilt when TILE, the palette or the
+    target surface format changes.
+    """
+    painters = {
+        Tile.GROUND: SpriteRenderer.draw_ground,
+        Tile.BRICK: SpriteRenderer.draw_brick,
+        Tile.QUESTION: SpriteRenderer.draw_question_block,
+    }
+
+    def __init__(self):
+        self.key = None
+        self.tiles = [None] * len(Tile)
+
+    @staticmethod
+    def palette():
+        return (SKY, BROWN, YELLOW, BRICK, BRICK_MORTAR, QBLOCK_SYMBOL, QBLOCK_MORTAR)
+
+    @staticmethod
+    def flat_colors():
+        """Low-detail variant of each drawn kind: its base colour, without mortar or glyph."""
+        return {Tile.GROUND: BROWN, Tile.BRICK: BRICK, Tile.QUESTION: YELLOW}
+
+    def tiles_for(self, surf):
+        """Return the Surface list indexed by Tile ID (None for undrawn tiles), rebuilding it if stale."""
+        key = (TILE, self.palette(), surf.get_bitsize())
+        if key != self.key:
+            self.tiles = [None] * len(Tile)
+            for tile_id, paint in self.painters.items():
+                tile = pygame.Surface((TILE, TILE), 0, surf)
+                tile.fill(SKY)
+                paint(tile, pygame.Rect(0, 0, TILE, TILE))
+                self.tiles[tile_id] = tile
+            self.key = key
+        return self.tiles
+
+    def invalidate(self):
+        self.key = None
+
+TILE_ATLAS = TileAtlas()
+
+# ---------- Merged colliders ----------
+def merge_tiles(grid, solid, x0=0):
+    """Greedily cover the solid cells of grid with same-kind rectangles.
+
+    Scans row-major; each uncovered cell starts a rect that grows right along
+    its row, then down while every cell of the span matches. Returns
+    (left, top, right, bottom, kind) tuples in tiles, right/bottom exclusive,
+    shifted right by x0.
+    """
+    rows = grid.tolist()
+    free = solid.tolist()
+    h = len(rows)
+    rects = []
+    for ty, tx in np.argwhere(solid).tolist():
+        if not free[ty][tx]:
+            continue
+        kind = rows[ty][tx]
+        row, open_ = rows[ty], free[ty]
+        right = tx + 1
+        while right < len(row) and open_[right] and row[right] == kind:
+            right += 1
+        bottom = ty + 1
+        while bottom < h and all(free[bottom][i] and rows[bottom][i] == kind for i in range(tx, right)):
+            bottom += 1
+        for y in range(ty, bottom):
+            free[y][tx:right] = [False] * (right - tx)
+        rects.append((x0 + tx, ty, x0 + right, bottom, kind))
+    return rects
+
+class SolidRects:
+    """A level's solid tiles as merged rectangles, bucketed by column.
+
+    Runs are merged within CHUNK_TILES-wide chunks only, so a changed tile is
+    re-merged with the rest of its chunk and nothing else. columns[tx] lists
+    the rects covering column tx: the broadphase for first_solid().
+    """
+    def __init__(self, grid, solid):
+        self.w = grid.shape[1]
+        self.chunks = []
+        self.columns = [[] for _ in range(self.w)]
+        for start in range(0, self.w, CHUNK_TILES):
+            self.chunks.append([])
+            self.remerge(grid, solid, start // CHUNK_TILES)
+
+    def __len__(self):
+        return sum(len(rects) for rects in self.chunks)
+
+    def remerge(self, grid, solid, ci):
+        start = ci * CHUNK_TILES
+        end = min(self.w, start + CHUNK_TILES)
+        rects = merge_tiles(grid[:, start:end], solid[:, start:end], start)
+        self.chunks[ci] = rects
+        for tx in range(start, end):
+            self.columns[tx] = []
+        for rect in rects:
+            for tx in range(rect[0], rect[2]):
+                self.columns[tx].append(rect)
+
+    def first_solid(self, tx0, ty0, tx1, ty1, w):
+        """Flat index ty * w + tx of the first solid tile in a tile range, row-major, or -1.
+
+        A rect's first tile inside the range is its clipped top-left corner,
+        so the answer is the smallest such index over the overlapping rects.
+        """
+        columns = self.columns
+        best = -1
+        tx = tx0
+        while tx <= tx1:
+            column = columns[tx]
+            i = len(column)
+            while i:
+                i -= 1
+                left, top, right, bottom, _ = column[i]
+                if top <= ty1 and bottom > ty0:
+                    # Rects spanning several queried columns are met once per column; harmless.
+                    cell = (top if top > ty0 else ty0) * w + (left if left > tx0 else tx0)
+                    if best < 0 or cell < best:
+                        best = cell
+            tx += 1
+        return best
+
 # ---------- Entities ----------
 class Player:
     def __init__(self, x, y):
@@ -142,12 +310,12 @@ class Player:
         self.ground_friction = 0.82
         self.air_drag = 0.98
 
-    def update(self, keys, level):
+    def update(self, inputs, level):
         ax = 0.0
-        if keys[pygame.K_LEFT] or keys[pygame.K_a]:
+        if inputs & INPUT_LEFT:
             ax -= self.accel
             self.facing_right = False
-        if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
+        if inputs & INPUT_RIGHT:
             ax += self.accel
             self.facing_right = True
 
@@ -156,129 +324,301 @@ class Player:
             self.velx *= (self.ground_friction if self.on_ground else self.air_drag)
         self.velx = clamp(self.velx, -self.max_speed, self.max_speed)
 
-        if (keys[pygame.K_SPACE] or keys[pygame.K_UP] or keys[pygame.K_z]) and self.on_ground:
+        if inputs & INPUT_JUMP and self.on_ground:
             self.vely = -self.jump_speed
             self.on_ground = False
 
         self.vely += GRAVITY
         self.vely = clamp(self.vely, -50, 15)
 
-        # Horizontal collision
-        self.rect.x += int(round(self.velx))
-        for trect in level.iter_colliding_tiles(self.rect):
-            if self.velx > 0:
-                self.rect.right = trect.left
-            elif self.velx < 0:
-                self.rect.left = trect.right
+        rect = self.rect
+        w, h = rect.w, rect.h
+        x, hit = level.move_x(rect.x, rect.y, w, h, self.velx)
+        if hit:
             self.velx = 0
+        y, hit = level.move_y(x, rect.y, w, h, self.vely)
+        self.on_ground = hit and self.vely > 0
+        if hit:
+            self.vely = 0
+        rect.topleft = x, y
 
-        # Vertical collision
-        self.rect.y += int(round(self.vely))
-        self.on_ground = False
-        for trect in level.iter_colliding_tiles(self.rect):
-            if self.vely > 0:
-                self.rect.bottom = trect.top
-                self.vely = 0
-                self.on_ground = True
-            elif self.vely < 0:
-                self.rect.top = trect.bottom
-                self.vely = 0
-
-    def draw(self, surf, camx):
-        draw_rect = self.rect.move(-camx, 0)
+    def draw(self, surf, camx, topleft=None):
+        draw_rect = self.rect.copy()
+        if topleft is not None:
+            draw_rect.topleft = topleft
+        draw_rect.x -= camx
         SpriteRenderer.draw_player(surf, draw_rect, self.facing_right)
 
-class Goomba:
-    def __init__(self, x, y):
-        self.rect = pygame.Rect(x, y, 16, 16)
-        self.vx = random.choice([-1, 1]) * (1.0 + random.random() * 0.6)
-        self.vy = 0.0
-        self.alive = True
-        self.squash_timer = 0
+GOOMBA_SIZE = 16
+# Goombas sleep until they come this close to the edges of the view
+ACTIVATION_MARGIN = 3 * TILE
+# Offsets of the 2x2 candidate tiles (row-major) scaled by the box's extra column/row
+BOX_DX = np.array([0, 1, 0, 1])
+BOX_DY = np.array([0, 0, 1, 1])
+# One Goomba as state_hash() packs it: x, y, vx, vy, alive, squash timer
+GOOMBA_RECORD = np.dtype([("x", "<i4"), ("y", "<i4"), ("vx", "<f8"), ("vy", "<f8"),
+                          ("alive", "u1"), ("squash", "<i4")])
+
+class Goombas:
+    """Every Goomba of a level as parallel NumPy arrays, stepped in one batch.
+
+    Goombas never interact with each other, so update() resolves gravity, wall
+    bounces, ground snapping and ledge turnarounds for all of them at once
+    against the level's solid mask, with the same integer rounding and
+    row-major tile priority as Player's per-rect collision.
+
+    Goombas start asleep; activate(camx) wakes the ones near the view and
+    only the awake rows in `active` are stepped, tested and drawn.
+    """
+    def __init__(self, xs=(), ys=(), vxs=(), margin=ACTIVATION_MARGIN):
+        self.x = np.array(xs, dtype=np.int64)
+        self.y = np.array(ys, dtype=np.int64)
+        self.vx = np.array(vxs, dtype=np.float64)
+        self.vy = np.zeros(len(self.x))
+        self.alive = np.ones(len(self.x), dtype=bool)
+        self.squash = np.zeros(len(self.x), dtype=np.int64)
         self.facing_right = self.vx > 0
+        # Spawn-order ids survive remove_expired(), unlike row numbers.
+        self.ids = np.arange(len(self.x))
+        self.awake = np.zeros(len(self.x), dtype=bool)
+        self.active = np.flatnonzero(self.awake)
+        # Positions before the latest step, once capture() has been called
+        self.prev_x = self.prev_y = None
+        self.window = ActivationWindow(zip(self.x.tolist(), self.ids.tolist()), SCREEN_WIDTH, margin)
+
+    @classmethod
+    def from_spawns(cls, spawns, margin=ACTIVATION_MARGIN):
+        """Build from (x, y, vx) tuples."""
+        if not spawns:
+            return cls(margin=margin)
+        xs, ys, vxs = zip(*spawns)
+        return cls(xs, ys, vxs, margin)
+
+    @staticmethod
+    def random_vx(rng):
+        return rng.choice([-1, 1]) * (1.0 + rng.random() * 0.6)
+
+    def __len__(self):
+        return len(self.x)
+
+    def spawns(self):
+        return tuple(zip(self.x.tolist(), self.y.tolist(), self.vx.tolist()))
+
+    @staticmethod
+    def _first_solid(padded, x, y):
+        """Level.first_solid over each Goomba's 16x16 box: (hit, tx, ty).
+
+        padded is the solid mask with a one-tile False border, so boxes that
+        hang off the level need no special casing. A box spans at most 2x2
+        tiles; the candidates are checked in row-major order.
+        """
+        rows, cols = padded.shape
+        # Clamp into the border so tile coordinates stay within -1..w / -1..h.
+        x = np.minimum(np.maximum(x, -TILE), (cols - 2) * TILE)
+        y = np.minimum(np.maximum(y, -TILE), (rows - 2) * TILE)
+        left = x // TILE
+        top = y // TILE
+        dx = (x + GOOMBA_SIZE - 1) // TILE - left
+        dy = (y + GOOMBA_SIZE - 1) // TILE - top
+        base = top * cols + left + (cols + 1)
+        cells = padded.take(base[:, None] + dx[:, None] * BOX_DX + (dy * cols)[:, None] * BOX_DY)
+        first = cells.argmax(axis=1)
+        hit = cells.any(axis=1)
+        return hit, left + dx * (first & 1), top + dy * (first >> 1)
+
+    def capture(self):
+        """Remember current positions so draw() can blend from them after a step."""
+        self.prev_x = self.x.copy()
+        self.prev_y = self.y.copy()
+
+    def activate(self, camx):
+        """Wake sleepers in range of the view; put strays out of range back to sleep."""
+        changed = False
+        woken = self.window.wake(camx)
+        if woken:
+            self.awake[np.searchsorted(self.ids, woken)] = True
+            changed = True
+        lo, hi = self.window.bounds(camx)
+        rows = self.active
+        x = self.x[rows]
+        # Squashed Goombas stay awake until their timer runs out.
+        strayed = rows[self.alive[rows] & ((x < lo) | (x > hi))]
+        for row in strayed.tolist():
+            self.window.sleep(self.ids.item(row), self.x.item(row))
+            self.awake[row] = False
+            changed = True
+        if changed:
+            self.active = np.flatnonzero(self.awake)
 
     def update(self, level):
-        if not self.alive:
-            self.squash_timer -= 1
+        rows = self.active
+        if not len(rows):
             return
+        alive = self.alive[rows]
+        if not alive.all():
+            self.squash[rows[~alive]] -= 1
+            rows = rows[alive]
+        padded = level.padded_solid
 
-        self.vy += GRAVITY
-        self.facing_right = self.vx > 0
+        old_vx = vx = self.vx[rows]
+        vy = self.vy[rows] + GRAVITY
+        # astype truncates toward zero like int()
+        x = self.x[rows] + vx.astype(np.int64)
+        y = self.y[rows]
+        hit_wall, tx, _ = self._first_solid(padded, x, y)
+        x = np.where(hit_wall, np.where(vx > 0, tx * TILE - GOOMBA_SIZE, (tx + 1) * TILE), x)
+        vx = np.where(hit_wall, -vx, vx)
 
-        self.rect.x += int(self.vx)
-        hit_wall = False
-        for trect in level.iter_colliding_tiles(self.rect):
-            hit_wall = True
-            if self.vx > 0:
-                self.rect.right = trect.left
-            else:
-                self.rect.left = trect.right
-            self.vx = -self.vx
-            break
+        y = y + vy.astype(np.int64)
+        hit, _, ty = self._first_solid(padded, x, y)
+        landed = hit & (vy > 0)
+        bumped = hit & (vy < 0)
+        y = np.where(landed, ty * TILE - GOOMBA_SIZE, np.where(bumped, (ty + 1) * TILE, y))
+        vy = np.where(hit, 0.0, vy)
+
+        # Turn around at ledges: probe the tile just below and ahead of the
+        # feet. Off-level probes count as solid, like Level.solid_at_pixel.
+        probe = landed & ~hit_wall
+        if probe.any():
+            ptx = (x + GOOMBA_SIZE // 2 + np.where(vx > 0, 12, -12)) // TILE
+            pty = (y + GOOMBA_SIZE + 2) // TILE
+            inside = (ptx >= 0) & (ptx < level.w) & (pty >= 0) & (pty < level.h)
+            solid = padded.take((np.minimum(np.maximum(pty, -1), level.h) + 1) * (level.w + 2)
+                                + np.minimum(np.maximum(ptx, -1), level.w) + 1) | ~inside
+            vx = np.where(probe & ~solid, -vx, vx)
+
+        self.facing_right[rows] = old_vx > 0
+        self.x[rows] = x
+        self.y[rows] = y
+        self.vx[rows] = vx
+        self.vy[rows] = vy
+
+    def touching(self, rect):
+        """Indices of awake, live Goombas overlapping rect, in order."""
+        rows = self.active
+        x, y = self.x[rows], self.y[rows]
+        overlap = ((x < rect.right) & (rect.left < x + GOOMBA_SIZE)
+                   & (y < rect.bottom) & (rect.top < y + GOOMBA_SIZE))
+        return rows[overlap & self.alive[rows]].tolist()
+
+    def squash_at(self, i, timer=30):
+        self.alive[i] = False
+        self.squash[i] = timer
 
-        self.rect.y += int(self.vy)
-        grounded = False
-        for trect in level.iter_colliding_tiles(self.rect):
-            if self.vy > 0:
-                self.rect.bottom = trect.top
-                self.vy = 0
-                grounded = True
-            elif self.vy < 0:
-                self.rect.top = trect.bottom
-                self.vy = 0
-
-        if grounded and not hit_wall:
-            ahead_x = self.rect.centerx + (12 if self.vx > 0 else -12)
-            below = level.get_tile_at_pixel(ahead_x, self.rect.bottom + 2)
-            if below not in level.solids:
-                self.vx = -self.vx
-
-    def draw(self, surf, camx):
-        draw_rect = self.rect.move(-camx, 0)
-        SpriteRenderer.draw_goomba(surf, draw_rect, self.alive, self.facing_right)
+    def remove_expired(self, before=None):
+        """Drop squashed Goombas whose timer ran out (only indices < before, if given)."""
+        expired = ~self.alive & (self.squash <= 0)
+        if before is not None:
+            expired[before:] = False
+        if expired.any():
+            keep = ~expired
+            for name in ("x", "y", "vx", "vy", "alive", "squash", "facing_right", "ids", "awake"):
+                setattr(self, name, getattr(self, name)[keep])
+            if self.prev_x is not None:
+                self.prev_x, self.prev_y = self.prev_x[keep], self.prev_y[keep]
+            self.active = np.flatnonzero(self.awake)
+            self.window.retire(int(expired.sum()))
+
+    def records(self):
+        """The state_hash() byte layout for every Goomba, in order."""
+        out = np.empty(len(self.x), GOOMBA_RECORD)
+        out["x"], out["y"], out["vx"], out["vy"] = self.x, self.y, self.vx, self.vy
+        out["alive"], out["squash"] = self.alive, self.squash
+        return out
+
+    def draw(self, surf, camx, alpha=1.0):
+        """Draw the awake Goombas, alpha of the way from their captured positions to the current ones."""
+        rows = self.active
+        x, y = self.x[rows], self.y[rows]
+        if self.prev_x is not None and alpha < 1.0:
+            x = np.rint(lerp(self.prev_x[rows], x, alpha)).astype(np.int64)
+            y = np.rint(lerp(self.prev_y[rows], y, alpha)).astype(np.int64)
+        x -= camx
+        on_screen = (x > -GOOMBA_SIZE) & (x < surf.get_width())
+        visible = rows[on_screen]
+        rect = pygame.Rect(0, 0, GOOMBA_SIZE, GOOMBA_SIZE)
+        for sx, sy, alive, facing in zip(x[on_screen].tolist(), y[on_screen].tolist(),
+                                         self.alive[visible].tolist(), self.facing_right[visible].tolist()):
+            rect.topleft = (sx, sy)
+            SpriteRenderer.draw_goomba(surf, rect, alive, facing)
 
 # ---------- Level ----------
-class Level:
-    solids = {'#', 'B', '?'}  
+# Post-construction state a Level resets to: grid and solid mask as bytes,
+# plus one (x, y, vx) tuple per Goomba.
+LevelSnapshot = namedtuple("LevelSnapshot", "grid solid enemies")
 
-    def __init__(self, index):
+class Level:
+    def __init__(self, index, seed=0):
         self.index = index
+        self.seed = seed
         self.grid = self._generate_level(index)
-        self.h = len(self.grid)
-        self.w = len(self.grid[0]) if self.h else 0
+        # Enemy behaviour draws from its own stream so a (seed, index) pair
+        # always yields the same level, independent of the global random.
+        enemy_rng = random.Random(f"{seed}:{index}")
+        self.h, self.w = self.grid.shape
         self.pixel_w = self.w * TILE
         self.pixel_h = self.h * TILE
-        self.enemies = []
         self.spawn_rect = None
         self.goal_rect = None
         self.flag_x_px = None
+        self.chunks = {}
+        self.low_chunks = {}    # flat-colour chunks for low-detail frames
+        self.chunk_key = None
 
-        for ty, row in enumerate(self.grid):
-            for tx, ch in enumerate(row):
-                if ch == 'G':
-                    self.enemies.append(Goomba(tx * TILE + 8, ty * TILE + 16))
-                    self.grid[ty][tx] = '.'
-                elif ch == 'P':
-                    self.spawn_rect = pygame.Rect(tx * TILE + 8, ty * TILE + 4, 16, 28)
-                    self.grid[ty][tx] = '.'
-                elif ch == 'F':
-                    gx = tx * TILE
-                    self.goal_rect = pygame.Rect(gx, 0, 2 * TILE, self.pixel_h)
-                    self.flag_x_px = gx + TILE // 2
-                    self.grid[ty][tx] = '.'
+        # np.nonzero walks row-major, so each Goomba draws its speed in scan order.
+        gys, gxs = np.nonzero(self.grid == Tile.GOOMBA)
+        self.enemies = Goombas(gxs * TILE + 8, gys * TILE + 16,
+                               [Goombas.random_vx(enemy_rng) for _ in range(len(gxs))])
+        players = np.argwhere(self.grid == Tile.PLAYER)
+        if len(players):
+            ty, tx = players[-1].tolist()
+            self.spawn_rect = pygame.Rect(tx * TILE + 8, ty * TILE + 4, 16, 28)
+        flags = np.argwhere(self.grid == Tile.FLAG)
+        if len(flags):
+            gx = int(flags[-1][1]) * TILE
+            self.goal_rect = pygame.Rect(gx, 0, 2 * TILE, self.pixel_h)
+            self.flag_x_px = gx + TILE // 2
+        self.grid[self.grid >= Tile.GOOMBA] = Tile.EMPTY
+        self.solid = SOLID[self.grid]
+        self.snapshot = LevelSnapshot(self.grid.tobytes(), self.solid.tobytes(),
+                                      self.enemies.spawns())
+        self.modified_chunks = set()
 
         if self.spawn_rect is None:
-            for tx in range(self.w):
-                for ty in range(self.h - 1):
-                    if self.grid[ty][tx] == '.' and self.grid[ty + 1][tx] in self.solids:
-                        self.spawn_rect = pygame.Rect(tx * TILE + 8, ty * TILE + 4, 16, 28)
-                        break
-                if self.spawn_rect:
-                    break
+            # First empty cell standing on a solid one, scanning column by column.
+            standing = (self.grid[:-1] == Tile.EMPTY) & self.solid[1:]
+            spots = np.argwhere(standing.T)
+            if len(spots):
+                tx, ty = spots[0].tolist()
+                self.spawn_rect = pygame.Rect(tx * TILE + 8, ty * TILE + 4, 16, 28)
         if self.goal_rect is None:
             gx = self.pixel_w - 3 * TILE
             self.goal_rect = pygame.Rect(gx, 0, 2 * TILE, self.pixel_h)
             self.flag_x_px = gx + TILE // 2
+        self._restore_grid()
+        self.colliders = SolidRects(self.grid, self.solid)
+        # solid with a one-tile False border, for the Goombas' vectorized probes
+        self.padded_solid = np.zeros((self.h + 2, self.w + 2), dtype=bool)
+        self.padded_solid[1:-1, 1:-1] = self.solid
+
+    def _restore_grid(self):
+        # Read-only views straight over the snapshot bytes; set_tile copies
+        # them on the first write.
+        self.grid = np.frombuffer(self.snapshot.grid, np.uint8).reshape(self.h, self.w)
+        self.solid = np.frombuffer(self.snapshot.solid, bool).reshape(self.h, self.w)
+
+    def reset(self):
+        """Return the grid and enemies to their state right after construction."""
+        self._restore_grid()
+        self.enemies = Goombas.from_spawns(self.snapshot.enemies)
+        # Cached chunks and colliders of untouched columns still match the snapshot.
+        for ci in self.modified_chunks:
+            self.chunks.pop(ci, None)
+            self.low_chunks.pop(ci, None)
+            self.colliders.remerge(self.grid, self.solid, ci)
+            start, end = ci * CHUNK_TILES, min(self.w, (ci + 1) * CHUNK_TILES)
+            self.padded_solid[1:-1, start + 1:end + 1] = self.solid[:, start:end]
+        self.modified_chunks.clear()
 
     def _generate_level(self, idx):
         r = random.Random(1000 + idx * 73)
@@ -286,10 +626,8 @@ class Level:
         height = 16
         ground_y = height - 2
 
-        grid = [['.' for _ in range(width)] for _ in range(height)]
-        for x in range(width):
-            grid[ground_y][x] = '#'
-            grid[ground_y + 1][x] = '#'
+        grid = np.zeros((height, width), dtype=np.uint8)
+        grid[ground_y:ground_y + 2] = Tile.GROUND
 
         x = 10
         hole_prob = min(0.18, 0.08 + idx * 0.003)
@@ -297,77 +635,194 @@ class Level:
         while x < width - 10:
             if r.random() < hole_prob:
                 w = r.randint(1, max_hole)
-                for i in range(w):
-                    if x + i < width - 2:
-                        grid[ground_y][x + i] = '.'
-                        grid[ground_y + 1][x + i] = '.'
+                grid[ground_y:ground_y + 2, x:min(x + w, width - 2)] = Tile.EMPTY
                 x += w + r.randint(2, 6)
             else:
                 x += 1
 
         blocks = 26 + idx * 2
-        for _ in range(blocks):
+        cells = np.empty(blocks, dtype=np.intp)
+        kinds = np.empty(blocks, dtype=np.uint8)
+        for i in range(blocks):
             bx = r.randint(4, width - 4)
             by = r.randint(4, ground_y - 3)
-            grid[by][bx] = 'B' if r.random() < 0.6 else '?'
+            cells[i] = by * width + bx
+            kinds[i] = Tile.BRICK if r.random() < 0.6 else Tile.QUESTION
+        # When two blocks land on the same cell the later one wins.
+        _, last = np.unique(cells[::-1], return_index=True)
+        last = blocks - 1 - last
+        grid.flat[cells[last]] = kinds[last]
 
         for step in range(6):
             base_x = width - 20 + step * 2
-            for k in range(step + 1):
-                y = ground_y - k
-                if 0 <= base_x < width:
-                    grid[y][base_x] = '#'
+            if 0 <= base_x < width:
+                grid[ground_y - step:ground_y + 1, base_x] = Tile.GROUND
 
         enemy_count = 8 + idx // 2
-        attempts, placed = 0, 0
-        while placed < enemy_count and attempts < enemy_count * 12:
+        ground = (grid[ground_y] == Tile.GROUND).tolist()
+        spots = []
+        attempts = 0
+        while len(spots) < enemy_count and attempts < enemy_count * 12:
             attempts += 1
             ex = r.randint(6, width - 8)
-            if grid[ground_y][ex] == '#':
-                grid[ground_y - 1][ex] = 'G'
-                placed += 1
+            if ground[ex]:
+                spots.append(ex)
+        grid[ground_y - 1, spots] = Tile.GOOMBA
 
-        grid[ground_y - 1][2] = 'P'
-        grid[ground_y - 2][width - 6] = 'F'
+        grid[ground_y - 1, 2] = Tile.PLAYER
+        grid[ground_y - 2, width - 6] = Tile.FLAG
         return grid
 
-    def iter_colliding_tiles(self, rect):
-        left = max(0, rect.left // TILE)
-        right = min(self.w - 1, (rect.right - 1) // TILE)
-        top = max(0, rect.top // TILE)
-        bottom = min(self.h - 1, (rect.bottom - 1) // TILE)
-        for ty in range(top, bottom + 1):
-            for tx in range(left, right + 1):
-                ch = self.grid[ty][tx]
-                if ch in self.solids:
-                    yield pygame.Rect(tx * TILE, ty * TILE, TILE, TILE)
+    # Collision runs every frame for every box, so these stick to int
+    # arithmetic over the merged rects: no Rects, generators or array views,
+    # and tile coordinates stay in CPython's cached small ints.
+    def first_solid(self, left, top, width, height):
+        """Flat index ty * w + tx of the first solid tile under a box, row-major, or -1."""
+        tx0 = left // TILE
+        if tx0 < 0:
+            tx0 = 0
+        tx1 = (left + (width - 1)) // TILE
+        if tx1 >= self.w:
+            tx1 = self.w - 1
+        ty0 = top // TILE
+        if ty0 < 0:
+            ty0 = 0
+        ty1 = (top + (height - 1)) // TILE
+        if ty1 >= self.h:
+            ty1 = self.h - 1
+        if tx0 > tx1 or ty0 > ty1:
+            return -1
+        return self.colliders.first_solid(tx0, ty0, tx1, ty1, self.w)
+
+    def move_x(self, left, top, width, height, vel):
+        """Move a box horizontally by round(vel) and push it out of solid tiles.
+
+        Returns (left, hit). The box is pushed against the side it was
+        moving toward; with vel == 0 a hit leaves it in place.
+        """
+        left += round(vel)
+        i = self.first_solid(left, top, width, height)
+        if i < 0:
+            return left, False
+        tx = i % self.w
+        if vel > 0:
+            left = tx * TILE - width
+        elif vel < 0:
+            left = (tx + 1) * TILE
+        return left, True
+
+    def move_y(self, left, top, width, height, vel):
+        """Vertical counterpart of move_x: returns (top, hit)."""
+        top += round(vel)
+        i = self.first_solid(left, top, width, height)
+        if i < 0:
+            return top, False
+        ty = i // self.w
+        if vel > 0:
+            top = ty * TILE - height
+        elif vel < 0:
+            top = (ty + 1) * TILE
+        return top, True
 
     def get_tile_at_pixel(self, px, py):
         tx = int(px) // TILE
         ty = int(py) // TILE
         if 0 <= tx < self.w and 0 <= ty < self.h:
-            return self.grid[ty][tx]
-        return '#'
-
-    def draw(self, surf, camx):
-        start_tx = max(0, camx // TILE - 1)
-        end_tx = min(self.w, (camx + SCREEN_WIDTH) // TILE + 2)
-
-        # Background: SMB1 sky
-        surf.fill(SKY)
-
-        for ty in range(self.h):
-            for tx in range(start_tx, end_tx):
-                ch = self.grid[ty][tx]
-                px = tx * TILE - camx
-                py = ty * TILE
-                tile_rect = pygame.Rect(px, py, TILE, TILE)
-                if ch == '#':
-                    SpriteRenderer.draw_ground(surf, tile_rect)
-                elif ch == 'B':
-                    SpriteRenderer.draw_brick(surf, tile_rect)
-                elif ch == '?':
-                    SpriteRenderer.draw_question_block(surf, tile_rect)
+            return Tile(self.grid.item(ty, tx))
+        return Tile.GROUND
+
+    def solid_at_pixel(self, px, py):
+        tx = int(px) // TILE
+        ty = int(py) // TILE
+        if 0 <= tx < self.w and 0 <= ty < self.h:
+            return self.solid.item(ty, tx)
+        return True
+
+    def set_tile(self, tx, ty, tile):
+        """Change one grid cell; only the chunk that holds it is re-merged and re-rendered."""
+        if not self.grid.flags.writeable:
+            self.grid = self.grid.copy()
+            self.solid = self.solid.copy()
+        self.modified_chunks.add(tx // CHUNK_TILES)
+        self.grid[ty, tx] = tile
+        self.solid[ty, tx] = SOLID[tile]
+        self.padded_solid[ty + 1, tx + 1] = self.solid[ty, tx]
+        self.colliders.remerge(self.grid, self.solid, tx // CHUNK_TILES)
+        self.mark_dirty(tx)
+
+    def mark_dirty(self, tx):
+        self.chunks.pop(tx // CHUNK_TILES, None)
+        self.low_chunks.pop(tx // CHUNK_TILES, None)
+
+    def _build_chunk(self, ci, surf, low_detail=False):
+        tiles = TILE_ATLAS.tiles_for(surf)
+        start_tx = ci * CHUNK_TILES
+        end_tx = min(self.w, start_tx + CHUNK_TILES)
+        chunk = pygame.Surface(((end_tx - start_tx) * TILE, self.pixel_h), 0, surf)
+        chunk.fill(SKY)
+        if low_detail:
+            # Every kind is flat, so each merged rect is a single fill.
+            flat = TILE_ATLAS.flat_colors()
+            for left, top, right, bottom, kind in self.colliders.chunks[ci]:
+                chunk.fill(flat[kind], ((left - start_tx) * TILE, top * TILE,
+                                        (right - left) * TILE, (bottom - top) * TILE))
+            return chunk
+        # Ground is flat brown, so each merged ground rect is one fill;
+        # textured kinds are still blitted a tile at a time.
+        blits = []
+        for left, top, right, bottom, kind in self.colliders.chunks[ci]:
+            left -= start_tx
+            right -= start_tx
+            if kind == Tile.GROUND:
+                chunk.fill(BROWN, (left * TILE, top * TILE, (right - left) * TILE, (bottom - top) * TILE))
+                continue
+            for y in range(top, bottom):
+                for x in range(left, right):
+                    blits.append((tiles[kind], (x * TILE, y * TILE)))
+        chunk.blits(blits, False)
+        return chunk
+
+    def draw(self, surf, camx, low_detail=False):
+        TILE_ATLAS.tiles_for(surf)
+        if TILE_ATLAS.key != self.chunk_key:
+            self.chunks.clear()
+            self.low_chunks.clear()
+            self.chunk_key = TILE_ATLAS.key
+        # Only the detail level in use keeps its chunks.
+        if low_detail:
+            chunks = self.low_chunks
+            self.chunks.clear()
+        else:
+            chunks = self.chunks
+            self.low_chunks.clear()
+
+        chunk_px = CHUNK_TILES * TILE
+        last_chunk = (self.w - 1) // CHUNK_TILES
+        first = max(0, camx // chunk_px)
+        last = min(last_chunk, (camx + SCREEN_WIDTH - 1) // chunk_px)
+
+        # Keep one chunk of slack on either side; bake the next one early
+        # once the camera is within half a chunk of it.
+        for ci in [ci for ci in chunks if ci < first - 1 or ci > last + 1]:
+            del chunks[ci]
+        ahead = last + 1
+        if ahead <= last_chunk and ahead not in chunks \
+                and ahead * chunk_px - (camx + SCREEN_WIDTH) < chunk_px // 2:
+            chunks[ahead] = self._build_chunk(ahead, surf, low_detail)
+
+        blits = []
+        for ci in range(first, last + 1):
+            chunk = chunks.get(ci)
+            if chunk is None:
+                chunk = chunks[ci] = self._build_chunk(ci, surf, low_detail)
+            blits.append((chunk, (ci * chunk_px - camx, 0)))
+        surf.blits(blits, False)
+
+        # Background: SMB1 sky wherever the chunks don't reach
+        if self.pixel_h < surf.get_height():
+            surf.fill(SKY, (0, self.pixel_h, surf.get_width(), surf.get_height() - self.pixel_h))
+        if self.pixel_w - camx < surf.get_width():
+            surf.fill(SKY, (self.pixel_w - camx, 0, surf.get_width(), self.pixel_h))
 
         if self.flag_x_px is not None:
             fx = self.flag_x_px - camx
@@ -375,109 +830,344 @@ class Level:
             pygame.draw.polygon(surf, GREEN, [(fx, TILE + 8), (fx + 16, TILE + 14), (fx, TILE + 20)])
             pygame.draw.circle(surf, (240, 240, 240), (int(fx), TILE), 6)
 
+# ---------- Simulation ----------
+class Simulation:
+    """Headless game state: the current level, the player and the rules between them.
+
+    step() advances one 1/FPS tick from an input bitmask and never touches the
+    display, so bots and replays can run it far faster than real time. With
+    prefetch=True the next level is built on a worker thread while the current
+    one is played; timer receives the player/enemies/collision phases.
+    """
+    def __init__(self, level_idx=0, lives=3, score=0, seed=0, prefetch=False, timer=NULL_TIMER):
+        self.seed = seed
+        self.timer = timer
+        self.loader = LevelLoader(lambda idx: Level(idx, seed)) if prefetch else None
+        self.level_idx = level_idx
+        self.lives = lives
+        self.score = score
+        self.state = "playing"
+        self.frame = 0
+        self.load_level(level_idx)
+
+    def load_level(self, level_idx):
+        self.level_idx = level_idx
+        if self.loader is not None:
+            self.level = self.loader.take(level_idx)
+            if level_idx + 1 < MAX_LEVELS:
+                self.loader.prefetch(level_idx + 1)
+        else:
+            self.level = Level(level_idx, self.seed)
+        self.player = Player(self.level.spawn_rect.x, self.level.spawn_rect.y)
+
+    def restart_level(self):
+        if self.level.index != self.level_idx:
+            self.load_level(self.level_idx)
+            return
+        self.level.reset()
+        self.player = Player(self.level.spawn_rect.x, self.level.spawn_rect.y)
+
+    def camera_x(self, centerx=None):
+        """Scroll that centres the player, or a given x, clamped to the level."""
+        if centerx is None:
+            centerx = self.player.rect.centerx
+        return clamp(centerx - SCREEN_WIDTH // 2, 0, max(0, self.level.pixel_w - SCREEN_WIDTH))
+
+    def _lose_life(self):
+        self.lives -= 1
+        if self.lives <= 0:
+            self.state = "gameover"
+        else:
+            self.restart_level()
+
+    def step(self, inputs):
+        self.frame += 1
+        if inputs & INPUT_RESTART:
+            self.restart_level()
+        if self.state != "playing":
+            return
+
+        self.player.update(inputs, self.level)
+        self.timer.lap("player")
+        self.level.enemies.activate(self.camera_x())
+        self.level.enemies.update(self.level)
+        self.timer.lap("enemies")
+
+        player = self.player
+        enemies = self.level.enemies
+        # Touches resolve in enemy order: after a stomp the player is moving
+        # up, so a second Goomba touched in the same frame still hurts.
+        hurt_by = None
+        for i in enemies.touching(player.rect):
+            from_above = player.vely > 0 and (player.rect.bottom - enemies.y.item(i)) < 12
+            if from_above:
+                enemies.squash_at(i)
+                player.vely = -player.jump_speed * 0.6
+                self.score += 100
+            else:
+                hurt_by = i
+                self._lose_life()
+                break
+        enemies.remove_expired(hurt_by)
+
+        if self.player.rect.top > self.level.pixel_h + 200:
+            self._lose_life()
+
+        if self.player.rect.colliderect(self.level.goal_rect):
+            self.score += 500
+            self.level_idx += 1
+            if self.level_idx >= MAX_LEVELS:
+                self.state = "allclear"
+            else:
+                self.load_level(self.level_idx)
+        self.timer.lap("collision")
+
+    def run(self, inputs, observer=None):
+        """Step once per input bitmask in `inputs`, calling observer(self) after each step."""
+        for mask in inputs:
+            self.step(mask)
+            if observer is not None:
+                observer(self)
+
+    def state_hash(self):
+        """Cheap CRC32 over the player, enemy and scoring state."""
+        p = self.player
+        h = zlib.crc32(struct.pack("<IiiBiiddB", self.frame, self.level_idx, self.score, self.lives,
+                                   p.rect.x, p.rect.y, p.velx, p.vely, p.on_ground))
+        return zlib.crc32(self.level.enemies.records().tobytes(), h)
+
+# ---------- Record / Replay ----------
+REPLAY_MAGIC = b"SMB1"
+# Bumped whenever the simulation changes what a run hashes to, so old recordings
+# are rejected on load instead of failing verification.
+REPLAY_VERSION = 2
+# magic, version, start level, lives, seed, frames, hash interval, compressed input length
+REPLAY_HEADER = struct.Struct("<4sHHHIIHI")
+
+class Recorder:
+    """Captures per-frame input bitmasks plus periodic state hashes of a Simulation.
+
+    Call record(mask) in place of sim.step(mask). The file holds a fixed header,
+    the zlib-compressed mask stream (one byte per frame) and one uint32 hash
+    every hash_interval frames.
+    """
+    def __init__(self, sim, hash_interval=60):
+        self.sim = sim
+        self.start_level = sim.level_idx
+        self.lives = sim.lives
+        self.seed = sim.seed
+        self.hash_interval = hash_interval
+        self.masks = bytearray()
+        self.hashes = array.array("I")
+
+    def record(self, mask):
+        self.sim.step(mask)
+        self.masks.append(mask)
+        if len(self.masks) % self.hash_interval == 0:
+            self.hashes.append(self.sim.state_hash())
+
+    def save(self, path):
+        packed = zlib.compress(bytes(self.masks), 9)
+        hashes = self.hashes.tobytes() if sys.byteorder == "little" else self._swapped(self.hashes)
+        with open(path, "wb") as f:
+            f.write(REPLAY_HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, self.start_level, self.lives,
+                                       self.seed, len(self.masks), self.hash_interval, len(packed)))
+            f.write(packed)
+            f.write(hashes)
+
+    @staticmethod
+    def _swapped(values):
+        values = array.array("I", values)
+        values.byteswap()
+        return values.tobytes()
+
+class Replay:
+    """A loaded recording that can be re-simulated headlessly at full speed."""
+    def __init__(self, start_level, lives, seed, masks, hash_interval, hashes):
+        self.start_level = start_level
+        self.lives = lives
+        self.seed = seed
+        self.masks = masks
+        self.hash_interval = hash_interval
+        self.hashes = hashes
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, version, start_level, lives, seed, frames, interval, packed_len = \
+            REPLAY_HEADER.unpack_from(data)
+        if magic != REPLAY_MAGIC or version != REPLAY_VERSION:
+            raise ValueError(f"{path}: not a version {REPLAY_VERSION} smb1 recording")
+        offset = REPLAY_HEADER.size
+        masks = zlib.decompress(data[offset:offset + packed_len])
+        if len(masks) != frames:
+            raise ValueError(f"{path}: expected {frames} frames, found {len(masks)}")
+        hashes = array.array("I", data[offset + packed_len:])
+        if sys.byteorder != "little":
+            hashes.byteswap()
+        return cls(start_level, lives, seed, masks, interval, hashes)
+
+    def simulation(self):
+        return Simulation(self.start_level, lives=self.lives, seed=self.seed)
+
+    def verify(self):
+        """Re-run the inputs and compare state hashes.
+
+        Returns None when every checkpoint matches, otherwise the first
+        checkpoint frame whose hash differs; the divergence happened after
+        the previous checkpoint (frame - hash_interval).
+        """
+        sim = self.simulation()
+        interval = self.hash_interval
+        for i, mask in enumerate(self.masks, 1):
+            sim.step(mask)
+            if i % interval == 0 and sim.state_hash() != self.hashes[i // interval - 1]:
+                return i
+        return None
+
+# ---------- Rendering ----------
+class Renderer:
+    """Draws a Simulation; the simulation itself never needs one.
+
+    Call capture(sim) before each step; draw(sim, alpha) then blends the
+    player, camera and Goombas between the last two steps. With low_detail
+    the level is drawn from flat-colour chunks.
+    """
+    def __init__(self, surf, timer=NULL_TIMER):
+        self.surf = surf
+        self.timer = timer
+        self.interpolator = Interpolator()
+
+    def capture(self, sim):
+        self.interpolator.capture((sim.player,))
+        sim.level.enemies.capture()
+
+    def draw(self, sim, alpha=1.0, low_detail=False):
+        surf = self.surf
+        level = sim.level
+        player_pos = self.interpolator.position(sim.player, alpha)
+        camx = sim.camera_x(player_pos[0] + sim.player.rect.w // 2)
+
+        # Level.draw paints every pixel, sky included
+        level.draw(surf, camx, low_detail)
+        self.timer.lap("level_draw")
+        level.enemies.draw(surf, camx, alpha)
+        sim.player.draw(surf, camx, player_pos)
+        self.timer.lap("sprite_draw")
+
+        ui_bar = pygame.Rect(0, 0, SCREEN_WIDTH, 32)
+        pygame.draw.rect(surf, (0, 0, 0, 180), ui_bar)
+        pygame.draw.rect(surf, BLACK, ui_bar, 1)
+        txt = f"Level {min(sim.level_idx+1, MAX_LEVELS)}/{MAX_LEVELS}   Lives: {sim.lives}   Score: {sim.score}"
+        surf.blit(TEXT.render(txt, 26, WHITE), (10, 8))
+
+        if sim.state == "gameover":
+            overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+            overlay.fill((0, 0, 0, 180))
+            surf.blit(overlay, (0, 0))
+            game_over = TEXT.render("GAME OVER", 64, RED)
+            prompt = TEXT.render("Press R to retry the current level", 26, WHITE)
+            surf.blit(game_over, game_over.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 - 20)))
+            surf.blit(prompt, prompt.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 40)))
+
+        if sim.state == "allclear":
+            overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+            overlay.fill((0, 0, 0, 180))
+            surf.blit(overlay, (0, 0))
+            congrats = TEXT.render("ALL 32 LEVELS CLEARED!", 64, GREEN)
+            surf.blit(congrats, congrats.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2)))
+        self.timer.lap("hud")
+
 # ---------- Game loop ----------
-def main():
+def enable_tracing(path):
+    """Trace frames, phases, level loads and the per-entity hot paths to path."""
+    tracer = Tracer(path)
+    tracer.instrument(Player, "update")
+    tracer.instrument(Goombas, "activate", "update")
+    tracer.instrument(Level, "__init__", "reset", "draw")
+    return tracer
+
+def main(record_path=None, trace_path=None, render_fps=FPS):
+    pygame.init()
+    pygame.display.set_caption("32-Level Platformer — NES Style")
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
     clock = pygame.time.Clock()
-    random.seed(0)
 
-    level_idx = 0
-    level = Level(level_idx)
-    player = Player(level.spawn_rect.x, level.spawn_rect.y)
-    lives = 3
-    score = 0
-    state = "playing"
+    tracer = enable_tracing(trace_path) if trace_path else None
+    timer = FrameTimer(tracer=tracer)
+    sim = Simulation(0, prefetch=True, timer=timer)
+    loop = FixedStepLoop(FPS)
+    governor = LoadGovernor(timer, budget=1 / (render_fps or FPS))
+    overlay = PerfOverlay(timer, status=lambda: "\n".join((
+        loop.summary(), governor.summary(), sim.loader.stats.summary(),
+        sim.level.enemies.window.summary())))
+    renderer = Renderer(screen, timer)
+    recorder = Recorder(sim) if record_path else None
+    step = recorder.record if recorder else sim.step
 
-    while True:
-        dt = clock.tick(FPS) / 1000.0
+    running = True
+    restart = 0
+    while running:
+        clock.tick(render_fps)
+        timer.begin_frame()
 
         for event in pygame.event.get():
+            if overlay.handle_event(event):
+                continue
             if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
+                running = False
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
-                    pygame.quit()
-                    sys.exit()
+                    running = False
                 if event.key == pygame.K_r:
-                    level = Level(level_idx)
-                    player = Player(level.spawn_rect.x, level.spawn_rect.y)
-
-        keys = pygame.key.get_pressed()
-
-        if state == "playing":
-            player.update(keys, level)
-            for e in level.enemies:
-                e.update(level)
-
-            for e in list(level.enemies):
-                if not e.alive:
-                    if e.squash_timer <= 0:
-                        level.enemies.remove(e)
-                    continue
-                if player.rect.colliderect(e.rect):
-                    from_above = player.vely > 0 and (player.rect.bottom - e.rect.top) < 12
-                    if from_above:
-                        e.alive = False
-                        e.squash_timer = 30
-                        player.vely = -player.jump_speed * 0.6
-                        score += 100
-                    else:
-                        lives -= 1
-                        if lives <= 0:
-                            state = "gameover"
-                        else:
-                            level = Level(level_idx)
-                            player = Player(level.spawn_rect.x, level.spawn_rect.y)
-                        break
-
-            if player.rect.top > level.pixel_h + 200:
-                lives -= 1
-                if lives <= 0:
-                    state = "gameover"
-                else:
-                    level = Level(level_idx)
-                    player = Player(level.spawn_rect.x, level.spawn_rect.y)
-
-            if player.rect.colliderect(level.goal_rect):
-                score += 500
-                level_idx += 1
-                if level_idx >= MAX_LEVELS:
-                    state = "allclear"
-                else:
-                    level = Level(level_idx)
-                    player = Player(level.spawn_rect.x, level.spawn_rect.y)
-
-        camx = clamp(player.rect.centerx - SCREEN_WIDTH // 2, 0, max(0, level.pixel_w - SCREEN_WIDTH))
-
-        screen.fill(SKY)
-        level.draw(screen, camx)
-        for e in level.enemies:
-            e.draw(screen, camx)
-        player.draw(screen, camx)
+                    restart = INPUT_RESTART
+        if not running:
+            break
+        timer.lap("events")
 
-        ui_bar = pygame.Rect(0, 0, SCREEN_WIDTH, 32)
-        pygame.draw.rect(screen, (0, 0, 0, 180), ui_bar)
-        pygame.draw.rect(screen, BLACK, ui_bar, 1)
-        txt = f"Level {min(level_idx+1, MAX_LEVELS)}/{MAX_LEVELS}   Lives: {lives}   Score: {score}"
-        screen.blit(FONT.render(txt, True, WHITE), (10, 8))
+        # The simulation runs at FPS whatever the render rate; a restart
+        # press waits for the next step if this frame runs none.
+        held = keys_to_input(pygame.key.get_pressed())
+        for _ in range(loop.advance()):
+            renderer.capture(sim)
+            step(held | restart)
+            restart = 0
+        # Under load the governor drops detail, then whole frames; steps still run.
+        if governor.render_this_frame():
+            renderer.draw(sim, loop.alpha, governor.low_detail)
+            overlay.draw(screen)
+            timer.lap("hud")
+            pygame.display.flip()
+            timer.lap("flip")
+        timer.end_frame()
+        governor.update()
 
-        if state == "gameover":
-            overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 180))
-            screen.blit(overlay, (0, 0))
-            game_over = BIG_FONT.render("GAME OVER", True, RED)
-            prompt = FONT.render("Press R to retry the current level", True, WHITE)
-            screen.blit(game_over, game_over.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 - 20)))
-            screen.blit(prompt, prompt.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 40)))
-
-        if state == "allclear":
-            overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 180))
-            screen.blit(overlay, (0, 0))
-            congrats = BIG_FONT.render("ALL 32 LEVELS CLEARED!", True, GREEN)
-            screen.blit(congrats, congrats.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2)))
+    if recorder:
+        recorder.save(record_path)
+    sim.loader.close()
+    if tracer:
+        tracer.close()
+    pygame.quit()
+    sys.exit()
 
-        pygame.display.flip()
+def verify_replay(path):
+    replay = Replay.load(path)
+    diverged = replay.verify()
+    if diverged is None:
+        print(f"{path}: {len(replay.masks)} frames, all {len(replay.hashes)} checkpoints match")
+        return 0
+    print(f"{path}: diverged at frame {diverged} (last match at frame {diverged - replay.hash_interval})")
+    return 1
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="32-level NES-style platformer")
+    parser.add_argument("--record", metavar="FILE", help="record inputs and state hashes to FILE")
+    parser.add_argument("--replay", metavar="FILE", help="re-simulate FILE headlessly and report divergence")
+    parser.add_argument("--trace", metavar="FILE", help="write a Chrome trace of every frame to FILE")
+    parser.add_argument("--render-fps", type=int, default=FPS, metavar="N",
+                        help=f"render frame cap; the simulation always steps at {FPS} Hz (0 = uncapped)")
+    args = parser.parse_args()
+    if args.replay:
+        sys.exit(verify_replay(args.replay))
+    main(args.record, args.trace, args.render_fps)
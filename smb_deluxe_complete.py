@@ -1,497 +1,39 @@
+import argparse
+import itertools
+import os
 import pygame
 import sys
 
+from activation import ActivationWindow
+from gameloop import FixedStepLoop, Interpolator
+from levelloader import LevelLoader
+from levelpack import LevelPack, compile_levels, write_pack
+from perf import FrameTimer, LoadGovernor, PerfOverlay, Tracer
+from textcache import TEXT
+
 # ============================================================================
-# LEVEL DATA - 32 Levels for Super Mario Bros Deluxe
+# LEVEL DATA - compiled from deluxe_levels.py
 # ============================================================================
 
-# Format: (x, y, width, height, color_optional)
-# Platforms, Goals: (x, y)
-# Enemies: (x, y, size, speed)
-
-LEVELS = [
-    # WORLD 1 - Tutorial Levels
-    {
-        'name': 'Level 1-1: First Steps',
-        'start': (50, 400),
-        'platforms': [
-            (0, 560, 800, 40, (0, 200, 0)),  # Ground
-            (200, 480, 150, 20, (139, 69, 19)),  # Platform
-            (450, 400, 150, 20, (139, 69, 19)),
-        ],
-        'goal': (720, 490),
-        'enemies': []
-    },
-    {
-        'name': 'Level 1-2: Jump Training',
-        'start': (50, 400),
-        'platforms': [
-            (0, 560, 200, 40, (0, 200, 0)),
-            (250, 560, 200, 40, (0, 200, 0)),
-            (500, 560, 300, 40, (0, 200, 0)),
-            (300, 450, 100, 20, (139, 69, 19)),
-        ],
-        'goal': (750, 490),
-        'enemies': []
-    },
-    {
-        'name': 'Level 1-3: First Enemy',
-        'start': (50, 400),
-        'platforms': [
-            (0, 560, 800, 40, (0, 200, 0)),
-            (300, 480, 200, 20, (139, 69, 19)),
-        ],
-        'goal': (720, 490),
-        'enemies': [(400, 440, 30, 2)]
-    },
-    {
-        'name': 'Level 1-4: Stairway',
-        'start': (50, 400),
-        'platforms': [
-            (0, 560, 200, 40, (0, 200, 0)),
-            (150, 500, 100, 20, (139, 69, 19)),
-            (250, 440, 100, 20, (139, 69, 19)),
-            (350, 380, 100, 20, (139, 69, 19)),
-            (450, 320, 100, 20, (139, 69, 19)),
-            (550, 380, 100, 20, (139, 69, 19)),
-            (650, 440, 150, 20, (139, 69, 19)),
-        ],
-        'goal': (750, 370),
-        'enemies': []
-    },
-    
-    # WORLD 2 - Basic Challenges
-    {
-        'name': 'Level 2-1: Gap Jumps',
-        'start': (50, 400),
-        'platforms': [
-            (0, 560, 150, 40, (0, 200, 0)),
-            (250, 560, 150, 40, (0, 200, 0)),
-            (500, 560, 150, 40, (0, 200, 0)),
-            (700, 560, 100, 40, (0, 200, 0)),
-        ],
-        'goal': (730, 490),
-        'enemies': [(300, 520, 30, 2)]
-    },
-    {
-        'name': 'Level 2-2: Platform Hopping',
-        'start': (50, 400),
-        'platforms': [
-            (0, 560, 800, 40, (0, 200, 0)),
-            (150, 450, 80, 20, (139, 69, 19)),
-            (300, 380, 80, 20, (139, 69, 19)),
-            (450, 310, 80, 20, (139, 69, 19)),
-            (600, 380, 80, 20, (139, 69, 19)),
-        ],
-        'goal': (650, 310),
-        'enemies': [(200, 520, 30, 2), (500, 520, 30, 2)]
-    },
-    {
-        'name': 'Level 2-3: Enemy Patrol',
-        'start': (50, 400),
-        'platforms': [
-            (0, 560, 800, 40, (0, 200, 0)),
-            (200, 460, 400, 20, (139, 69, 19)),
-        ],
-        'goal': (520, 390),
-        'enemies': [(250, 420, 30, 3), (450, 420, 30, 2)]
-    },
-    {
-        'name': 'Level 2-4: Vertical Challenge',
-        'start': (50, 500),
-        'platforms': [
-            (0, 560, 150, 40, (0, 200, 0)),
-            (100, 480, 100, 20, (139, 69, 19)),
-            (250, 400, 100, 20, (139, 69, 19)),
-            (150, 320, 100, 20, (139, 69, 19)),
-            (300, 240, 100, 20, (139, 69, 19)),
-            (450, 240, 200, 20, (139, 69, 19)),
-        ],
-        'goal': (600, 170),
-        'enemies': [(350, 200, 30, 2)]
-    },
-    
-    # WORLD 3 - Intermediate
-    {
-        'name': 'Level 3-1: The Gauntlet',
-        'start': (50, 400),
-        'platforms': [
-            (0, 560, 800, 40, (0, 200, 0)),
-            (200, 450, 100, 20, (139, 69, 19)),
-            (400, 450, 100, 20, (139, 69, 19)),
-            (600, 450, 100, 20, (139, 69, 19)),
-        ],
-        'goal': (650, 380),
-        'enemies': [(250, 410, 30, 2), (450, 410, 30, 3), (650, 410, 30, 2)]
-    },
-    {
-        'name': 'Level 3-2: Precision Jumps',
-        'start': (50, 400),
-        'platforms': [
-            (0, 560, 120, 40, (0, 200, 0)),
-            (200, 500, 60, 20, (139, 69, 19)),
-            (340, 440, 60, 20, (139, 69, 19)),
-            (480, 380, 60, 20, (139, 69, 19)),
-            (620, 440, 60, 20, (139, 69, 19)),
-            (740, 500, 60, 20, (139, 69, 19)),
-        ],
-        'goal': (770, 430),
-        'enemies': []
-    },
-    {
-        'name': 'Level 3-3: Enemy Swarm',
-        'start': (50, 400),
-        'platforms': [
-            (0, 560, 800, 40, (0, 200, 0)),
-            (300, 420, 200, 20, (139, 69, 19)),
-        ],
-        'goal': (720, 490),
-        'enemies': [(200, 520, 30, 2), (350, 380, 30, 3), 
-                   (500, 520, 30, 2), (600, 520, 30, 3)]
-    },
-    {
-        'name': 'Level 3-4: Up and Down',
-        'start': (50, 500),
-        'platforms': [
-            (0, 560, 100, 40, (0, 200, 0)),
-            (120, 480, 80, 20, (139, 69, 19)),
-            (220, 400, 80, 20, (139, 69, 19)),
-            (320, 320, 80, 20, (139, 69, 19)),
-            (420, 400, 80, 20, (139, 69, 19)),
-            (520, 480, 80, 20, (139, 69, 19)),
-            (620, 560, 180, 40, (0, 200, 0)),
-        ],
-        'goal': (720, 490),
-        'enemies': [(270, 360, 30, 2), (470, 440, 30, 2)]
-    },
-    
-    # WORLD 4 - Advanced
-    {
-        'name': 'Level 4-1: Speed Run',
-        'start': (50, 400),
-        'platforms': [
-            (0, 560, 150, 40, (0, 200, 0)),
-            (200, 560, 100, 40, (0, 200, 0)),
-            (350, 560, 100, 40, (0, 200, 0)),
-            (500, 560, 100, 40, (0, 200, 0)),
-            (650, 560, 150, 40, (0, 200, 0)),
-        ],
-        'goal': (730, 490),
-        'enemies': [(250, 520, 30, 4), (400, 520, 30, 4), (550, 520, 30, 4)]
-    },
-    {
-        'name': 'Level 4-2: Sky Platforms',
-        'start': (50, 500),
-        'platforms': [
-            (0, 560, 100, 40, (0, 200, 0)),
-            (150, 450, 80, 20, (139, 69, 19)),
-            (280, 360, 80, 20, (139, 69, 19)),
-            (410, 270, 80, 20, (139, 69, 19)),
-            (540, 270, 80, 20, (139, 69, 19)),
-            (670, 360, 130, 20, (139, 69, 19)),
-        ],
-        'goal': (730, 290),
-        'enemies': [(200, 410, 30, 2), (330, 320, 30, 2)]
-    },
-    {
-        'name': 'Level 4-3: Danger Zone',
-        'start': (50, 400),
-        'platforms': [
-            (0, 560, 800, 40, (0, 200, 0)),
-            (150, 440, 120, 20, (139, 69, 19)),
-            (350, 440, 120, 20, (139, 69, 19)),
-            (550, 440, 120, 20, (139, 69, 19)),
-        ],
-        'goal': (620, 370),
-        'enemies': [(200, 400, 30, 3), (400, 400, 30, 3), 
-                   (300, 520, 30, 2), (500, 520, 30, 2), (600, 400, 30, 3)]
-    },
-    {
-        'name': 'Level 4-4: Castle Stairs',
-        'start': (50, 500),
-        'platforms': [
-            (0, 560, 100, 40, (0, 200, 0)),
-            (80, 500, 60, 20, (100, 100, 100)),
-            (140, 440, 60, 20, (100, 100, 100)),
-            (200, 380, 60, 20, (100, 100, 100)),
-            (260, 320, 60, 20, (100, 100, 100)),
-            (320, 260, 60, 20, (100, 100, 100)),
-            (380, 200, 60, 20, (100, 100, 100)),
-            (440, 200, 360, 20, (100, 100, 100)),
-        ],
-        'goal': (750, 130),
-        'enemies': [(190, 340, 30, 2), (310, 220, 30, 2), (550, 160, 30, 3)]
-    },
-    
-    # WORLD 5 - Expert
-    {
-        'name': 'Level 5-1: Maze Runner',
-        'start': (50, 500),
-        'platforms': [
-            (0, 560, 200, 40, (0, 200, 0)),
-            (250, 480, 100, 80, (139, 69, 19)),
-            (250, 380, 100, 20, (139, 69, 19)),
-            (400, 480, 100, 80, (139, 69, 19)),
-            (550, 380, 100, 180, (139, 69, 19)),
-            (700, 480, 100, 80, (139, 69, 19)),
-        ],
-        'goal': (730, 410),
-        'enemies': [(300, 340, 30, 2), (450, 440, 30, 2)]
-    },
-    {
-        'name': 'Level 5-2: Floating Islands',
-        'start': (50, 500),
-        'platforms': [
-            (0, 560, 80, 40, (0, 200, 0)),
-            (140, 480, 70, 15, (139, 69, 19)),
-            (250, 400, 70, 15, (139, 69, 19)),
-            (360, 320, 70, 15, (139, 69, 19)),
-            (470, 320, 70, 15, (139, 69, 19)),
-            (580, 400, 70, 15, (139, 69, 19)),
-            (690, 480, 110, 15, (139, 69, 19)),
-        ],
-        'goal': (740, 410),
-        'enemies': [(300, 360, 30, 2), (520, 360, 30, 2)]
-    },
-    {
-        'name': 'Level 5-3: Narrow Escape',
-        'start': (50, 400),
-        'platforms': [
-            (0, 560, 800, 40, (0, 200, 0)),
-            (200, 460, 50, 20, (139, 69, 19)),
-            (300, 460, 50, 20, (139, 69, 19)),
-            (400, 460, 50, 20, (139, 69, 19)),
-            (500, 460, 50, 20, (139, 69, 19)),
-            (600, 460, 50, 20, (139, 69, 19)),
-        ],
-        'goal': (630, 390),
-        'enemies': [(240, 420, 30, 3), (340, 420, 30, 3), 
-                   (440, 420, 30, 3), (540, 420, 30, 3)]
-    },
-    {
-        'name': 'Level 5-4: Tower Climb',
-        'start': (50, 520),
-        'platforms': [
-            (0, 560, 100, 40, (0, 200, 0)),
-            (120, 490, 70, 15, (139, 69, 19)),
-            (70, 420, 70, 15, (139, 69, 19)),
-            (140, 350, 70, 15, (139, 69, 19)),
-            (70, 280, 70, 15, (139, 69, 19)),
-            (140, 210, 70, 15, (139, 69, 19)),
-            (70, 140, 130, 15, (139, 69, 19)),
-            (250, 140, 550, 15, (139, 69, 19)),
-        ],
-        'goal': (750, 70),
-        'enemies': [(120, 310, 30, 2), (120, 170, 30, 2), (400, 100, 30, 3)]
-    },
-    
-    # WORLD 6 - Master
-    {
-        'name': 'Level 6-1: Death From Above',
-        'start': (50, 500),
-        'platforms': [
-            (0, 560, 100, 40, (0, 200, 0)),
-            (150, 500, 60, 15, (139, 69, 19)),
-            (250, 440, 60, 15, (139, 69, 19)),
-            (350, 380, 60, 15, (139, 69, 19)),
-            (450, 320, 60, 15, (139, 69, 19)),
-            (550, 260, 60, 15, (139, 69, 19)),
-            (650, 200, 150, 15, (139, 69, 19)),
-        ],
-        'goal': (750, 130),
-        'enemies': [(200, 460, 30, 2), (300, 400, 30, 2), 
-                   (400, 340, 30, 2), (500, 280, 30, 2), (600, 220, 30, 2)]
-    },
-    {
-        'name': 'Level 6-2: Platform Hell',
-        'start': (50, 500),
-        'platforms': [
-            (0, 560, 70, 40, (0, 200, 0)),
-            (120, 480, 50, 15, (139, 69, 19)),
-            (220, 400, 50, 15, (139, 69, 19)),
-            (320, 320, 50, 15, (139, 69, 19)),
-            (420, 400, 50, 15, (139, 69, 19)),
-            (520, 480, 50, 15, (139, 69, 19)),
-            (620, 400, 50, 15, (139, 69, 19)),
-            (720, 480, 80, 15, (139, 69, 19)),
-        ],
-        'goal': (750, 410),
-        'enemies': [(270, 360, 30, 2), (370, 440, 30, 2), (470, 520, 30, 3)]
-    },
-    {
-        'name': 'Level 6-3: The Grinder',
-        'start': (50, 400),
-        'platforms': [
-            (0, 560, 800, 40, (0, 200, 0)),
-            (100, 450, 80, 20, (139, 69, 19)),
-            (250, 450, 80, 20, (139, 69, 19)),
-            (400, 450, 80, 20, (139, 69, 19)),
-            (550, 450, 80, 20, (139, 69, 19)),
-            (700, 450, 100, 20, (139, 69, 19)),
-        ],
-        'goal': (750, 380),
-        'enemies': [(140, 410, 30, 4), (290, 410, 30, 4), 
-                   (440, 410, 30, 4), (590, 410, 30, 4)]
-    },
-    {
-        'name': 'Level 6-4: Final Castle',
-        'start': (50, 500),
-        'platforms': [
-            (0, 560, 80, 40, (100, 100, 100)),
-            (100, 500, 60, 15, (100, 100, 100)),
-            (180, 440, 60, 15, (100, 100, 100)),
-            (260, 380, 60, 15, (100, 100, 100)),
-            (340, 320, 60, 15, (100, 100, 100)),
-            (420, 260, 60, 15, (100, 100, 100)),
-            (500, 320, 60, 15, (100, 100, 100)),
-            (580, 380, 60, 15, (100, 100, 100)),
-            (660, 320, 140, 15, (100, 100, 100)),
-        ],
-        'goal': (760, 250),
-        'enemies': [(130, 460, 30, 2), (210, 400, 30, 2), (290, 340, 30, 3),
-                   (370, 280, 30, 2), (530, 340, 30, 3), (610, 400, 30, 2)]
-    },
-    
-    # WORLD 7 - Insane
-    {
-        'name': 'Level 7-1: No Ground',
-        'start': (50, 450),
-        'platforms': [
-            (0, 500, 80, 15, (139, 69, 19)),
-            (120, 420, 60, 15, (139, 69, 19)),
-            (220, 360, 60, 15, (139, 69, 19)),
-            (320, 300, 60, 15, (139, 69, 19)),
-            (420, 360, 60, 15, (139, 69, 19)),
-            (520, 420, 60, 15, (139, 69, 19)),
-            (620, 360, 60, 15, (139, 69, 19)),
-            (720, 300, 80, 15, (139, 69, 19)),
-        ],
-        'goal': (760, 230),
-        'enemies': [(170, 380, 30, 2), (370, 320, 30, 2), (570, 380, 30, 2)]
-    },
-    {
-        'name': 'Level 7-2: Bullet Hell',
-        'start': (50, 400),
-        'platforms': [
-            (0, 560, 800, 40, (0, 200, 0)),
-        ],
-        'goal': (750, 490),
-        'enemies': [(150, 520, 30, 5), (250, 520, 30, 5), (350, 520, 30, 5),
-                   (450, 520, 30, 5), (550, 520, 30, 5), (650, 520, 30, 5)]
-    },
-    {
-        'name': 'Level 7-3: Spiral Ascent',
-        'start': (50, 520),
-        'platforms': [
-            (0, 560, 100, 40, (0, 200, 0)),
-            (120, 490, 60, 15, (139, 69, 19)),
-            (200, 420, 60, 15, (139, 69, 19)),
-            (280, 350, 60, 15, (139, 69, 19)),
-            (360, 280, 60, 15, (139, 69, 19)),
-            (440, 210, 60, 15, (139, 69, 19)),
-            (520, 140, 60, 15, (139, 69, 19)),
-            (440, 140, 60, 15, (139, 69, 19)),
-            (360, 140, 60, 15, (139, 69, 19)),
-            (280, 140, 60, 15, (139, 69, 19)),
-            (280, 70, 520, 15, (139, 69, 19)),
-        ],
-        'goal': (760, 0),
-        'enemies': [(170, 450, 30, 2), (250, 380, 30, 2), (330, 310, 30, 2),
-                   (410, 240, 30, 2), (490, 170, 30, 2)]
-    },
-    {
-        'name': 'Level 7-4: The Gauntlet Supreme',
-        'start': (50, 500),
-        'platforms': [
-            (0, 560, 70, 40, (100, 100, 100)),
-            (100, 490, 50, 15, (100, 100, 100)),
-            (180, 420, 50, 15, (100, 100, 100)),
-            (260, 350, 50, 15, (100, 100, 100)),
-            (340, 280, 50, 15, (100, 100, 100)),
-            (420, 350, 50, 15, (100, 100, 100)),
-            (500, 420, 50, 15, (100, 100, 100)),
-            (580, 350, 50, 15, (100, 100, 100)),
-            (660, 280, 140, 15, (100, 100, 100)),
-        ],
-        'goal': (760, 210),
-        'enemies': [(130, 450, 30, 3), (210, 380, 30, 3), (290, 310, 30, 4),
-                   (370, 380, 30, 3), (450, 450, 30, 3), (530, 380, 30, 4)]
-    },
-    
-    # WORLD 8 - Impossible
-    {
-        'name': 'Level 8-1: Nightmare',
-        'start': (50, 480),
-        'platforms': [
-            (0, 530, 60, 15, (139, 69, 19)),
-            (100, 460, 50, 15, (139, 69, 19)),
-            (190, 390, 50, 15, (139, 69, 19)),
-            (280, 320, 50, 15, (139, 69, 19)),
-            (370, 250, 50, 15, (139, 69, 19)),
-            (460, 320, 50, 15, (139, 69, 19)),
-            (550, 390, 50, 15, (139, 69, 19)),
-            (640, 460, 50, 15, (139, 69, 19)),
-            (730, 390, 70, 15, (139, 69, 19)),
-        ],
-        'goal': (760, 320),
-        'enemies': [(140, 420, 30, 3), (230, 350, 30, 3), (320, 280, 30, 4),
-                   (410, 350, 30, 3), (500, 420, 30, 3), (590, 490, 30, 3)]
-    },
-    {
-        'name': 'Level 8-2: The Void',
-        'start': (50, 450),
-        'platforms': [
-            (0, 500, 70, 15, (139, 69, 19)),
-            (120, 430, 55, 15, (139, 69, 19)),
-            (225, 360, 55, 15, (139, 69, 19)),
-            (330, 290, 55, 15, (139, 69, 19)),
-            (435, 220, 55, 15, (139, 69, 19)),
-            (540, 290, 55, 15, (139, 69, 19)),
-            (645, 360, 55, 15, (139, 69, 19)),
-            (745, 290, 55, 15, (139, 69, 19)),
-        ],
-        'goal': (770, 220),
-        'enemies': [(165, 390, 30, 2), (270, 320, 30, 3), (375, 250, 30, 4),
-                   (480, 180, 30, 3), (585, 250, 30, 3), (690, 320, 30, 2)]
-    },
-    {
-        'name': 'Level 8-3: Perfect Timing',
-        'start': (50, 500),
-        'platforms': [
-            (0, 550, 60, 15, (139, 69, 19)),
-            (110, 480, 45, 15, (139, 69, 19)),
-            (205, 410, 45, 15, (139, 69, 19)),
-            (300, 340, 45, 15, (139, 69, 19)),
-            (395, 270, 45, 15, (139, 69, 19)),
-            (490, 200, 45, 15, (139, 69, 19)),
-            (585, 270, 45, 15, (139, 69, 19)),
-            (680, 340, 120, 15, (139, 69, 19)),
-        ],
-        'goal': (760, 270),
-        'enemies': [(140, 440, 30, 4), (235, 370, 30, 4), (330, 300, 30, 5),
-                   (425, 230, 30, 4), (520, 160, 30, 4), (615, 230, 30, 4)]
-    },
-    {
-        'name': 'Level 8-4: The Final Challenge',
-        'start': (50, 520),
-        'platforms': [
-            (0, 560, 60, 40, (255, 0, 0)),
-            (90, 500, 45, 15, (100, 100, 100)),
-            (165, 440, 45, 15, (100, 100, 100)),
-            (240, 380, 45, 15, (100, 100, 100)),
-            (315, 320, 45, 15, (100, 100, 100)),
-            (390, 260, 45, 15, (100, 100, 100)),
-            (465, 200, 45, 15, (100, 100, 100)),
-            (540, 260, 45, 15, (100, 100, 100)),
-            (615, 320, 45, 15, (100, 100, 100)),
-            (690, 260, 110, 15, (100, 100, 100)),
-        ],
-        'goal': (760, 190),
-        'enemies': [(120, 460, 30, 4), (195, 400, 30, 4), (270, 340, 30, 5),
-                   (345, 280, 30, 5), (420, 220, 30, 5), (495, 160, 30, 4),
-                   (570, 220, 30, 5), (645, 280, 30, 4)]
-    },
-]
+LEVEL_SOURCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "deluxe_levels.py")
+LEVEL_PACK = os.path.splitext(LEVEL_SOURCE)[0] + ".pack"
+
+def load_level_pack():
+    """Map the compiled level pack, recompiling it first if the source is newer."""
+    try:
+        stale = os.path.getmtime(LEVEL_PACK) < os.path.getmtime(LEVEL_SOURCE)
+    except FileNotFoundError:
+        stale = not os.path.exists(LEVEL_PACK)
+    if stale:
+        from deluxe_levels import LEVELS as source
+        try:
+            write_pack(source, LEVEL_PACK)
+        except OSError:
+            return LevelPack(compile_levels(source))
+    return LevelPack.open(LEVEL_PACK)
+
+# Decodes one level dict per index on demand
+LEVELS = load_level_pack()
 
 # Overworld node positions (x, y) - creates a winding path
 OVERWORLD_NODES = [
@@ -542,6 +84,38 @@ STATE_LEVEL = 1
 STATE_GAME_OVER = 2
 STATE_VICTORY = 3
 
+def sweep_aabb(x, y, w, h, dx, dy, rect):
+    """Swept AABB test of a w x h box at (x, y) moving by (dx, dy) against rect.
+
+    Returns (t, axis) for the first contact, t being the fraction of the
+    move in [0, 1] and axis 'x' or 'y' the face that was hit, or None if
+    the box misses, only grazes a corner, or already overlaps rect.
+    """
+    if dx > 0:
+        x_entry = (rect.left - (x + w)) / dx
+        x_exit = (rect.right - x) / dx
+    elif dx < 0:
+        x_entry = (rect.right - x) / dx
+        x_exit = (rect.left - (x + w)) / dx
+    elif x + w <= rect.left or x >= rect.right:
+        return None
+    else:
+        x_entry, x_exit = float('-inf'), float('inf')
+    if dy > 0:
+        y_entry = (rect.top - (y + h)) / dy
+        y_exit = (rect.bottom - y) / dy
+    elif dy < 0:
+        y_entry = (rect.bottom - y) / dy
+        y_exit = (rect.top - (y + h)) / dy
+    elif y + h <= rect.top or y >= rect.bottom:
+        return None
+    else:
+        y_entry, y_exit = float('-inf'), float('inf')
+    entry = max(x_entry, y_entry)
+    if entry < 0 or entry > 1 or entry >= min(x_exit, y_exit):
+        return None
+    return entry, 'x' if x_entry > y_entry else 'y'
+
 class Player(pygame.sprite.Sprite):
     """The player character with fixed physics."""
     def __init__(self):
@@ -571,7 +145,7 @@ class Player(pygame.sprite.Sprite):
         self.rect.topleft = (x, y)
 
     def move(self):
-        """Handle horizontal movement."""
+        """Apply input, friction and gravity to the velocity."""
         self.acc = pygame.math.Vector2(0, self.GRAVITY)
         
         pressed_keys = pygame.key.get_pressed()
@@ -589,19 +163,6 @@ class Player(pygame.sprite.Sprite):
         # Limit horizontal speed
         if abs(self.vel.x) > self.MAX_SPEED:
             self.vel.x = self.MAX_SPEED if self.vel.x > 0 else -self.MAX_SPEED
-        
-        # Update horizontal position
-        self.pos.x += self.vel.x + 0.5 * self.acc.x
-        
-        # Keep player on screen horizontally
-        if self.pos.x < 0:
-            self.pos.x = 0
-            self.vel.x = 0
-        if self.pos.x > SCREEN_WIDTH - self.rect.width:
-            self.pos.x = SCREEN_WIDTH - self.rect.width
-            self.vel.x = 0
-            
-        self.rect.x = int(self.pos.x)
 
     def jump(self):
         """Jump if on ground."""
@@ -609,26 +170,80 @@ class Player(pygame.sprite.Sprite):
             self.vel.y = self.JUMP_STRENGTH
             self.on_ground = False
 
-    def update(self, platforms):
-        """Update vertical position and handle collisions."""
-        # Update vertical position
-        self.pos.y += self.vel.y + 0.5 * self.acc.y
-        self.rect.y = int(self.pos.y)
-        
-        # Check vertical collisions
+    def push_out(self, platform_rects):
+        """Move the box out of any platform it starts inside, by the shortest way."""
+        w, h = self.rect.size
+        box = pygame.Rect(int(self.pos.x), int(self.pos.y), w, h)
+        for i in box.collidelistall(platform_rects):
+            rect = platform_rects[i]
+            x, y = self.pos
+            if not (x < rect.right and x + w > rect.left and y < rect.bottom and y + h > rect.top):
+                continue
+            up, down = y + h - rect.top, rect.bottom - y
+            left, right = x + w - rect.left, rect.right - x
+            shortest = min(up, down, left, right)
+            if shortest == up:
+                self.pos.y = rect.top - h
+            elif shortest == down:
+                self.pos.y = rect.bottom
+            elif shortest == left:
+                self.pos.x = rect.left - w
+            else:
+                self.pos.x = rect.right
+
+    def update(self, platform_rects):
+        """Move by this frame's displacement, sweeping against the platforms.
+
+        The box stops at the earliest contact, the velocity into that face
+        is dropped, and the rest of the move slides along it. Nothing can
+        be skipped however far one step goes.
+        """
+        w, h = self.rect.size
+        self.push_out(platform_rects)
+        dx = self.vel.x + 0.5 * self.acc.x
+        dy = self.vel.y + 0.5 * self.acc.y
         self.on_ground = False
-        hits = pygame.sprite.spritecollide(self, platforms, False)
-        
-        if hits:
-            if self.vel.y > 0:  # Falling - land on top
-                self.rect.bottom = hits[0].rect.top
-                self.pos.y = self.rect.y
-                self.vel.y = 0
-                self.on_ground = True
-            elif self.vel.y < 0:  # Jumping - hit bottom
-                self.rect.top = hits[0].rect.bottom
-                self.pos.y = self.rect.y
+        # Each pass removes one axis from the move, so two always suffice
+        for _ in range(2):
+            if not dx and not dy:
+                break
+            # Broadphase: platforms touching the box's swept bounds (padded
+            # for Rect's integer rounding and edge contact)
+            swept = pygame.Rect(min(self.pos.x, self.pos.x + dx), min(self.pos.y, self.pos.y + dy),
+                                w + abs(dx), h + abs(dy)).inflate(4, 4)
+            first = None
+            for i in swept.collidelistall(platform_rects):
+                hit = sweep_aabb(self.pos.x, self.pos.y, w, h, dx, dy, platform_rects[i])
+                if hit is not None and (first is None or hit[0] < first[0]):
+                    first = hit + (platform_rects[i],)
+            if first is None:
+                self.pos.x += dx
+                self.pos.y += dy
+                break
+            t, axis, rect = first
+            if axis == 'x':
+                self.pos.x = rect.left - w if dx > 0 else rect.right
+                self.pos.y += dy * t
+                self.vel.x = 0
+                dx, dy = 0, dy * (1 - t)
+            else:
+                self.pos.x += dx * t
+                if dy > 0:  # Falling - land on top
+                    self.pos.y = rect.top - h
+                    self.on_ground = True
+                else:  # Jumping - hit bottom
+                    self.pos.y = rect.bottom
                 self.vel.y = 0
+                dx, dy = dx * (1 - t), 0
+        
+        # Keep player on screen horizontally
+        if self.pos.x < 0:
+            self.pos.x = 0
+            self.vel.x = 0
+        if self.pos.x > SCREEN_WIDTH - w:
+            self.pos.x = SCREEN_WIDTH - w
+            self.vel.x = 0
+        self.rect.topleft = (int(self.pos.x), int(self.pos.y))
         
         # Fall off bottom = death
         if self.rect.top > SCREEN_HEIGHT:
@@ -686,6 +301,7 @@ class Level:
             p = Platform(*platform)
             self.platforms.add(p)
             self.all_sprites.add(p)
+        self.platform_rects = [p.rect for p in self.platforms]
         
         # Create goal
         if 'goal' in level_data:
@@ -702,9 +318,94 @@ class Level:
         
         self.start_pos = level_data.get('start', (50, 300))
         
-    def update(self):
-        """Update all level elements."""
-        self.enemies.update()
+        # Enemies sleep until they come near the view
+        self.active_enemies = pygame.sprite.Group()
+        self.activation = ActivationWindow(((e.rect.x, e) for e in self.enemies), SCREEN_WIDTH)
+        
+    def update(self, camx=0):
+        """Update the enemies near the view; the rest stay asleep."""
+        self.active_enemies.add(self.activation.wake(camx))
+        lo, hi = self.activation.bounds(camx)
+        for e in [e for e in self.active_enemies if not lo <= e.rect.x <= hi]:
+            self.active_enemies.remove(e)
+            self.activation.sleep(e, e.rect.x)
+        self.active_enemies.update()
+
+class SpriteView(pygame.sprite.DirtySprite):
+    """Draws a game sprite's surf at a position chosen each frame."""
+    def __init__(self, sprite):
+        super().__init__()
+        self.sprite = sprite
+        self.image = sprite.surf
+        self.rect = sprite.rect.copy()
+        
+    def follow(self, pos):
+        """Move to pos, marking the sprite for repaint only if it moved."""
+        if pos != self.rect.topleft:
+            self.rect.topleft = pos
+            self.dirty = 1
+
+class HudText(pygame.sprite.DirtySprite):
+    """A line of HUD text, re-rendered and repainted only when it changes."""
+    def __init__(self, topleft, size=36, color=BLACK):
+        super().__init__()
+        self.topleft = topleft
+        self.size = size
+        self.color = color
+        self.text = None
+        self.image = pygame.Surface((0, 0))
+        self.rect = pygame.Rect(topleft, (0, 0))
+        
+    def set(self, text):
+        if text != self.text:
+            self.text = text
+            self.image = TEXT.render(text, self.size, self.color)
+            self.rect = self.image.get_rect(topleft=self.topleft)
+            self.dirty = 1
+
+class LevelView:
+    """Dirty-rectangle renderer for one level.
+
+    Platforms and the goal never move, so they are painted once into a
+    cached background. Enemies, the player and the HUD text are DirtySprites
+    in a LayeredDirty group, which repaints only what moved or changed from
+    the background and returns those rects for display.update().
+    """
+    def __init__(self, level, player):
+        self.level = level
+        self.background = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        if pygame.display.get_surface() is not None:
+            self.background = self.background.convert()
+        self.background.fill(SKY_BLUE)
+        self.background.blits([(sprite.surf, sprite.rect)
+                               for sprite in itertools.chain(level.platforms, level.goals)], False)
+        
+        self.movers = [SpriteView(enemy) for enemy in level.enemies]
+        self.movers.append(SpriteView(player))
+        self.lives_text = HudText((10, 10))
+        self.level_text = HudText((SCREEN_WIDTH - 150, 10))
+        # Enemies under the player, HUD text over both
+        self.sprites = pygame.sprite.LayeredDirty()
+        self.sprites.add(*self.movers[:-1], layer=0)
+        self.sprites.add(self.movers[-1], layer=1)
+        self.sprites.add(self.lives_text, self.level_text, layer=2)
+        self.sprites.clear(None, self.background)
+        self.invalidate()
+        
+    def invalidate(self):
+        """Repaint the whole screen next frame (after something else drew over it)."""
+        self.sprites.repaint_rect(self.background.get_rect())
+        
+    def update(self, position, alpha, lives, level_num):
+        """Place the moving sprites alpha of the way between steps and refresh the HUD."""
+        for view in self.movers:
+            view.follow(position(view.sprite, alpha))
+        self.lives_text.set(f"Lives: {lives}")
+        self.level_text.set(f"Level {level_num}")
+        
+    def draw(self, screen):
+        """Repaint what changed; returns the rects to pass to display.update()."""
+        return self.sprites.draw(screen)
 
 class OverworldNode:
     """Represents a level node on the overworld."""
@@ -750,13 +451,12 @@ class Overworld:
             if level_num + 1 < len(self.nodes):
                 self.nodes[level_num + 1].unlocked = True
     
-    def draw(self, screen):
-        """Draw the overworld map."""
+    def draw(self, screen, decor=True):
+        """Draw the overworld map; without decor the node outlines are left out."""
         screen.fill(SKY_BLUE)
         
         # Draw title
-        font = pygame.font.Font(None, 48)
-        title = font.render("SUPER MARIO BROS DELUXE", True, RED)
+        title = TEXT.render("SUPER MARIO BROS DELUXE", 48, RED)
         screen.blit(title, (SCREEN_WIDTH // 2 - title.get_width() // 2, 30))
         
         # Draw paths between nodes
@@ -779,11 +479,11 @@ class Overworld:
                 color = (100, 100, 100)
             
             pygame.draw.circle(screen, color, (node.x, node.y), 15)
-            pygame.draw.circle(screen, BLACK, (node.x, node.y), 15, 2)
+            if decor:
+                pygame.draw.circle(screen, BLACK, (node.x, node.y), 15, 2)
             
             # Draw level number
-            font_small = pygame.font.Font(None, 24)
-            num_text = font_small.render(str(node.level_num + 1), True, BLACK)
+            num_text = TEXT.render(str(node.level_num + 1), 24, BLACK)
             screen.blit(num_text, (node.x - num_text.get_width() // 2, 
                                    node.y - num_text.get_height() // 2))
         
@@ -792,15 +492,22 @@ class Overworld:
                                          int(self.player_pos[1])), 8)
         
         # Draw instructions
-        font_small = pygame.font.Font(None, 28)
-        instructions = font_small.render("Arrow Keys: Move  |  SPACE/ENTER: Select Level", 
-                                        True, BLACK)
+        instructions = TEXT.render("Arrow Keys: Move  |  SPACE/ENTER: Select Level", 
+                                   28, BLACK)
         screen.blit(instructions, (SCREEN_WIDTH // 2 - instructions.get_width() // 2, 
                                    SCREEN_HEIGHT - 40))
 
+def enable_tracing(path):
+    """Trace frames, phases, level construction and the update/draw passes to path."""
+    tracer = Tracer(path)
+    tracer.instrument(Player, "update")
+    tracer.instrument(Level, "__init__")
+    tracer.instrument(Game, "update", "draw")
+    return tracer
+
 class Game:
     """Main game controller."""
-    def __init__(self):
+    def __init__(self, trace_path=None, render_fps=FPS):
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption("Super Mario Bros Deluxe")
         self.clock = pygame.time.Clock()
@@ -810,17 +517,46 @@ class Game:
         self.current_level = None
         self.player = Player()
         self.lives = 3
-        
+        self.loader = LevelLoader(lambda level_num: Level(LEVELS[level_num]))
+        self.tracer = enable_tracing(trace_path) if trace_path else None
+        self.timer = FrameTimer(tracer=self.tracer)
+        self.perf_overlay = PerfOverlay(self.timer, status=self.enemy_status)
+        # Physics steps at FPS; frames render at render_fps, blended between steps
+        self.render_fps = render_fps
+        self.loop = FixedStepLoop(FPS)
+        self.interpolator = Interpolator()
+        # Drops decorations and then whole frames when rendering overruns
+        self.governor = LoadGovernor(self.timer, budget=1 / (render_fps or FPS))
+        # Levels are drawn incrementally; anything else drawn in between
+        # (another screen, the perf overlay) forces a full repaint
+        self.view = None
+        self.drawn_state = None
+        self.overlay_drawn = False
+        
+    def prefetch_level(self, level_num):
+        """Queue a background build of a level, if it exists."""
+        if level_num < len(LEVELS):
+            self.loader.prefetch(level_num)
+    
+    def enemy_status(self):
+        """Loop, quality, level loading and active/dormant enemy counters for the perf overlay."""
+        enemies = "enemies: no level" if self.current_level is None else self.current_level.activation.summary()
+        return "\n".join((self.loop.summary(), self.governor.summary(),
+                          self.loader.stats.summary(), enemies))
+    
     def start_level(self, level_num):
         """Start playing a level."""
         if level_num < len(LEVELS):
-            self.current_level = Level(LEVELS[level_num])
+            self.current_level = self.loader.take(level_num)
             self.player.reset_position(*self.current_level.start_pos)
             self.state = STATE_LEVEL
+            self.prefetch_level(level_num + 1)
     
     def handle_events(self):
         """Handle input events."""
         for event in pygame.event.get():
+            if self.perf_overlay.handle_event(event):
+                continue
             if event.type == pygame.QUIT:
                 return False
             
@@ -854,10 +590,12 @@ class Game:
         if self.state == STATE_LEVEL and self.current_level:
             # Update player
             self.player.move()
-            died = self.player.update(self.current_level.platforms)
+            died = self.player.update(self.current_level.platform_rects)
+            self.timer.lap("player")
             
             # Update level
             self.current_level.update()
+            self.timer.lap("enemies")
             
             # Check for death
             if died or pygame.sprite.spritecollide(self.player, 
@@ -877,70 +615,102 @@ class Game:
                     self.state = STATE_VICTORY
                 else:
                     self.state = STATE_OVERWORLD
+            self.timer.lap("collision")
+        
+        elif self.state == STATE_OVERWORLD:
+            # Keep the selected node's level (and the one after it) building
+            node = self.overworld.current_node
+            self.loader.discard(keep=(node, node + 1))
+            self.prefetch_level(node)
+    
+    def capture(self):
+        """Remember where the moving sprites are before a step."""
+        if self.state == STATE_LEVEL and self.current_level:
+            self.interpolator.capture(itertools.chain((self.player,), self.current_level.active_enemies))
+        else:
+            self.interpolator.clear()
     
-    def draw(self):
-        """Draw the current game state."""
+    def draw(self, alpha=1.0):
+        """Draw the current game state, alpha of the way from the previous step."""
+        dirty = None
         if self.state == STATE_OVERWORLD:
-            self.overworld.draw(self.screen)
+            self.overworld.draw(self.screen, self.governor.decor)
         
         elif self.state == STATE_LEVEL:
-            self.screen.fill(SKY_BLUE)
+            if self.view is None or self.view.level is not self.current_level:
+                self.view = LevelView(self.current_level, self.player)
+            elif self.drawn_state != STATE_LEVEL or self.overlay_drawn:
+                self.view.invalidate()
+            self.view.update(self.interpolator.position, alpha,
+                             self.lives, self.overworld.current_node + 1)
+            self.timer.lap("level_draw")
             
-            # Draw level
-            for sprite in self.current_level.all_sprites:
-                self.screen.blit(sprite.surf, sprite.rect)
-            
-            # Draw player
-            self.screen.blit(self.player.surf, self.player.rect)
-            
-            # Draw HUD
-            font = pygame.font.Font(None, 36)
-            lives_text = font.render(f"Lives: {self.lives}", True, BLACK)
-            level_text = font.render(f"Level {self.overworld.current_node + 1}", 
-                                    True, BLACK)
-            self.screen.blit(lives_text, (10, 10))
-            self.screen.blit(level_text, (SCREEN_WIDTH - 150, 10))
+            # Only the changed rects reach the display
+            dirty = self.view.draw(self.screen)
+            self.timer.lap("sprite_draw")
         
         elif self.state == STATE_GAME_OVER:
             self.screen.fill(BLACK)
-            font = pygame.font.Font(None, 72)
-            game_over = font.render("GAME OVER", True, RED)
+            game_over = TEXT.render("GAME OVER", 72, RED)
             self.screen.blit(game_over, (SCREEN_WIDTH // 2 - game_over.get_width() // 2,
                                         SCREEN_HEIGHT // 2 - 50))
-            font_small = pygame.font.Font(None, 36)
-            continue_text = font_small.render("Press ENTER to return to map", 
-                                             True, WHITE)
+            continue_text = TEXT.render("Press ENTER to return to map", 
+                                        36, WHITE)
             self.screen.blit(continue_text, 
                            (SCREEN_WIDTH // 2 - continue_text.get_width() // 2,
                             SCREEN_HEIGHT // 2 + 50))
         
         elif self.state == STATE_VICTORY:
             self.screen.fill(SKY_BLUE)
-            font = pygame.font.Font(None, 72)
-            victory = font.render("YOU WIN!", True, YELLOW)
+            victory = TEXT.render("YOU WIN!", 72, YELLOW)
             self.screen.blit(victory, (SCREEN_WIDTH // 2 - victory.get_width() // 2,
                                       SCREEN_HEIGHT // 2 - 50))
-            font_small = pygame.font.Font(None, 36)
-            continue_text = font_small.render("You've completed all 32 levels!", 
-                                             True, BLACK)
+            continue_text = TEXT.render("You've completed all 32 levels!", 
+                                        36, BLACK)
             self.screen.blit(continue_text, 
                            (SCREEN_WIDTH // 2 - continue_text.get_width() // 2,
                             SCREEN_HEIGHT // 2 + 50))
         
-        pygame.display.flip()
+        # HUD, menu screens and the perf overlay
+        self.perf_overlay.draw(self.screen, (8, 50))
+        self.overlay_drawn = self.perf_overlay.visible
+        self.drawn_state = self.state
+        self.timer.lap("hud")
+        
+        if dirty is None or self.overlay_drawn:
+            pygame.display.flip()
+        else:
+            pygame.display.update(dirty)
+        self.timer.lap("flip")
     
     def run(self):
         """Main game loop."""
         running = True
         while running:
+            self.timer.begin_frame()
             running = self.handle_events()
-            self.update()
-            self.draw()
-            self.clock.tick(FPS)
-        
+            self.timer.lap("events")
+            for _ in range(self.loop.advance()):
+                self.capture()
+                self.update()
+            if self.governor.render_this_frame():
+                self.draw(self.loop.alpha)
+            self.timer.end_frame()
+            self.governor.update()
+            self.clock.tick(self.render_fps)
+        
+        self.loader.close()
+        if self.tracer:
+            self.tracer.close()
+        LEVELS.close()
         pygame.quit()
         sys.exit()
 
 if __name__ == "__main__":
-    game = Game()
+    parser = argparse.ArgumentParser(description="Super Mario Bros Deluxe")
+    parser.add_argument("--trace", metavar="FILE", help="write a Chrome trace of every frame to FILE")
+    parser.add_argument("--render-fps", type=int, default=FPS, metavar="N",
+                        help=f"render frame cap; physics always steps at {FPS} Hz (0 = uncapped)")
+    args = parser.parse_args()
+    game = Game(args.trace, args.render_fps)
     game.run()
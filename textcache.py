@@ -0,0 +1,62 @@
+"""Shared font registry and LRU cache of rendered text surfaces.
+
+Creating a pygame Font and rasterizing a string are both expensive, and the
+games redraw the same HUD strings every frame. FONTS hands out one Font per
+(name, size); TEXT renders through it and keeps the most recently used
+surfaces keyed by (name, size, text, color, antialias).
+
+Cached surfaces are shared: blit them, never draw onto them.
+"""
+from collections import OrderedDict
+
+import pygame
+
+
+class FontRegistry:
+    """Creates each (name, size) Font once."""
+
+    def __init__(self):
+        self.fonts = {}
+
+    def get(self, name, size):
+        font = self.fonts.get((name, size))
+        if font is None:
+            if not pygame.font.get_init():
+                pygame.font.init()
+            font = self.fonts[(name, size)] = pygame.font.Font(name, size)
+        return font
+
+    def clear(self):
+        self.fonts.clear()
+
+
+class TextCache:
+    """LRU cache of rendered text surfaces."""
+
+    def __init__(self, fonts, capacity=256):
+        self.fonts = fonts
+        self.capacity = capacity
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, text, size, color, name=None, antialias=True):
+        key = (name, size, text, color, antialias)
+        surface = self.entries.get(key)
+        if surface is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return surface
+        self.misses += 1
+        surface = self.fonts.get(name, size).render(text, antialias, color)
+        self.entries[key] = surface
+        if len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+        return surface
+
+    def clear(self):
+        self.entries.clear()
+
+
+FONTS = FontRegistry()
+TEXT = TextCache(FONTS)